@@ -3,10 +3,12 @@ Base agent class for all specialist agents.
 Provides common interface and shared functionality.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Iterator
 from omegaconf import DictConfig
 from langchain_community.chat_models import ChatOpenAI
 from agentic_student_assistant.core.utils.llm_factory import LLMFactory
+from agentic_student_assistant.core.utils.streaming import is_streaming, emit_event
+from agentic_student_assistant.core.utils.selection import results_memory
 
 class BaseAgent(ABC):
     """
@@ -16,16 +18,21 @@ class BaseAgent(ABC):
     the process() method.
     """
     
-    def __init__(self, agent_config: DictConfig, agent_name: str = "base"):
+    def __init__(self, agent_config: DictConfig, agent_name: str = "base", task: Optional[str] = None):
         """
         Initialize base agent.
         
         Args:
             agent_config: Application configuration from Hydra
             agent_name: Name of the agent (for logging/debugging)
+            task: LLM task profile for the agent's main call (see `llm_tasks`)
         """
         self.config = agent_config
         self.agent_name = agent_name
+        self.task = task
+        self._task_llms: Dict[str, ChatOpenAI] = {}
+        # Records shown in the last answer (see `remember_results`)
+        self.last_results: Optional[Dict[str, Any]] = None
         self.llm = self._init_llm()
     
     def _init_llm(self) -> ChatOpenAI:
@@ -35,8 +42,70 @@ class BaseAgent(ABC):
         Returns:
             ChatOpenAI instance
         """
+        if self.task:
+            return self.get_task_llm(self.task)
         return LLMFactory.create_llm(self.config.models)
     
+    def get_task_llm(self, task: str) -> ChatOpenAI:
+        """
+        Get (and cache) the LLM for a task profile, e.g. a small model
+        for keyword extraction.
+        
+        Args:
+            task: Task profile name from `llm_tasks`
+            
+        Returns:
+            ChatOpenAI instance
+        """
+        if task not in self._task_llms:
+            self._task_llms[task] = LLMFactory.create_task_llm(self.config, task)
+        return self._task_llms[task]
+    
+    def get_escalation_llm(self, task: str) -> Optional[ChatOpenAI]:
+        """
+        Get the larger model a task escalates to on parse failure or
+        low confidence (None if the task doesn't escalate).
+        """
+        escalate_to = LLMFactory.escalation_task(self.config, task)
+        return self.get_task_llm(escalate_to) if escalate_to else None
+    
+    def stream_synthesis(self, prompt: Any) -> Iterator[str]:
+        """
+        Stream the answer tokens of the agent's final synthesis call.
+        
+        Args:
+            prompt: Prompt string or message list
+            
+        Yields:
+            Answer text chunks as the model produces them
+        """
+        for chunk in self.llm.stream(prompt):
+            if chunk.content:
+                yield chunk.content
+    
+    def _synthesize(self, prompt: Any) -> str:
+        """
+        Run the final synthesis call. When the request is streaming, tokens
+        are forwarded to the UI as they arrive; the full text is returned
+        either way.
+        """
+        if not is_streaming():
+            return self.llm.invoke(prompt).content
+        
+        parts = []
+        for token in self.stream_synthesis(prompt):
+            parts.append(token)
+            emit_event("token", text=token)
+        return "".join(parts)
+    
+    def remember_results(self, domain: str, records: list):
+        """
+        Keep the records shown to the user, in display order, so follow-ups
+        ("the second one", a title) can be resolved without an LLM call.
+        Graph nodes store them in `GraphState.last_results`.
+        """
+        self.last_results = results_memory(domain, records, self.config.selection.max_records)
+    
     @abstractmethod
     def process(self, query: str, **kwargs) -> str:
         """
@@ -20,7 +20,7 @@ class FallbackAgent(BaseAgent):
     def __init__(self):
         """Initialize fallback agent with configuration."""
         config = get_config()
-        super().__init__(config, agent_name="fallback")
+        super().__init__(config, agent_name="fallback", task="fallback")
         self.system_prompt = get_prompt("fallback_general")
     
     def process(self, query: str, **kwargs) -> str:
@@ -29,22 +29,22 @@ class FallbackAgent(BaseAgent):
         
         Args:
             query: User query
-            **kwargs: Additional parameters (unused)
+            **kwargs: Optional `conversation_context` (bounded summary of
+                the conversation so far)
             
         Returns:
 str: Agent response
         """
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": query}
-        ]
+        messages = [{"role": "system", "content": self.system_prompt}]
+        if kwargs.get("conversation_context"):
+            messages.append({"role": "system", "content": f"Conversation so far:\n{kwargs['conversation_context']}"})
+        messages.append({"role": "user", "content": query})
         
-        response = self.llm.invoke(messages)
-        return response.content
+        return self._synthesize(messages)
     
-    def run(self, query: str) -> str:
+    def run(self, query: str, **kwargs) -> str:
         """Legacy method for backward compatibility."""
-        return self.process(query)
+        return self.process(query, **kwargs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,275 @@
+"""
+Batch query API over the graph.
+Runs many queries (evaluation sets, logged questions, cache warm-ups) with
+bounded concurrency in one process, so the routing, LLM-call and HTTP
+caches, rate limiters and connection pools are shared across the batch.
+Identical queries run once; results stream to JSONL as they complete.
+
+Usage:
+    python -m agentic_student_assistant.core.orchestration.batch_runner queries.jsonl -o results.jsonl
+"""
+import os
+import json
+import time
+import argparse
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from agentic_student_assistant.core.orchestration.main_graph import app
+from agentic_student_assistant.core.utils.cache import get_cache, get_route_cache
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.llm_cache import get_llm_cache_stats
+from agentic_student_assistant.core.utils.token_usage import total_token_usage
+
+
+def load_queries(path: str) -> List[Dict[str, Any]]:
+    """
+    Load batch items from a file.
+
+    JSONL lines are objects with a `query` and optional `id` and
+    `chat_history` ([[role, message], ...]); any other file is read as one
+    query per line.
+
+    Args:
+        path: Input file
+
+    Returns:
+        List of batch items
+    """
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith(".jsonl"):
+                items.append(json.loads(line))
+            else:
+                items.append({"query": line})
+    return items
+
+
+def _normalize_items(queries: Iterable[Union[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    items = []
+    for i, item in enumerate(queries):
+        item = {"query": item} if isinstance(item, str) else dict(item)
+        item.setdefault("id", i)
+        item["chat_history"] = [tuple(turn) for turn in item.get("chat_history") or []]
+        items.append(item)
+    return items
+
+
+def _dedupe_key(item: Dict[str, Any]) -> str:
+    query = " ".join(item["query"].lower().split())
+    return json.dumps([query, item["chat_history"]])
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class BatchRunner:
+    """
+    Runs a list of queries through the graph with bounded concurrency and
+    writes one JSON line per query as results arrive.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        dedupe: bool = True,
+        fast_mode: Optional[bool] = None,
+        warm_response_cache: bool = False
+    ):
+        """
+        Args:
+            max_concurrency: Queries in flight at once
+            dedupe: Run identical queries (same text and history) once
+            fast_mode: Force fast mode on/off for every query (None = policy)
+            warm_response_cache: Store full-mode answers of history-free queries
+                in the UI's response cache (fast-mode listings are never stored)
+        """
+        self.max_concurrency = max_concurrency
+        self.dedupe = dedupe
+        self.fast_mode = fast_mode
+        self.warm_response_cache = warm_response_cache
+        self._write_lock = threading.Lock()
+
+    def _run_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Invoke the graph for one item and build its output record."""
+        started = time.time()
+        record = {"id": item["id"], "query": item["query"]}
+        try:
+            state = {"query": item["query"], "chat_history": item["chat_history"]}
+            if self.fast_mode is not None:
+                state["fast_mode"] = self.fast_mode
+            final_state = app.invoke(state)
+            usage = total_token_usage((final_state.get("metadata") or {}).get("token_usage"))
+            record.update({
+                "agent": final_state.get("agent"),
+                "confidence": final_state.get("confidence"),
+                "result": final_state.get("result"),
+                "total_tokens": usage["total_tokens"],
+                "cost_usd": usage["cost_usd"],
+                "error": None,
+            })
+            # Fast-mode listings (forced, or chosen by load shedding) would be served
+            # to full-mode users as cached answers: only full answers warm the cache
+            if (
+                self.warm_response_cache and not item["chat_history"] and record["result"]
+                and not final_state.get("fast_mode")
+            ):
+                get_cache().set(item["query"], record["result"], agent=record["agent"] or "")
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"❌ Batch query {item['id']} failed: {e}")
+            record.update({"agent": "error", "result": None, "error": str(e)})
+        record["latency_seconds"] = round(time.time() - started, 3)
+        return record
+
+    def _write(self, out, record: Dict[str, Any]):
+        if out is None:
+            return
+        with self._write_lock:
+            out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+
+    def run(
+        self,
+        queries: Iterable[Union[str, Dict[str, Any]]],
+        output_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a batch.
+
+        Args:
+            queries: Query strings or items ({"query", "id", "chat_history"})
+            output_path: JSONL file results are streamed to (None keeps them in memory only)
+
+        Returns:
+            Report with throughput, latency percentiles, per-agent counts,
+            token totals and the per-query records
+        """
+        items = _normalize_items(queries)
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            key = _dedupe_key(item) if self.dedupe else str(item["id"])
+            groups.setdefault(key, []).append(item)
+        print(f"📦 Batch: {len(items)} queries ({len(groups)} unique), concurrency {self.max_concurrency}")
+
+        if output_path:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        out = open(output_path, "w", encoding="utf-8") if output_path else None # pylint: disable=consider-using-with
+        records = []
+        started = time.time()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="batch") as executor:
+                futures = {executor.submit(self._run_one, group[0]): group for group in groups.values()}
+                for done, future in enumerate(as_completed(futures), 1):
+                    group = futures[future]
+                    record = future.result()
+                    for duplicate in group:
+                        if duplicate is group[0]:
+                            item_record = record
+                        else:
+                            item_record = {
+                                **record, "id": duplicate["id"], "query": duplicate["query"],
+                                "deduplicated_of": group[0]["id"]
+                            }
+                        records.append(item_record)
+                        self._write(out, item_record)
+                    print(f"✅ [{done}/{len(groups)}] {record['agent']} in {record['latency_seconds']:.2f}s")
+        finally:
+            if out is not None:
+                out.close()
+
+        report = self._report(records, time.time() - started, len(groups))
+        print(
+            f"📊 Batch done: {report['queries']} queries in {report['wall_seconds']:.1f}s "
+            f"({report['throughput_qps']:.2f} q/s), p50 {report['latency']['p50']:.2f}s, "
+            f"p90 {report['latency']['p90']:.2f}s, {report['errors']} errors"
+        )
+        report["records"] = records
+        return report
+
+    @staticmethod
+    def _report(records: List[Dict[str, Any]], wall_seconds: float, unique: int) -> Dict[str, Any]:
+        """Throughput, latency and usage summary of a finished batch."""
+        executed = [r for r in records if "deduplicated_of" not in r]
+        latencies = [r["latency_seconds"] for r in executed]
+        agents: Dict[str, int] = {}
+        for record in records:
+            agents[record["agent"]] = agents.get(record["agent"], 0) + 1
+        return {
+            'queries': len(records),
+            'unique_queries': unique,
+            'errors': sum(1 for r in executed if r["error"]),
+            'wall_seconds': round(wall_seconds, 3),
+            'throughput_qps': round(len(records) / wall_seconds, 3) if wall_seconds else 0.0,
+            'latency': {
+                'mean': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+                'p50': _percentile(latencies, 50),
+                'p90': _percentile(latencies, 90),
+                'p99': _percentile(latencies, 99),
+                'max': max(latencies, default=0.0),
+            },
+            'agents': agents,
+            'total_tokens': sum(r.get("total_tokens") or 0 for r in executed),
+            'cost_usd': round(sum(r.get("cost_usd") or 0.0 for r in executed), 6),
+            'llm_cache': get_llm_cache_stats(),
+            'route_cache': get_route_cache().get_stats() if get_config().routing.cache.enabled else None,
+        }
+
+
+def run_batch(
+    queries: Iterable[Union[str, Dict[str, Any]]],
+    output_path: Optional[str] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Run a batch of queries through the graph (see `BatchRunner`).
+
+    Args:
+        queries: Query strings or items ({"query", "id", "chat_history"})
+        output_path: JSONL output file
+        **kwargs: `BatchRunner` options; `max_concurrency` defaults to `batch.max_concurrency`
+
+    Returns:
+        Batch report
+    """
+    kwargs.setdefault("max_concurrency", get_config().batch.max_concurrency)
+    return BatchRunner(**kwargs).run(queries, output_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a batch of queries through the assistant graph.")
+    parser.add_argument("input", help="Queries file (.jsonl with a 'query' field, or one query per line)")
+    parser.add_argument("-o", "--output", help="JSONL results file (default: logs/batch/<timestamp>.jsonl)")
+    parser.add_argument("-c", "--concurrency", type=int, default=None, help="Queries in flight at once")
+    parser.add_argument("--no-dedupe", action="store_true", help="Run identical queries separately")
+    parser.add_argument("--fast", action="store_true", help="Answer in fast (LLM-free) mode")
+    parser.add_argument(
+        "--warm-cache", action="store_true", help="Store answers in the response cache (ignored with --fast)"
+    )
+    args = parser.parse_args()
+
+    batch_config = get_config().batch
+    output = args.output or os.path.join(
+        batch_config.output_dir, f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    )
+    batch_report = run_batch(
+        load_queries(args.input),
+        output_path=output,
+        max_concurrency=args.concurrency or batch_config.max_concurrency,
+        dedupe=not args.no_dedupe,
+        fast_mode=True if args.fast else None,
+        warm_response_cache=args.warm_cache
+    )
+    batch_report.pop("records")
+    print(json.dumps(batch_report, indent=2))
+    print(f"📝 Results written to {output}")
@@ -0,0 +1,174 @@
+"""
+Local embedding-based fast-path router.
+Classifies queries with a nearest-centroid model over the already-loaded
+MiniLM embeddings so that clear-cut queries skip the router LLM call.
+Ambiguous queries are deferred to the LLM router.
+"""
+import os
+import json
+import datetime
+import threading
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from omegaconf import DictConfig
+
+from agentic_student_assistant.core.utils.cache import get_embedding_model
+
+
+class EmbeddingRouter:
+    """
+    Nearest-centroid query classifier trained from seed examples and from
+    logged (high-confidence) LLM routing decisions.
+    """
+
+    AGENTS = ("job_market", "books", "papers", "fallback")
+
+    def __init__(self, fast_path_config: DictConfig):
+        """
+        Initialize and train the classifier.
+
+        Args:
+            fast_path_config: `routing.fast_path` section of the app config
+        """
+        self.config = fast_path_config
+        self.min_confidence = fast_path_config.min_confidence
+        self.min_similarity = fast_path_config.min_similarity
+        self.temperature = fast_path_config.temperature
+        self.decisions_log = fast_path_config.decisions_log
+        self.model = get_embedding_model()
+        self.centroids: Dict[str, np.ndarray] = {}
+        self._log_lock = threading.Lock()
+
+        if self.model is None:
+            print("⚠️ Fast-path router disabled: embedding model unavailable")
+            return
+
+        self.fit(self._load_examples())
+
+    @property
+    def ready(self) -> bool:
+        """Whether the classifier has been trained."""
+        return bool(self.centroids)
+
+    def _load_examples(self) -> Dict[str, List[str]]:
+        """Collect training examples: config seeds + logged LLM decisions."""
+        max_per_agent = self.config.max_logged_examples_per_agent
+        examples: Dict[str, List[str]] = {
+            agent: list(self.config.seed_examples.get(agent, [])) for agent in self.AGENTS
+        }
+
+        if os.path.exists(self.decisions_log):
+            # Keep only the most recent decisions per agent
+            logged = defaultdict(lambda: deque(maxlen=max_per_agent))
+            with open(self.decisions_log, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get("agent") in examples:
+                        logged[record["agent"]].append(record["query"])
+            for agent, queries in logged.items():
+                examples[agent].extend(queries)
+
+        return examples
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed and L2-normalize texts."""
+        return np.asarray(self.model.encode(
+            [t.lower().strip() for t in texts], normalize_embeddings=True
+        ))
+
+    def fit(self, examples: Dict[str, List[str]]):
+        """
+        Compute one normalized centroid per agent.
+
+        Args:
+            examples: Mapping of agent name to example queries
+        """
+        centroids = {}
+        for agent, queries in examples.items():
+            if not queries:
+                continue
+            centroid = self._embed(queries).mean(axis=0)
+            centroids[agent] = centroid / np.linalg.norm(centroid)
+        self.centroids = centroids
+        print(f"🧭 Fast-path router trained on {sum(len(q) for q in examples.values())} examples")
+
+    def classify(self, query: str) -> Optional[Tuple[str, float, float]]:
+        """
+        Score a query against all centroids.
+
+        Returns:
+            (agent, confidence, similarity) for the best agent, or None if untrained.
+            Confidence is a softmax over centroid similarities.
+        """
+        if not self.ready:
+            return None
+        agents = list(self.centroids)
+        query_emb = self._embed([query])[0]
+        sims = np.array([float(np.dot(query_emb, self.centroids[a])) for a in agents])
+        logits = (sims - sims.max()) / self.temperature
+        probs = np.exp(logits) / np.exp(logits).sum()
+        best = int(np.argmax(probs))
+        return agents[best], float(probs[best]), float(sims[best])
+
+    def predict(self, query: str) -> Optional[Tuple[str, float, float]]:
+        """
+        Classify only if the result is confident enough to skip the LLM.
+
+        Returns:
+            (agent, confidence, similarity), or None to defer to the LLM router
+        """
+        try:
+            result = self.classify(query)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Fast-path router error: {e}")
+            return None
+        if result is None:
+            return None
+        _, confidence, similarity = result
+        if confidence < self.min_confidence or similarity < self.min_similarity:
+            return None
+        return result
+
+    def record_decision(self, query: str, agent: str, confidence: float):
+        """
+        Append an LLM routing decision to the training log.
+
+        Args:
+            query: Routed query
+            agent: Agent chosen by the LLM router
+            confidence: LLM router confidence
+        """
+        if agent not in self.AGENTS or confidence < self.config.min_logged_confidence:
+            return
+        record = {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "query": query,
+            "agent": agent,
+            "confidence": confidence,
+        }
+        try:
+            log_dir = os.path.dirname(self.decisions_log)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            with self._log_lock, open(self.decisions_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not log routing decision: {e}")
+
+
+if __name__ == "__main__":
+    from agentic_student_assistant.core.utils.config_loader import get_config
+
+    router = EmbeddingRouter(get_config().routing.fast_path)
+    for test_query in [
+        "find data science jobs in Berlin",
+        "recommend books on linear algebra",
+        "papers about diffusion models",
+        "what's the weather today?",
+        "explain the first one",
+    ]:
+        print(f"{test_query!r:45} -> {router.classify(test_query)} | fast path: {router.predict(test_query)}")
@@ -0,0 +1,136 @@
+"""
+Graph-level multi-domain fan-out.
+Queries spanning several domains ("papers and books on transformers for my
+next job") are split into one sub-query per domain and sent to the
+specialist nodes in parallel (LangGraph `Send`, or a thread pool on
+LangGraph versions without it). A synthesis node joins their answers, so
+multi-domain latency approaches that of the slowest specialist instead of
+the sum of a sequential ReAct loop.
+"""
+from typing import Any, Dict, List, Optional
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.local_ranker import query_terms
+from agentic_student_assistant.core.orchestration.router_agent import DOMAIN_KEYWORDS, likely_domains
+
+# `Send` moved from langgraph.constants to langgraph.types; very old versions lack it
+try:
+    from langgraph.types import Send # pylint: disable=import-error
+    SEND_AVAILABLE = True
+except ImportError:
+    try:
+        from langgraph.constants import Send # pylint: disable=import-error
+        SEND_AVAILABLE = True
+    except ImportError:
+        Send = None
+        SEND_AVAILABLE = False
+
+# Answer sections, in display order
+SECTION_HEADERS = {
+    "papers": "📄 Research Papers",
+    "books": "📚 Books",
+    "job_market": "💼 Job Market",
+}
+
+# Intent words that say what the student wants to do, not what about
+_FILLER_WORDS = {"learn", "next", "start", "understand", "getting", "started", "also", "both", "well"}
+
+
+def fanout_domains(query: str, agent: str) -> Optional[List[str]]:
+    """
+    Domains to fan out to for an orchestrator decision.
+
+    Returns:
+        Two or more domains (display order), or None to keep the ReAct orchestrator
+    """
+    orchestration_config = get_config().orchestration
+    if agent != "orchestrator" or orchestration_config.mode != "fanout":
+        return None
+    domains = likely_domains(query)
+    if len(domains) < 2:
+        return None
+    return [domain for domain in SECTION_HEADERS if domain in domains]
+
+
+def _topic(query: str, plan: Dict[str, Any]) -> str:
+    """The subject of a multi-domain query, without domain and intent words."""
+    if plan.get("search_keywords"):
+        return plan["search_keywords"]
+    domain_words = {word for words in DOMAIN_KEYWORDS.values() for word in words}
+    terms = [
+        term for term in query_terms(query)
+        if term not in _FILLER_WORDS and term.rstrip("s") not in domain_words
+    ]
+    return " ".join(terms) or query
+
+
+def decompose_query(
+    query: str, domains: List[str], plan: Optional[Dict[str, Any]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Split a multi-domain query into one sub-query (and query plan) per domain.
+
+    Args:
+        query: User query
+        domains: Domains to fan out to
+        plan: Query details extracted by the router (search_keywords, field, location)
+
+    Returns:
+        {domain: {"query": sub-query, "query_plan": {...}}}
+    """
+    plan = plan or {}
+    topic = _topic(query, plan)
+    location = plan.get("location")
+    sub_queries = {
+        "papers": (f"Research papers on {topic}", {"search_keywords": topic}),
+        "books": (f"Books on {topic}", {"search_keywords": topic}),
+        "job_market": (
+            f"{plan.get('field') or topic} jobs" + (f" in {location}" if location else ""),
+            {key: value for key, value in {"field": plan.get("field") or topic, "location": location}.items() if value}
+        ),
+    }
+    return {domain: {"query": sub_queries[domain][0], "query_plan": sub_queries[domain][1]} for domain in domains}
+
+
+def branch_states(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Input state of each specialist branch.
+
+    Branches don't get the event sink (interleaved token streams from
+    parallel agents would be unreadable); the synthesis node streams the
+    joined answer instead.
+    """
+    sub_queries = decompose_query(state["query"], state["fanout_domains"], state.get("query_plan"))
+    return {
+        domain: {
+            "query": sub["query"],
+            "query_plan": sub["query_plan"],
+            "deadline": state.get("deadline"),
+            "fast_mode": state.get("fast_mode", False),
+            "fanout_domains": state["fanout_domains"],
+            "fanout_branch": True,
+        }
+        for domain, sub in sub_queries.items()
+    }
+
+
+def send_branches(state: Dict[str, Any]) -> List[Any]:
+    """LangGraph `Send` packets for the specialist branches."""
+    return [Send(domain, branch_state) for domain, branch_state in branch_states(state).items()]
+
+
+def join_partial_results(partial_results: List[Dict[str, Any]], domains: List[str]) -> str:
+    """
+    Join the specialists' answers into one markdown answer (sections in display order).
+
+    Args:
+        partial_results: [{"agent": domain, "query": sub-query, "result": answer}, ...]
+        domains: Domains that were fanned out to
+    """
+    by_domain = {partial["agent"]: partial for partial in partial_results}
+    sections = []
+    for domain in domains:
+        partial = by_domain.get(domain)
+        result = partial["result"] if partial else "⚠️ No answer from this source in time."
+        sections.append(f"## {SECTION_HEADERS.get(domain, domain)}\n\n{result}")
+    return "\n\n---\n\n".join(sections)
@@ -1,18 +1,34 @@
 import os
 import datetime
-from typing import TypedDict, List, Optional, Dict, Any
+import operator
+import threading
+import contextvars
+from typing import TypedDict, List, Optional, Dict, Any, Annotated, Iterator
 from dotenv import load_dotenv
 from langchain_core.runnables import RunnableLambda
 from langsmith import traceable # pylint: disable=import-error
 from langgraph.graph import StateGraph, END # pylint: disable=import-error
 
 # Agent imports
-from agentic_student_assistant.talk2jobs.agents.job_market_agent import run_job_market_agent
+from agentic_student_assistant.talk2jobs.agents.job_market_agent import JobMarketAgent
 # from agentic_student_assistant.core.base.books_agent import run_books_agent
 from agentic_student_assistant.talk2books.agents.books_recommend_agent import BooksRecommendAgent
 from agentic_student_assistant.talk2papers.agents.paper_recommend_agent import PaperRecommendAgent
 from agentic_student_assistant.core.base.fallback_agent import FallbackAgent
 from agentic_student_assistant.core.orchestration.router_agent import route_query
+from agentic_student_assistant.core.orchestration.speculation import SpeculativeSearch, start_speculative_search
+from agentic_student_assistant.core.orchestration.fanout import (
+    SEND_AVAILABLE, fanout_domains, branch_states, send_branches, join_partial_results
+)
+from agentic_student_assistant.core.utils.config_loader import get_config, get_prompt
+from agentic_student_assistant.core.utils.llm_factory import LLMFactory
+from agentic_student_assistant.core.utils.parallel import run_concurrently
+from agentic_student_assistant.core.utils.deadline import Deadline
+from agentic_student_assistant.core.utils.http_client import warm_up_connections
+from agentic_student_assistant.core.utils.token_usage import track_node_tokens, merge_metadata
+from agentic_student_assistant.core.utils.streaming import EventSink, streams_events, emit_event
+from agentic_student_assistant.core.utils.load_shedding import use_fast_mode
+from agentic_student_assistant.core.utils.conversation_memory import conversation_context
 
 load_dotenv()
 
@@ -23,23 +39,55 @@ class GraphState(TypedDict):
 
     Attributes:
         query: User query
-        chat_history: Conversation history
+        chat_history: Conversation history (recent turns)
+        conversation_context: Bounded context string (running summary +
+            recent turns) from the caller's `ConversationMemory`; derived
+            from `chat_history` if missing
         agent: The agent that handled the query
         result: The final answer
         confidence: Router confidence score
         reasoning: Router reasoning
-        metadata: Additional metadata
+        metadata: Additional metadata, merged across nodes (incl. per-node
+            LLM `token_usage`)
+        deadline: Request time budget, created at graph entry
+        query_plan: Query details extracted by the router (search_keywords,
+            field, location, selection_index) so agents can skip their own
+            extraction calls
+        events: Optional event sink for incremental output (see `stream_query`)
+        fast_mode: Answer list-style requests without LLM synthesis. Set by
+            the caller (True/False) or, if None, by the load-shedding policy
+        last_results: Records shown in the latest answer, in display order
+            ({"domain": ..., "records": [...]}). Callers pass it back with
+            the next query so follow-ups ("the second one") resolve locally
+        speculative_search: Search phase started while routing, set only if
+            the router committed to it (see `speculation`)
+        fanout_domains: Specialists a multi-domain query is fanned out to
+            (None for single-agent requests)
+        fanout_branch: Set in the input of fanned-out specialist branches
+        partial_results: Answers of the fanned-out specialists, joined by
+            the synthesis node
     """
     query: str
     chat_history: List[str]
+    conversation_context: Optional[str]
     agent: str
     result: str
     confidence: Optional[float]
     reasoning: str
-    metadata: Optional[Dict[str, Any]]
+    metadata: Annotated[Optional[Dict[str, Any]], merge_metadata]
+    deadline: Optional[Deadline]
+    query_plan: Optional[Dict[str, Any]]
+    events: Optional[EventSink]
+    fast_mode: Optional[bool]
+    last_results: Optional[Dict[str, Any]]
+    speculative_search: Optional[SpeculativeSearch]
+    fanout_domains: Optional[List[str]]
+    fanout_branch: Optional[bool]
+    partial_results: Annotated[List[Dict[str, Any]], operator.add]
 
 # ------------ ROUTING (LLM-BASED) -------------
 
+@track_node_tokens("router")
 def route_agent(state: GraphState):
     """
     Route query using LLM-based semantic routing.
@@ -47,14 +95,32 @@ def route_agent(state: GraphState):
     """
     query = state["query"]
     
+    # Graph entry: start the request budget unless the caller supplied one
+    deadline = state.get("deadline") or Deadline.from_config(get_config())
+    
     # Use LLM router for intelligent routing with orchestration
     chat_history = state.get("chat_history", [])
     
-    # Format history string if list provided (simple heuristic)
-    history_str = str(chat_history)[-1000:] if chat_history else ""
+    # Bounded conversation context (precomputed by the caller's memory when available)
+    history_str = state.get("conversation_context") or conversation_context(chat_history)
+    
+    # Start the likely agent's searches while the router LLM decides
+    speculation = start_speculative_search(
+        query, deadline, searchers={"papers": PaperRecommendAgent, "books": BooksRecommendAgent},
+        last_results=state.get("last_results")
+    )
     
     # Use LLM router
-    decision = route_query(query, enable_orchestration=True, chat_history=history_str)
+    decision = route_query(
+        query, enable_orchestration=True, chat_history=history_str, last_results=state.get("last_results")
+    )
+    if speculation is not None and not speculation.commit(decision.agent, decision.search_keywords):
+        speculation = None
+    
+    # Multi-domain queries fan out to the specialists instead of the ReAct orchestrator
+    domains = fanout_domains(query, decision.agent)
+    if domains:
+        print(f"🔀 Fanning out to: {', '.join(domains)}")
     
     print(f"🧭 Routing to: {decision.agent} agent")
     print(f"🎯 Confidence: {decision.confidence:.2f}")
@@ -64,8 +130,14 @@ def route_agent(state: GraphState):
         "agent": decision.agent,
         "query": state["query"],
         "chat_history": state.get("chat_history", []),
+        "conversation_context": history_str,
         "confidence": decision.confidence,
         "reasoning": decision.reasoning,
+        "deadline": deadline,
+        "query_plan": decision.query_plan(),
+        "speculative_search": speculation,
+        "fanout_domains": domains,
+        "fast_mode": use_fast_mode(state.get("fast_mode")),
         "metadata": {
             "router_version": "llm_v1",
             "model": "gpt-4"
@@ -74,38 +146,142 @@ def route_agent(state: GraphState):
 
 # ------------ NODE DEFINITIONS -------------
 
+def _agent_update(state: GraphState, agent, result: str, agent_name: str) -> Dict[str, Any]:
+    """
+    Node state update; carries the agent's shown records when it listed any.
+    Fanned-out branches only contribute a partial result for the synthesis node.
+    """
+    if state.get("fanout_branch"):
+        return {"partial_results": [{"agent": agent_name, "query": state["query"], "result": result}]}
+    update = {"result": result, "agent": agent_name}
+    if agent.last_results:
+        update["last_results"] = agent.last_results
+    return update
+
 @traceable(name="job_market_node")
+@track_node_tokens("job_market")
+@streams_events
 def job_market_node(state: GraphState):
-    result = run_job_market_agent(state["query"])  # ✅ Use single entry point
-    return {"result": result, "agent": "job_market"}
+    plan = state.get("query_plan") or {}
+    agent = JobMarketAgent()
+    result = agent.process(
+        state["query"],
+        deadline=state.get("deadline"),
+        field=plan.get("field"),
+        location=plan.get("location"),
+        selection_index=plan.get("selection_index"),
+        last_results=state.get("last_results"),
+        fast_mode=state.get("fast_mode", False)
+    )
+    return _agent_update(state, agent, result, "job_market")
 
 @traceable(name="books_node")
+@track_node_tokens("books")
+@streams_events
 def books_node(state: GraphState):
+    plan = state.get("query_plan") or {}
     agent = BooksRecommendAgent()
-    result = agent.process(state["query"])
-    return {"result": result, "agent": "books"}
+    result = agent.process(
+        state["query"],
+        deadline=state.get("deadline"),
+        search_keywords=plan.get("search_keywords"),
+        selection_index=plan.get("selection_index"),
+        last_results=state.get("last_results"),
+        speculative_search=state.get("speculative_search"),
+        fast_mode=state.get("fast_mode", False)
+    )
+    return _agent_update(state, agent, result, "books")
 
 @traceable(name="papers_node")
+@track_node_tokens("papers")
+@streams_events
 def papers_node(state: GraphState):
+    plan = state.get("query_plan") or {}
     agent = PaperRecommendAgent()
-    result = agent.process(state["query"], chat_history=state.get("chat_history", []))
-    return {"result": result, "agent": "papers"}
+    result = agent.process(
+        state["query"],
+        deadline=state.get("deadline"),
+        search_keywords=plan.get("search_keywords"),
+        selection_index=plan.get("selection_index"),
+        last_results=state.get("last_results"),
+        speculative_search=state.get("speculative_search"),
+        fast_mode=state.get("fast_mode", False)
+    )
+    return _agent_update(state, agent, result, "papers")
 
 @traceable(name="fallback_node")
+@track_node_tokens("fallback")
+@streams_events
 def fallback_node(state: GraphState):
     fallback = FallbackAgent()
-    result = fallback.run(state["query"])
+    result = fallback.run(state["query"], conversation_context=state.get("conversation_context"))
     return {"result": result, "agent": "fallback"}
 
 @traceable(name="orchestrator_node")
+@track_node_tokens("orchestrator")
 def orchestrator_node(state: GraphState):
     """Node for orchestrator agent."""
     from agentic_student_assistant.core.orchestration.orchestrator_agent import OrchestratorAgent # pylint: disable=import-outside-toplevel
     
     orchestrator = OrchestratorAgent()
-    result = orchestrator.process(state["query"])
+    result = orchestrator.process(state["query"], deadline=state.get("deadline"))
     return {"result": result, "agent": "orchestrator"}
 
+# Specialist nodes a multi-domain query can fan out to
+SPECIALIST_NODES = {
+    "job_market": job_market_node,
+    "books": books_node,
+    "papers": papers_node,
+}
+
+@traceable(name="fanout_node")
+def fanout_node(state: GraphState):
+    """
+    Thread-pool fan-out for LangGraph versions without `Send`: runs the
+    specialist branches concurrently and collects their partial results.
+    """
+    deadline = state.get("deadline")
+    updates = run_concurrently(
+        {
+            domain: (lambda node=SPECIALIST_NODES[domain], branch=branch: node(branch))
+            for domain, branch in branch_states(state).items()
+        },
+        timeout=deadline.remaining() if deadline else None
+    )
+    partial_results, metadata = [], None
+    for update in updates.values():
+        if update:
+            partial_results += update.get("partial_results", [])
+            metadata = merge_metadata(metadata, update.get("metadata"))
+    return {"partial_results": partial_results, "metadata": metadata}
+
+@traceable(name="synthesis_node")
+@track_node_tokens("synthesis")
+@streams_events
+def synthesis_node(state: GraphState):
+    """Join the fanned-out specialists' answers into one response."""
+    answer = join_partial_results(state.get("partial_results") or [], state["fanout_domains"])
+    if get_config().orchestration.synthesize_with_llm:
+        # Optional short overview tying the sections together (one extra LLM call)
+        try:
+            llm = LLMFactory.create_task_llm(get_config(), "orchestrate")
+            overview = llm.invoke(get_prompt("fanout_overview").format(query=state["query"], sections=answer)).content
+            answer = f"{overview.strip()}\n\n{answer}"
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Fan-out overview failed: {e}")
+    emit_event("token", text=answer)
+    return {"result": answer, "agent": "orchestrator"}
+
+def route_next(state: GraphState):
+    """Router edge: the chosen agent, or the specialist branches of a fan-out."""
+    if state.get("fanout_domains"):
+        return send_branches(state) if SEND_AVAILABLE else "fanout"
+    return state["agent"]
+
+def after_specialist(state: GraphState) -> str:
+    """Specialist edge: fanned-out branches meet in the synthesis node."""
+    return "synthesis" if state.get("fanout_domains") else END
+
 # ------------ GRAPH SETUP -------------
 graph = StateGraph(GraphState)
 
@@ -115,28 +291,70 @@ graph.add_node("books", RunnableLambda(books_node))
 graph.add_node("papers", RunnableLambda(papers_node))
 graph.add_node("fallback", RunnableLambda(fallback_node))
 graph.add_node("orchestrator", RunnableLambda(orchestrator_node))  # NEW
+graph.add_node("fanout", RunnableLambda(fanout_node))
+graph.add_node("synthesis", RunnableLambda(synthesis_node))
 
 graph.add_conditional_edges(
     "router",
-    lambda state: state["agent"],
+    route_next,
     {
         "job_market": "job_market",
         "books": "books",
         "papers": "papers",
         "orchestrator": "orchestrator",  # NEW
         "fallback": "fallback",
+        "fanout": "fanout",
     },
 )
 
-graph.add_edge("job_market", END)
-graph.add_edge("books", END)
-graph.add_edge("papers", END)
+for specialist in SPECIALIST_NODES:
+    graph.add_conditional_edges(specialist, after_specialist, {"synthesis": "synthesis", END: END})
+graph.add_edge("fanout", "synthesis")
+graph.add_edge("synthesis", END)
 graph.add_edge("orchestrator", END)  # NEW
 graph.add_edge("fallback", END)
 
 graph.set_entry_point("router")
 app = graph.compile()
 
+# Optionally pre-open pooled connections to the search APIs (non-blocking)
+if get_config().http.warmup.enabled:
+    warm_up_connections()
+
+def stream_query(query: str, chat_history: Optional[List] = None, **state: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Run the graph for a query and yield its events as they happen.
+
+    Agents publish their merged search results before the LLM write-up and
+    then stream the tokens of their final synthesis call, so something
+    useful arrives long before the whole pipeline is done. The orchestrator
+    doesn't stream: its sub-agent outputs are not the answer. Fanned-out
+    multi-domain requests stream their joined answer from the synthesis node.
+
+    Args:
+        query: User query
+        chat_history: Conversation history (recent turns)
+        **state: Extra initial graph state (e.g. a `deadline`, `conversation_context`)
+
+    Yields:
+        {"type": "results", "domain": ..., "records": [...]} as soon as an
+        agent's searches are merged, {"type": "token", "text": ...} events,
+        then {"type": "final", "state": final_state} or {"type": "error", "error": message}
+    """
+    sink = EventSink()
+
+    def _run():
+        try:
+            final_state = app.invoke({"query": query, "chat_history": chat_history or [], "events": sink, **state})
+            sink.emit("final", state=final_state)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            sink.emit("error", error=str(e))
+        finally:
+            sink.close()
+
+    threading.Thread(target=contextvars.copy_context().run, args=(_run,), daemon=True).start()
+    yield from sink
+
 def log_query(query: str, agent: str, result: str, latency: float = None, is_fallback: bool = False, 
               confidence: float = None, reasoning: str = ""): # pylint: disable=R0917
     os.makedirs("logs", exist_ok=True)
@@ -21,7 +21,10 @@ class OrchestratorAgent(BaseAgent):
     def __init__(self):
         """Initialize orchestrator with ReAct agent and tools."""
         config = get_config()
-        super().__init__(config, agent_name="orchestrator")
+        super().__init__(config, agent_name="orchestrator", task="orchestrate")
+        
+        # Deadline of the request currently being processed (set in process())
+        self.deadline = None
         
         # Create tools for each specialist agent
         self.tools = self._create_tools()
@@ -73,7 +76,7 @@ class OrchestratorAgent(BaseAgent):
         tools = [
             Tool(
                 name="JobMarketSearch",
-                func=lambda q: get_job_agent().process(q),
+                func=lambda q: get_job_agent().process(q, deadline=self.deadline),
                 description=(
                     "Search job listings and career opportunities. Use this to find "
                     "current job openings, understand job market demand, or get "
@@ -82,7 +85,7 @@ class OrchestratorAgent(BaseAgent):
             ),
             Tool(
                 name="BookRecommendations",
-                func=lambda q: get_books_agent().process(q),
+                func=lambda q: get_books_agent().process(q, deadline=self.deadline),
                 description=(
                     "Find academic book recommendations and learning resources. Use this "
                     "to suggest textbooks, monographs, or other high-quality learning "
@@ -91,7 +94,7 @@ class OrchestratorAgent(BaseAgent):
             ),
             Tool(
                 name="PaperRecommendations",
-                func=lambda q: get_papers_agent().process(q),
+                func=lambda q: get_papers_agent().process(q, deadline=self.deadline),
                 description=(
                     "Find scientific research papers and academic articles. Use this to "
                     "find primary sources, latest research, citations, and technical "
@@ -131,11 +134,14 @@ class OrchestratorAgent(BaseAgent):
         
         Args:
             query: Complex user query
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters (e.g. `deadline`)
             
         Returns:
             Comprehensive answer from orchestration
         """
+        self.deadline = kwargs.get("deadline")
+        # Stop the ReAct loop once the request budget is spent
+        self.agent_executor.max_execution_time = self.deadline.remaining() if self.deadline else None
         try:
             orch_result = self.agent_executor.invoke({"input": query})
             return orch_result.get("output", "Unable to process query")
@@ -2,7 +2,8 @@
 LLM-based router agent with structured output.
 Replaces keyword-based routing with semantic understanding.
 """
-from typing import Literal
+import re
+from typing import Literal, Optional, Dict, Any, List
 # pylint: disable=no-name-in-module
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
@@ -13,6 +14,41 @@ from langchain.output_parsers import PydanticOutputParser
 
 from agentic_student_assistant.core.utils.config_loader import get_config, get_prompt
 from agentic_student_assistant.core.utils.llm_factory import LLMFactory
+from agentic_student_assistant.core.utils.cache import get_route_cache
+from agentic_student_assistant.core.utils.selection import is_follow_up, ordinal_reference
+from agentic_student_assistant.core.orchestration.embedding_router import EmbeddingRouter
+
+
+# Cheap keyword signal per domain (orchestration detection, speculative search)
+DOMAIN_KEYWORDS = {
+    "job_market": ["job", "career", "hiring", "work"],
+    "papers": ["paper", "article", "citation", "research", "study"],
+    "books": ["book", "reading", "textbook", "resource", "bibtex"],
+}
+
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def _singular(word: str) -> str:
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    return word[:-1] if word.endswith("s") and not word.endswith("ss") else word
+
+
+def likely_domains(query: str) -> List[str]:
+    """
+    Domains whose keywords appear in the query (no LLM call).
+
+    Keywords match whole words or phrases, singular or plural ("jobs",
+    "studies"), so "work" doesn't match "networks".
+    """
+    tokens = [_singular(word) for word in _WORD.findall(query.lower())]
+    text = f" {' '.join(tokens)} "
+    return [
+        domain for domain, words in DOMAIN_KEYWORDS.items()
+        if any(f" {' '.join(_singular(part) for part in word.split())} " in text for word in words)
+    ]
 
 
 class RouteDecision(BaseModel):
@@ -29,6 +65,40 @@ class RouteDecision(BaseModel):
     reasoning: str = Field(
         description="Brief explanation of why this agent was selected"
     )
+    # Query understanding, fused into the routing call so agents can skip
+    # their own extraction LLM calls
+    search_keywords: Optional[str] = Field(
+        default=None,
+        description=(
+            "For papers/books: core search keywords or title, without conversational phrases "
+            "like 'find papers on'. Use the exact spelling from the query."
+        )
+    )
+    field: Optional[str] = Field(
+        default=None,
+        description="For job_market: the field or technology (e.g. 'data science'); null if none is given"
+    )
+    location: Optional[str] = Field(
+        default=None,
+        description="For job_market: the city or country mentioned; null if none is given"
+    )
+    selection_index: Optional[int] = Field(
+        default=None,
+        description=(
+            "If the user refers to an item of a previously listed result (e.g. 'the first one', '#2'), "
+            "its 1-based position; otherwise null"
+        )
+    )
+    
+    def query_plan(self) -> Dict[str, Any]:
+        """Extracted query details to carry in GraphState (None values dropped)."""
+        plan = {
+            "search_keywords": self.search_keywords,
+            "field": self.field,
+            "location": self.location,
+            "selection_index": self.selection_index,
+        }
+        return {key: value for key, value in plan.items() if value not in (None, "")}
 
 
 class RouterAgent:
@@ -44,15 +114,69 @@ class RouterAgent:
         self.parser = PydanticOutputParser(pydantic_object=RouteDecision)
         self.prompt = self._create_prompt()
         self.chain = self.prompt | self.llm | self.parser # pylint: disable=unsupported-binary-operation
+        self.escalation_chain = None  # Built lazily on first escalation
+        self.fast_router = self._init_fast_router()
     
-    def _init_llm(self) -> ChatOpenAI:
-        """Initialize LLM for routing."""
-        # Use higher temperature for routing to allow flexibility
-        return LLMFactory.create_llm(
-            self.config.models,
+    def _init_llm(self, task: str = "route") -> ChatOpenAI:
+        """Initialize LLM for routing (small 'route' model by default)."""
+        return LLMFactory.create_task_llm(
+            self.config,
+            task,
             temperature=0.1  # Low temperature for consistent routing
         )
     
+    def _route_escalated(self, query: str, history_str: str):
+        """
+        Re-run routing on the larger escalation model.
+        
+        Returns:
+            RouteDecision, or None if there is no escalation model or it failed too
+        """
+        escalate_to = LLMFactory.escalation_task(self.config, "route")
+        if not escalate_to:
+            return None
+        try:
+            if self.escalation_chain is None:
+                escalation_llm = self._init_llm(escalate_to)
+                self.escalation_chain = self.prompt | escalation_llm | self.parser # pylint: disable=unsupported-binary-operation
+            print(f"⤴️ Escalating routing to '{escalate_to}' model")
+            return self.escalation_chain.invoke({
+                "query": query,
+                "chat_history": history_str
+            })
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"❌ Escalated routing error: {e}")
+            return None
+    
+    def _init_fast_router(self):
+        """Initialize the local embedding fast-path router (if enabled)."""
+        if not self.config.routing.fast_path.enabled:
+            return None
+        try:
+            return EmbeddingRouter(self.config.routing.fast_path)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Fast-path router unavailable: {e}")
+            return None
+    
+    def _fast_route(self, query: str):
+        """
+        Try to route locally with the embedding classifier.
+        
+        Returns:
+            RouteDecision if the classifier is confident, else None
+        """
+        if self.fast_router is None:
+            return None
+        prediction = self.fast_router.predict(query)
+        if prediction is None:
+            return None
+        agent, confidence, similarity = prediction
+        return RouteDecision(
+            agent=agent,
+            confidence=confidence,
+            reasoning=f"Fast-path embedding router (similarity {similarity:.2f})."
+        )
+    
     def _create_prompt(self) -> ChatPromptTemplate:
         """Create routing prompt template."""
         system_prompt = get_prompt("router_system")
@@ -71,45 +195,72 @@ class RouterAgent:
             chat_history="" # Default empty if not provided
         )
     
-    def route(self, query: str, chat_history: str = "") -> RouteDecision:
+    def route(
+        self, query: str, chat_history: str = "", last_results: Optional[Dict[str, Any]] = None
+    ) -> RouteDecision:
         """
         Route a query to the appropriate agent.
         
         Args:
             query: User query to route
             chat_history: Previous conversation context
+            last_results: Records shown in the previous answer (follow-up detection)
             
         Returns:
             RouteDecision with agent, confidence, and reasoning
         """
+        # Clear-cut queries are routed locally in milliseconds, on any turn. The fast
+        # path only sees the query, so follow-ups on shown items go to the LLM
+        follow_up = is_follow_up(query, last_results) or ordinal_reference(query) is not None
+        fast_decision = self._fast_route(query) if not follow_up else None
+        if fast_decision is not None:
+            print(f"⚡ Fast-path routing: {fast_decision.agent} ({fast_decision.confidence:.2f})")
+            return fast_decision
+        
+        # Callers pass a bounded context string (see `conversation_memory`)
+        history_str = chat_history or "No history."
+        threshold = self.config.routing.confidence_threshold
+        
+        decision, error = None, None
         try:
-            # Format history string if list provided (simple heuristic)
-            history_str = str(chat_history)[-1000:] if chat_history else "No history."
-            
             decision = self.chain.invoke({
                 "query": query,
                 "chat_history": history_str
             })
-            
-            # Apply confidence threshold from config
-            threshold = self.config.routing.confidence_threshold
-            if decision.confidence < threshold and self.config.routing.fallback_on_low_confidence:
-                print(f"⚠️ Low confidence ({decision.confidence:.2f}), routing to fallback")
-                decision.agent = "fallback"
-                decision.reasoning = f"Low confidence ({decision.confidence:.2f}). " + decision.reasoning
-            
-            return decision
-        
         except Exception as e: # pylint: disable=broad-exception-caught
             print(f"❌ Routing error: {e}")
+            error = e
+        
+        # Model cascade: escalate on parse failure or low confidence
+        if decision is None or decision.confidence < threshold:
+            escalated = self._route_escalated(query, history_str)
+            if escalated is not None and (decision is None or escalated.confidence >= decision.confidence):
+                decision = escalated
+        
+        if decision is None:
             # Fallback to safe default
             return RouteDecision(
                 agent="fallback",
                 confidence=0.0,
-                reasoning=f"Error during routing: {str(e)}"
+                reasoning=f"Error during routing: {str(error)}"
             )
+        
+        # Log confident LLM decisions as training data for the fast path
+        # (only first turns: the logged example carries no history)
+        if self.fast_router is not None and not chat_history and not follow_up:
+            self.fast_router.record_decision(query, decision.agent, decision.confidence)
+        
+        # Apply confidence threshold from config
+        if decision.confidence < threshold and self.config.routing.fallback_on_low_confidence:
+            print(f"⚠️ Low confidence ({decision.confidence:.2f}), routing to fallback")
+            decision.agent = "fallback"
+            decision.reasoning = f"Low confidence ({decision.confidence:.2f}). " + decision.reasoning
+        
+        return decision
     
-    def route_with_orchestration(self, query: str, chat_history: str = "") -> RouteDecision:
+    def route_with_orchestration(
+        self, query: str, chat_history: str = "", last_results: Optional[Dict[str, Any]] = None
+    ) -> RouteDecision:
         """
         Route with orchestration detection for complex queries.
         
@@ -118,21 +269,15 @@ class RouterAgent:
         Args:
             query: User query
             chat_history: Previous conversation context
+            last_results: Records shown in the previous answer
             
         Returns:
             RouteDecision
         """
-        decision = self.route(query, chat_history)
+        decision = self.route(query, chat_history, last_results)
         
         # Check if query mentions multiple domains (heuristic for orchestration)
-        query_lower = query.lower()
-        domains = 0
-        if any(word in query_lower for word in ["job", "career", "hiring", "work"]):
-            domains += 1
-        if any(word in query_lower for word in ["paper", "article", "citation", "research", "study"]):
-            domains += 1
-        if any(word in query_lower for word in ["book", "reading", "textbook", "resource", "bibtex"]):
-            domains += 1
+        domains = len(likely_domains(query))
         
         # If multiple domains detected, consider orchestrator
         if domains >= 2:
@@ -155,7 +300,12 @@ def get_router() -> 'RouterAgent':
     return _router
 
 
-def route_query(query: str, enable_orchestration: bool = False, chat_history: str = "") -> RouteDecision:
+def route_query(
+    query: str,
+    enable_orchestration: bool = False,
+    chat_history: str = "",
+    last_results: Optional[Dict[str, Any]] = None
+) -> RouteDecision:
     """
     Route a query to the appropriate agent.
     
@@ -163,16 +313,40 @@ def route_query(query: str, enable_orchestration: bool = False, chat_history: st
         query: User query
         enable_orchestration: Whether to detect and route complex queries to orchestrator
         chat_history: Previous conversation context
+        last_results: Records shown in the previous answer (follow-up detection)
         
     Returns:
         RouteDecision with agent, confidence, and reasoning
     """
     router = get_router()
+    cache_config = router.config.routing.cache
+    route_cache = None
+    if cache_config.enabled:
+        route_cache = get_route_cache(
+            ttl_seconds=cache_config.ttl_seconds,
+            max_size=cache_config.max_size,
+            similarity_threshold=cache_config.semantic_threshold,
+            history_fingerprint_chars=cache_config.history_fingerprint_chars
+        )
+    # Orchestration detection changes the decision, so it is part of the key
+    namespace = "orchestration" if enable_orchestration else "single"
+    
+    if route_cache is not None:
+        cached = route_cache.get(query, chat_history, namespace=namespace)
+        if cached is not None:
+            print("📦 Routing decision retrieved from cache")
+            return RouteDecision(**cached)
     
     if enable_orchestration:
-        return router.route_with_orchestration(query, chat_history)
-
-    return router.route(query, chat_history)
+        decision = router.route_with_orchestration(query, chat_history, last_results)
+    else:
+        decision = router.route(query, chat_history, last_results)
+    
+    # Don't cache error fallbacks (confidence 0.0)
+    if route_cache is not None and decision.confidence > 0.0:
+        route_cache.set(query, decision.dict(), chat_history, namespace=namespace)
+    
+    return decision
 
 
 if __name__ == "__main__":
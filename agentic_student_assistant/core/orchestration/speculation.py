@@ -0,0 +1,133 @@
+"""
+Speculative search while the router is deciding.
+When the query's keywords point at a single search domain (papers or books),
+that agent's search phase starts in the background concurrently with the
+router LLM call. If the router agrees, the agent consumes the results
+instead of searching again; otherwise they are discarded.
+"""
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.deadline import Deadline
+from agentic_student_assistant.core.utils.local_ranker import extract_keywords, query_terms
+from agentic_student_assistant.core.utils.selection import is_follow_up
+from agentic_student_assistant.core.orchestration.router_agent import likely_domains
+
+# Shared pool for speculative searches (they are short and I/O bound)
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speculate")
+
+# Statistics
+_stats = {'launched': 0, 'hits': 0, 'agent_mismatch': 0, 'keyword_mismatch': 0, 'failed': 0}
+_stats_lock = threading.Lock()
+
+
+def _count(outcome: str):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+class SpeculativeSearch:
+    """
+    A search phase started before the routing decision.
+    Carried in the graph state once committed.
+    """
+
+    def __init__(self, domain: str, search_query: str, future: Future):
+        self.domain = domain
+        self.search_query = search_query
+        self._future = future
+
+    def results(self, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the search results.
+
+        Returns:
+            The agent's search phase results, or None if the search failed
+            or didn't finish in time (the agent then searches itself)
+        """
+        try:
+            return self._future.result(timeout=deadline.remaining() if deadline else None)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Speculative {self.domain} search unusable: {e}")
+            _count('failed')
+            return None
+
+    def discard(self):
+        """Drop the search (a running search finishes in the background; its results are ignored)."""
+        self._future.cancel()
+
+    def commit(self, agent: str, search_keywords: Optional[str] = None) -> bool:
+        """
+        Decide whether the routing decision can use this search.
+
+        The router must pick the speculated agent, and its extracted search
+        keywords (if any) must all be part of the speculative search query.
+
+        Returns:
+            True if committed, False if discarded
+        """
+        if agent != self.domain:
+            _count('agent_mismatch')
+            print(f"🎲 Speculative {self.domain} search discarded (routed to {agent})")
+            self.discard()
+            return False
+        if search_keywords and not set(query_terms(search_keywords)) <= set(query_terms(self.search_query)):
+            _count('keyword_mismatch')
+            print(f"🎲 Speculative {self.domain} search discarded ('{self.search_query}' vs '{search_keywords}')")
+            self.discard()
+            return False
+        _count('hits')
+        print(f"🎯 Speculative {self.domain} search committed")
+        return True
+
+
+def start_speculative_search(
+    query: str,
+    deadline: Optional[Deadline] = None,
+    searchers: Optional[Dict[str, Callable[[], Any]]] = None,
+    last_results: Optional[Dict[str, Any]] = None
+) -> Optional[SpeculativeSearch]:
+    """
+    Start the likely agent's search phase if a cheap signal points at one domain.
+
+    Args:
+        query: User query
+        deadline: Request deadline (bounds the searches)
+        searchers: Factories of the agents per domain, e.g. {"papers": PaperRecommendAgent}.
+            Agents must provide `search_phase(search_query, deadline)`
+        last_results: Records shown in the previous answer (follow-ups aren't searched)
+
+    Returns:
+        The running speculative search, or None if there is nothing to speculate on
+    """
+    spec_config = get_config().get("speculation")
+    if spec_config is None or not spec_config.enabled or not searchers:
+        return None
+    # Follow-ups are answered from the previous results, without searching
+    if is_follow_up(query, last_results):
+        return None
+
+    domains = likely_domains(query)
+    if len(domains) != 1 or domains[0] not in spec_config.domains or domains[0] not in searchers:
+        return None
+
+    domain = domains[0]
+    search_query = extract_keywords(query)
+    create_agent = searchers[domain]
+    future = _executor.submit(
+        contextvars.copy_context().run, lambda: create_agent().search_phase(search_query, deadline)
+    )
+    _count('launched')
+    print(f"🎲 Speculative {domain} search started for '{search_query}'")
+    return SpeculativeSearch(domain, search_query, future)
+
+
+def get_speculation_stats() -> Dict[str, Any]:
+    """Launch/hit counts of speculative searches (hit rate = committed / launched)."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['hit_rate'] = stats['hits'] / stats['launched'] if stats['launched'] else 0.0
+    return stats
@@ -2,6 +2,7 @@ import time
 import hashlib
 import json
 import os
+import threading
 import numpy as np
 from typing import Optional, Any, Dict
 from collections import OrderedDict
@@ -119,7 +120,8 @@ class SemanticRedisCache:
         # Load local model lazily
         self._load_model()
 
-    def _load_model(self):
+    @classmethod
+    def _load_model(cls):
         if SemanticRedisCache._model_ready:
             return
 
@@ -271,6 +273,179 @@ class SemanticRedisCache:
             }
 
 
+class RouteDecisionCache:
+    """
+    In-memory cache of routing decisions.
+    Keyed by normalized query + conversation-history fingerprint, with its own
+    TTL and stats. A semantic tier reuses the local embedding model to match
+    paraphrased queries asked in the same conversation context. Thread-safe.
+    """
+    # A paraphrase shares the route but not the query plan (keywords,
+    # location, ...): semantic hits return only these fields
+    SEMANTIC_HIT_FIELDS = ("agent", "confidence", "reasoning")
+
+    def __init__(
+        self,
+        ttl_seconds: int = 1800,
+        max_size: int = 2000,
+        similarity_threshold: float = 0.92,
+        history_fingerprint_chars: int = 300
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.threshold = similarity_threshold
+        self.history_fingerprint_chars = history_fingerprint_chars
+        self.cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Lowercase, collapse whitespace and strip trailing punctuation."""
+        return " ".join(query.lower().split()).rstrip("?!. ")
+
+    def fingerprint(self, chat_history: str = "", namespace: str = "") -> str:
+        """Fingerprint of the routing mode and recent conversation context."""
+        if not chat_history:
+            return namespace
+        tail = str(chat_history)[-self.history_fingerprint_chars:]
+        return f"{namespace}:{hashlib.md5(tail.encode()).hexdigest()}"
+
+    def _generate_key(self, query: str, fingerprint: str) -> str:
+        normalized = f"route_cache:{fingerprint}:{self.normalize(query)}"
+        return hashlib.md5(normalized.encode()).hexdigest()
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry['timestamp'] > self.ttl_seconds
+
+    def _embed(self, query: str) -> Optional[Any]:
+        """Embedding of the normalized query (None without the local model)."""
+        model = get_embedding_model() if self.threshold < 1.0 else None
+        if model is None:
+            return None
+        try:
+            return model.encode(self.normalize(query), normalize_embeddings=True)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"[ERROR] Local embedding error: {e}")
+            return None
+
+    def _semantic_lookup(self, query: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        # Encode outside the lock; only the scan over entries needs it
+        query_emb = self._embed(query)
+        if query_emb is None:
+            return None
+
+        best_entry, best_sim = None, self.threshold
+        with self._lock:
+            for entry in self.cache.values():
+                if entry['fingerprint'] != fingerprint or entry.get('embedding') is None or self._expired(entry):
+                    continue
+                similarity = float(np.dot(query_emb, entry['embedding']))
+                if similarity >= best_sim:
+                    best_entry, best_sim = entry, similarity
+        if best_entry is not None:
+            print(f"[SUCCESS] Route cache semantic hit ({best_sim:.2f}): '{best_entry['query']}'")
+        return best_entry
+
+    def get(self, query: str, chat_history: str = "", namespace: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached decision.
+
+        Args:
+            query: User query
+            chat_history: Conversation context the decision depends on
+            namespace: Routing mode (decisions differ between modes)
+
+        Returns:
+            The cached decision dict (on a semantic hit only its
+            `SEMANTIC_HIT_FIELDS`, so agents extract their own query plan),
+            or None on a miss
+        """
+        fingerprint = self.fingerprint(chat_history, namespace)
+        key = self._generate_key(query, fingerprint)
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is not None and self._expired(entry):
+                del self.cache[key]
+                entry = None
+
+            if entry is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return dict(entry['decision'])
+
+        entry = self._semantic_lookup(query, fingerprint)
+        with self._lock:
+            if entry is not None:
+                self.hits += 1
+                self.semantic_hits += 1
+                return {
+                    field: value for field, value in entry['decision'].items()
+                    if field in self.SEMANTIC_HIT_FIELDS
+                }
+            self.misses += 1
+            return None
+
+    def set(self, query: str, decision: Dict[str, Any], chat_history: str = "", namespace: str = ""):
+        """Store a decision (as a plain dict) for this query and context."""
+        fingerprint = self.fingerprint(chat_history, namespace)
+        key = self._generate_key(query, fingerprint)
+        embedding = self._embed(query)
+
+        with self._lock:
+            if len(self.cache) >= self.max_size and key not in self.cache:
+                self.cache.popitem(last=False)
+            self.cache[key] = {
+                'query': self.normalize(query),
+                'fingerprint': fingerprint,
+                'decision': dict(decision),
+                'embedding': embedding,
+                'timestamp': time.time()
+            }
+
+    def clear(self):
+        with self._lock:
+            self.cache.clear()
+            self.hits = 0
+            self.semantic_hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'semantic_hits': self.semantic_hits,
+                'misses': self.misses,
+                'size': len(self.cache),
+                'max_size': self.max_size,
+                'hit_rate': self.hits / total if total > 0 else 0,
+                'type': 'route-decision'
+            }
+
+
+def get_embedding_model() -> Optional[Any]:
+    """
+    Get the shared local embedding model (the same MiniLM instance the
+    semantic cache uses), loading it on first use.
+
+    Returns:
+        SentenceTransformer instance, or None if unavailable
+    """
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        return None
+    # pylint: disable=protected-access
+    if not SemanticRedisCache._model_ready:
+        try:
+            SemanticRedisCache._load_model()
+        except RuntimeError as e:
+            print(f"[WARN] {e}")
+            return None
+    return SemanticRedisCache._model
+
+
 # Global cache instance
 _global_cache: Any = None
 
@@ -299,6 +474,26 @@ def get_cache(ttl_seconds: int = 3600, max_size: int = 1000) -> Any:
     return _global_cache
 
 
+# Global routing decision cache
+_route_cache: Optional[RouteDecisionCache] = None
+
+def get_route_cache(
+    ttl_seconds: int = 1800,
+    max_size: int = 2000,
+    similarity_threshold: float = 0.92,
+    history_fingerprint_chars: int = 300
+) -> RouteDecisionCache:
+    global _route_cache  # pylint: disable=global-statement
+    if _route_cache is None:
+        _route_cache = RouteDecisionCache(
+            ttl_seconds=ttl_seconds,
+            max_size=max_size,
+            similarity_threshold=similarity_threshold,
+            history_fingerprint_chars=history_fingerprint_chars
+        )
+    return _route_cache
+
+
 if __name__ == "__main__":
     # Test
     c = get_cache()
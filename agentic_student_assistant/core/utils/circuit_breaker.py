@@ -0,0 +1,174 @@
+"""
+Circuit breakers for upstream search sources.
+A source that keeps failing or timing out is skipped for a cool-down instead
+of adding its full timeout to every query, then probed again (half-open).
+"""
+import time
+import threading
+from typing import Dict, Any, Optional
+from omegaconf import DictConfig
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is short-circuited because the source is down."""
+
+    def __init__(self, source: str):
+        self.source = source
+        super().__init__(f"Circuit for '{source}' is open; skipping source.")
+
+
+class CircuitBreaker:
+    """
+    Thread-safe closed → open → half-open circuit breaker.
+
+    - closed: requests flow; consecutive failures are counted
+    - open: requests are skipped until the cool-down elapses
+    - half_open: a limited number of probe requests decide whether to close
+      again or re-open with a longer (exponentially growing) cool-down
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+        max_recovery_timeout: float = 300.0,
+        half_open_max_probes: int = 1
+    ): # pylint: disable=R0917
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max_recovery_timeout
+        self.half_open_max_probes = half_open_max_probes
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.current_timeout = recovery_timeout
+        self.probes_in_flight = 0
+        self.last_failure = ""
+        self.total_failures = 0
+        self.short_circuited = 0
+        self.times_opened = 0
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent to the source right now."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.current_timeout:
+                    self.short_circuited += 1
+                    return False
+                print(f"🟡 Circuit '{self.name}' half-open: probing source")
+                self.state = self.HALF_OPEN
+                self.probes_in_flight = 0
+
+            if self.state == self.HALF_OPEN:
+                if self.probes_in_flight >= self.half_open_max_probes:
+                    self.short_circuited += 1
+                    return False
+                self.probes_in_flight += 1
+
+            return True
+
+    def record_success(self):
+        """Record a successful call (closes a half-open circuit)."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                print(f"🟢 Circuit '{self.name}' closed: source recovered")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probes_in_flight = 0
+            self.current_timeout = self.recovery_timeout
+
+    def record_failure(self, reason: str = ""):
+        """Record a failed call (5xx, timeout, connection error)."""
+        with self._lock:
+            self.failures += 1
+            self.total_failures += 1
+            self.last_failure = reason
+
+            if self.state == self.HALF_OPEN:
+                # Failed probe: re-open with a longer cool-down
+                self.current_timeout = min(self.current_timeout * 2, self.max_recovery_timeout)
+                self._open()
+            elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def record_skipped(self):
+        """Release a half-open probe slot when the request was never sent."""
+        with self._lock:
+            if self.state == self.HALF_OPEN and self.probes_in_flight > 0:
+                self.probes_in_flight -= 1
+
+    def _open(self):
+        """Trip the breaker (caller holds the lock)."""
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probes_in_flight = 0
+        self.times_opened += 1
+        print(
+            f"🔴 Circuit '{self.name}' open for {self.current_timeout:.0f}s "
+            f"after {self.failures} failure(s): {self.last_failure}"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Breaker statistics for dashboards/logs."""
+        with self._lock:
+            retry_in = 0.0
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.current_timeout - (time.monotonic() - self.opened_at))
+            return {
+                'name': self.name,
+                'state': self.state,
+                'failures': self.failures,
+                'total_failures': self.total_failures,
+                'short_circuited': self.short_circuited,
+                'times_opened': self.times_opened,
+                'retry_in': retry_in,
+                'last_failure': self.last_failure,
+            }
+
+
+# Global breaker registry
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def _create_breaker(source: str, breaker_config: DictConfig) -> CircuitBreaker:
+    """Build a breaker from the `circuit_breakers` config (with per-source overrides)."""
+    overrides = breaker_config.sources.get(source) or {}
+    return CircuitBreaker(
+        name=source,
+        failure_threshold=overrides.get("failure_threshold", breaker_config.failure_threshold),
+        recovery_timeout=overrides.get("recovery_timeout_seconds", breaker_config.recovery_timeout_seconds),
+        max_recovery_timeout=breaker_config.max_recovery_timeout_seconds,
+        half_open_max_probes=breaker_config.half_open_max_probes
+    )
+
+
+def get_circuit_breaker(source: str) -> Optional[CircuitBreaker]:
+    """
+    Get the circuit breaker for an upstream source (None if disabled).
+
+    Args:
+        source: Source name, e.g. 'core', 'openreview_v2'
+    """
+    breaker_config = get_config().circuit_breakers
+    if not breaker_config.enabled:
+        return None
+
+    if source not in _breakers:
+        with _breakers_lock:
+            if source not in _breakers:
+                _breakers[source] = _create_breaker(source, breaker_config)
+    return _breakers[source]
+
+
+def get_circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of all breakers created so far."""
+    return {source: breaker.get_stats() for source, breaker in _breakers.items()}
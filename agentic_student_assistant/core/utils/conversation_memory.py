@@ -0,0 +1,188 @@
+"""
+Bounded rolling conversation memory.
+Keeps the most recent turns within a token window and folds turns that age
+out of it into a running summary (one small LLM call per fold, with a local
+fallback). Routers and agents get a precomputed context string whose size
+stays flat however long the conversation grows.
+"""
+from typing import Any, List, Optional, Sequence, Tuple
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.llm_factory import LLMFactory
+from agentic_student_assistant.core.utils.prompt_packer import count_tokens
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a student and a university assistant
+(jobs, research papers, books).
+
+Current summary:
+{summary}
+
+Turns to add:
+{turns}
+
+Rewrite the summary to include the new turns in at most {max_words} words. Keep the topics, fields,
+locations and titles the student cared about; drop pleasantries. Return only the summary."""
+
+
+def _clip(text: str, max_tokens: int) -> str:
+    """Shorten text to about `max_tokens`, at a word boundary, marking the cut."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    words = text.split()
+    # ~0.75 words per token
+    kept = words[:max(1, int(max_tokens * 0.75))]
+    return " ".join(kept) + " …"
+
+
+def _format_turns(turns: Sequence[Tuple[str, str]]) -> str:
+    return "\n".join(f"{role}: {message}" for role, message in turns)
+
+
+class ConversationMemory:
+    """
+    Recent turns within a token window plus an incrementally updated summary
+    of older turns.
+    """
+
+    def __init__(
+        self,
+        window_tokens: int = 800,
+        max_message_tokens: int = 250,
+        summary_tokens: int = 200,
+        llm: Optional[Any] = None
+    ):
+        """
+        Args:
+            window_tokens: Token budget of the recent-turns window
+            max_message_tokens: Messages are clipped to this size in the window
+            summary_tokens: Size bound of the running summary
+            llm: Model used to fold old turns into the summary (local
+                extractive summary if None)
+        """
+        self.window_tokens = window_tokens
+        self.max_message_tokens = max_message_tokens
+        self.summary_tokens = summary_tokens
+        self.llm = llm
+        self.turns: List[Tuple[str, str]] = []
+        self.summary = ""
+        self.summarized_turns = 0
+        self._context: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, summarize_with_llm: Optional[bool] = None) -> 'ConversationMemory':
+        """
+        Create a memory from the `conversation_memory` config section.
+
+        Args:
+            summarize_with_llm: Override `summarize_with_llm` (False keeps the
+                memory free of LLM calls)
+        """
+        config = get_config()
+        memory_config = config.conversation_memory
+        if summarize_with_llm is None:
+            summarize_with_llm = memory_config.summarize_with_llm
+        return cls(
+            window_tokens=memory_config.window_tokens,
+            max_message_tokens=memory_config.max_message_tokens,
+            summary_tokens=memory_config.summary_tokens,
+            llm=LLMFactory.create_task_llm(config, "memory") if summarize_with_llm else None
+        )
+
+    @classmethod
+    def from_history(cls, history: Sequence[Tuple[str, str]]) -> 'ConversationMemory':
+        """Build an LLM-free memory from a plain (role, message) history list."""
+        memory = cls.from_config(summarize_with_llm=False)
+        for role, message in history:
+            memory.add(role, message)
+        return memory
+
+    def to_dict(self) -> dict:
+        """JSON-serializable state (for server-side session stores)."""
+        return {
+            'turns': [list(turn) for turn in self.turns],
+            'summary': self.summary,
+            'summarized_turns': self.summarized_turns,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ConversationMemory':
+        """Restore a memory saved with `to_dict` (sizes and LLM come from config)."""
+        memory = cls.from_config()
+        memory.turns = [tuple(turn) for turn in data.get("turns", [])]
+        memory.summary = data.get("summary", "")
+        memory.summarized_turns = data.get("summarized_turns", 0)
+        return memory
+
+    def _window_size(self) -> int:
+        return sum(count_tokens(f"{role}: {message}") for role, message in self.turns)
+
+    def add(self, role: str, message: str):
+        """Append a turn; turns pushed out of the window are folded into the summary."""
+        self.turns.append((role, _clip(" ".join(str(message).split()), self.max_message_tokens)))
+        self._context = None
+
+        if self._window_size() <= self.window_tokens:
+            return
+        # Evict down to a low-water mark so folds (LLM calls) happen every few turns, not every turn
+        evicted = []
+        while len(self.turns) > 1 and self._window_size() > self.window_tokens * 0.6:
+            evicted.append(self.turns.pop(0))
+        if evicted:
+            self._fold(evicted)
+
+    def _fold(self, evicted: List[Tuple[str, str]]):
+        """Update the running summary with turns that left the window."""
+        self.summarized_turns += len(evicted)
+        if self.llm is not None:
+            prompt = SUMMARY_PROMPT.format(
+                summary=self.summary or "(empty)",
+                turns=_format_turns(evicted),
+                max_words=int(self.summary_tokens * 0.75)
+            )
+            try:
+                self.summary = _clip(self.llm.invoke(prompt).content.strip(), self.summary_tokens)
+                return
+            except Exception as e: # pylint: disable=broad-exception-caught
+                print(f"⚠️ Memory summary failed: {e}. Using local summary.")
+
+        # Local fallback: what the student asked, newest last, bounded from the front
+        asked = [message for role, message in evicted if role == "user"]
+        summary = "; ".join(part for part in [self.summary] + asked if part)
+        while count_tokens(summary) > self.summary_tokens and "; " in summary:
+            summary = summary.split("; ", 1)[1]
+        self.summary = _clip(summary, self.summary_tokens)
+
+    def context(self) -> str:
+        """Precomputed context string for prompts (summary + recent turns)."""
+        if self._context is None:
+            parts = []
+            if self.summary:
+                parts.append(f"Earlier in the conversation: {self.summary}")
+            if self.turns:
+                parts.append(f"Recent turns:\n{_format_turns(self.turns)}")
+            self._context = "\n\n".join(parts)
+        return self._context
+
+    def recent_turns(self) -> List[Tuple[str, str]]:
+        """The turns currently in the window."""
+        return list(self.turns)
+
+    def get_stats(self) -> dict:
+        """Get memory statistics."""
+        return {
+            'window_turns': len(self.turns),
+            'window_tokens': self._window_size(),
+            'summarized_turns': self.summarized_turns,
+            'summary_tokens': count_tokens(self.summary),
+        }
+
+
+def conversation_context(history: Optional[Sequence[Tuple[str, str]]]) -> str:
+    """
+    Bounded context string for a plain history list (no LLM calls).
+    Used when the caller didn't pass a precomputed `conversation_context`.
+    """
+    if not history:
+        return ""
+    turns = [turn for turn in history if isinstance(turn, (list, tuple)) and len(turn) == 2]
+    return ConversationMemory.from_history(turns).context()
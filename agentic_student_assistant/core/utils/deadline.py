@@ -0,0 +1,95 @@
+"""
+Per-request deadline budget shared by the graph, agents and tools.
+A Deadline is created at graph entry and passed down so that HTTP timeouts
+shrink to the remaining budget and optional retries/fallbacks are skipped
+once there is no time left.
+"""
+import time
+from typing import Optional
+from omegaconf import DictConfig
+
+# Timeout used by tools when no deadline is supplied (seconds)
+DEFAULT_TOOL_TIMEOUT = 10.0
+
+
+class Deadline:
+    """
+    Monotonic time budget for a single user request.
+    """
+
+    def __init__(
+        self,
+        budget_seconds: float,
+        min_timeout: float = 1.0,
+        optional_step_min_seconds: float = 5.0
+    ):
+        """
+        Initialize deadline.
+
+        Args:
+            budget_seconds: Total time budget for the request
+            min_timeout: Smallest timeout handed to a network call
+            optional_step_min_seconds: Budget required before running optional
+                retries or fallbacks
+        """
+        self.budget_seconds = budget_seconds
+        self.min_timeout = min_timeout
+        self.optional_step_min_seconds = optional_step_min_seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget_seconds
+
+    @classmethod
+    def from_config(cls, app_config: DictConfig) -> 'Deadline':
+        """Create a deadline from the `deadline` section of the app config."""
+        deadline_cfg = app_config.deadline
+        return cls(
+            budget_seconds=deadline_cfg.budget_seconds,
+            min_timeout=deadline_cfg.min_tool_timeout,
+            optional_step_min_seconds=deadline_cfg.optional_step_min_seconds
+        )
+
+    def elapsed(self) -> float:
+        """Seconds spent since the request started."""
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float:
+        """Seconds left in the budget (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Whether the budget is exhausted."""
+        return self.remaining() <= 0.0
+
+    def allows_optional_step(self) -> bool:
+        """Whether there is enough budget left for an optional retry or fallback."""
+        return self.remaining() >= self.optional_step_min_seconds
+
+    def timeout(self, default: float = DEFAULT_TOOL_TIMEOUT) -> float:
+        """
+        Timeout for the next network call.
+
+        Args:
+            default: Timeout to use when the budget is not the limiting factor
+
+        Returns:
+            min(default, remaining budget), floored at `min_timeout`
+        """
+        return max(self.min_timeout, min(default, self.remaining()))
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.2f}s, budget={self.budget_seconds}s)"
+
+
+def tool_timeout(deadline: Optional[Deadline], default: float = DEFAULT_TOOL_TIMEOUT) -> float:
+    """Timeout for a tool call, honoring the deadline if one is given."""
+    return deadline.timeout(default) if deadline else default
+
+
+def is_expired(deadline: Optional[Deadline]) -> bool:
+    """Whether a (possibly missing) deadline has run out."""
+    return deadline is not None and deadline.expired()
+
+
+def allows_optional_step(deadline: Optional[Deadline]) -> bool:
+    """Whether an optional retry/fallback may run (always True without a deadline)."""
+    return deadline is None or deadline.allows_optional_step()
@@ -0,0 +1,243 @@
+"""
+Shared pooled HTTP client for all external search tools.
+Keeps keep-alive connection pools per upstream host so repeated searches
+reuse TCP/TLS connections instead of re-handshaking on every call, and
+applies per-source rate limiting, circuit breaking and retries of transient
+gateway errors in `fetch()`.
+"""
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, List
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from omegaconf import DictConfig
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.deadline import Deadline, allows_optional_step
+from agentic_student_assistant.core.utils.rate_limiter import get_rate_limiter, RateLimitExceeded
+from agentic_student_assistant.core.utils.circuit_breaker import get_circuit_breaker, CircuitOpenError
+
+USER_AGENT = "agentic-student-assistant (+https://github.com/hsrak/Agentic_Student_Assistant)"
+
+# Set while background prefetch work runs: its requests draw from separate,
+# smaller rate-limit buckets so they can't starve foreground searches
+_prefetch_traffic: ContextVar[bool] = ContextVar("prefetch_traffic", default=False)
+
+# Global session (requests.Session is safe to share for concurrent GETs)
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_retry(retry_config: DictConfig) -> Retry:
+    """
+    Build the urllib3 retry policy for idempotent requests.
+
+    Only connection errors are retried here. Transient gateway errors are
+    retried by `fetch()`, where each attempt takes a rate-limit token and
+    fits the request deadline. 429s are left to the tools (they report rate
+    limits upstream) and read timeouts are not retried so a slow source
+    can't double its cost.
+    """
+    return Retry(
+        total=retry_config.total,
+        connect=retry_config.total,
+        read=0,
+        status=0,
+        backoff_factor=retry_config.backoff_factor,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+
+
+def _create_session(http_config: DictConfig) -> requests.Session:
+    """Create a session with one connection pool per configured upstream host."""
+    session = requests.Session()
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "User-Agent": USER_AGENT,
+    })
+
+    retry = _build_retry(http_config.retries)
+
+    # Default pools for any host without a dedicated entry
+    default_adapter = HTTPAdapter(
+        pool_connections=http_config.pool_connections,
+        pool_maxsize=http_config.pool_maxsize,
+        max_retries=retry
+    )
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+
+    # Per-host pools (requests picks the longest matching prefix)
+    for pool in http_config.pools:
+        session.mount(pool.prefix, HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool.maxsize,
+            max_retries=retry
+        ))
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the global pooled HTTP session (singleton)."""
+    global _session # pylint: disable=global-statement
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session(get_config().http)
+    return _session
+
+
+@contextmanager
+def prefetch_traffic() -> Iterator[None]:
+    """Mark requests made in this block as background prefetch traffic."""
+    token = _prefetch_traffic.set(True)
+    try:
+        yield
+    finally:
+        _prefetch_traffic.reset(token)
+
+
+def rate_limit_key(source: str) -> str:
+    """
+    Rate limiter key of a request: `<source>_prefetch` for prefetch traffic
+    when that bucket is configured, else the source's own bucket.
+    """
+    if _prefetch_traffic.get() and f"{source}_prefetch" in get_config().rate_limits.sources:
+        return f"{source}_prefetch"
+    return source
+
+
+def _acquire_token(limiter, deadline: Optional[Deadline]) -> bool:
+    """Wait for a rate-limit token, no longer than the limiter allows or the deadline has left."""
+    if limiter is None:
+        return True
+    max_wait = limiter.max_wait_seconds
+    if deadline is not None:
+        max_wait = min(max_wait, deadline.remaining())
+    return limiter.acquire(max_wait)
+
+
+def _retry_fits(deadline: Optional[Deadline], backoff: float) -> bool:
+    """Whether a retry after `backoff` seconds still fits the request deadline."""
+    if deadline is None:
+        return True
+    return allows_optional_step(deadline) and deadline.remaining() > backoff + deadline.min_timeout
+
+
+def fetch(source: str, url: str, deadline: Optional[Deadline] = None, **kwargs) -> requests.Response:
+    """
+    GET `url` on behalf of an upstream source through the shared session.
+
+    Skips sources whose circuit breaker is open, waits briefly for the
+    source's rate limiter (bounded by the deadline), and reports 429s to the
+    limiter and 5xx/timeouts to the breaker. Transient gateway errors
+    (`http.retries.status_forcelist`) are retried with backoff while the
+    deadline allows an optional step; every attempt takes a rate-limit token.
+    Prefetch traffic uses the source's prefetch bucket (see `rate_limit_key`).
+
+    Args:
+        source: Upstream source name (rate limiter key), e.g. 'arxiv'
+        url: Request URL
+        deadline: Optional request deadline bounding the queueing delay
+        **kwargs: Passed to requests.Session.get (params, headers, timeout, ...)
+
+    Returns:
+        requests.Response
+
+    Raises:
+        CircuitOpenError: If the source is cooling down after repeated failures
+        RateLimitExceeded: If no request slot is available in time
+    """
+    breaker = get_circuit_breaker(source)
+    if breaker is not None and not breaker.allow_request():
+        raise CircuitOpenError(source)
+
+    limiter = get_rate_limiter(rate_limit_key(source))
+    if not _acquire_token(limiter, deadline):
+        if breaker is not None:
+            breaker.record_skipped()
+        raise RateLimitExceeded(source)
+
+    retry_config = get_config().http.retries
+    attempt = 0
+    while True:
+        try:
+            resp = get_session().get(url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            if breaker is not None:
+                breaker.record_failure(type(e).__name__)
+            raise
+
+        if limiter is not None:
+            if resp.status_code == 429:
+                limiter.on_rate_limited(resp.headers.get("Retry-After"))
+            else:
+                limiter.on_success()
+
+        if resp.status_code not in retry_config.status_forcelist or attempt >= retry_config.total:
+            break
+        attempt += 1
+        backoff = retry_config.backoff_factor * (2 ** (attempt - 1))
+        if not _retry_fits(deadline, backoff):
+            break
+        time.sleep(backoff)
+        if not _acquire_token(limiter, deadline):
+            break
+        print(f"🔁 {source} returned HTTP {resp.status_code}, retrying ({attempt}/{retry_config.total})")
+        resp.close()
+        if deadline is not None and isinstance(kwargs.get("timeout"), (int, float)):
+            kwargs["timeout"] = deadline.timeout(kwargs["timeout"])
+
+    # One outcome per fetch, as when urllib3 retried inside the request
+    if breaker is not None:
+        if resp.status_code >= 500:
+            breaker.record_failure(f"HTTP {resp.status_code}")
+        else:
+            breaker.record_success()
+    return resp
+
+
+def warm_up_connections(prefixes: Optional[List[str]] = None, timeout: float = 3.0) -> List[threading.Thread]:
+    """
+    Open connections to upstream hosts in the background so the first
+    user query doesn't pay the TCP/TLS handshake.
+
+    Args:
+        prefixes: URL prefixes to warm up (defaults to all configured pools)
+        timeout: Timeout for each warm-up request
+
+    Returns:
+        The started (daemon) threads
+    """
+    if prefixes is None:
+        prefixes = [pool.prefix for pool in get_config().http.pools]
+
+    session = get_session()
+
+    def _warm(prefix: str):
+        try:
+            session.head(prefix + "/", timeout=timeout, allow_redirects=False)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ HTTP warm-up failed for {prefix}: {e}")
+
+    threads = []
+    for prefix in prefixes:
+        thread = threading.Thread(target=_warm, args=(prefix,), daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+def close_session():
+    """Close pooled connections (e.g. on shutdown)."""
+    global _session # pylint: disable=global-statement
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,251 @@
+"""
+Deterministic LLM-call cache.
+Stores chat completions keyed by a hash of model, temperature, max tokens,
+stop sequences and the full message list, so identical internal calls
+(query refinement, ranking over the same results, ...) are not recomputed
+when the outer answer cache misses. Only low-temperature calls are cached.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from omegaconf import DictConfig
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+
+# Optional redis import
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+def llm_cache_key(
+    model_name: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    messages: List[BaseMessage],
+    stop: Optional[List[str]] = None,
+    **kwargs: Any
+) -> str:
+    """Hash of everything that determines a (low-temperature) completion."""
+    payload = {
+        "model": model_name,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "messages": [(message.type, message.content) for message in messages],
+        "stop": stop,
+        "kwargs": kwargs,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _dump_result(result: ChatResult) -> str:
+    """Serialize the parts of a ChatResult worth replaying."""
+    return json.dumps({
+        "generations": [
+            {"content": g.message.content, "additional_kwargs": g.message.additional_kwargs}
+            for g in result.generations
+        ],
+        "model_name": (result.llm_output or {}).get("model_name"),
+    })
+
+
+def _load_result(raw: str) -> ChatResult:
+    """Rebuild a ChatResult from its cached form (marked as cached, no token usage)."""
+    data = json.loads(raw)
+    return ChatResult(
+        generations=[
+            ChatGeneration(message=AIMessage(content=g["content"], additional_kwargs=g["additional_kwargs"]))
+            for g in data["generations"]
+        ],
+        llm_output={"model_name": data.get("model_name"), "cached": True},
+    )
+
+
+class DiskLLMCache:
+    """
+    File-based LLM-call cache (one JSON file per key, sharded by prefix).
+    Survives restarts without any extra service.
+    """
+
+    def __init__(self, directory: str = "logs/llm_cache", ttl_seconds: int = 86400, max_entries: int = 5000):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[ChatResult]:
+        """Get a cached completion (None on miss or expiry)."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                self.misses += 1
+                return None
+            result = _load_result(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def set(self, key: str, result: ChatResult):
+        """Store a completion (atomic write, occasional pruning)."""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_text(_dump_result(result), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ LLM cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._writes += 1
+            should_prune = self._writes % 100 == 0
+        if should_prune:
+            self._prune()
+
+    def _prune(self):
+        """Drop the oldest entries beyond max_entries."""
+        files = sorted(self.directory.glob("*/*.json"), key=lambda p: p.stat().st_mtime)
+        for path in files[:max(0, len(files) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        for path in self.directory.glob("*/*.json"):
+            path.unlink(missing_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total > 0 else 0,
+            'type': 'disk'
+        }
+
+
+class RedisLLMCache:
+    """
+    Redis-backed LLM-call cache shared across processes/replicas.
+    """
+
+    def __init__(self, client, ttl_seconds: int = 86400):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[ChatResult]:
+        try:
+            raw = self.client.get(f"llmcache:{key}")
+            if raw is None:
+                self.misses += 1
+                return None
+            result = _load_result(raw)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Redis LLM cache error: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def set(self, key: str, result: ChatResult):
+        try:
+            self.client.setex(f"llmcache:{key}", self.ttl_seconds, _dump_result(result))
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Redis LLM cache error: {e}")
+
+    def clear(self):
+        try:
+            for key in self.client.scan_iter("llmcache:*"):
+                self.client.delete(key)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Redis LLM cache error: {e}")
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total > 0 else 0,
+            'type': 'redis'
+        }
+
+
+# Global LLM-call cache
+_llm_cache: Any = None
+_llm_cache_lock = threading.Lock()
+
+
+def _create_llm_cache(cache_config: DictConfig) -> Any:
+    """Build the cache backend from the `llm_cache` config."""
+    if cache_config.backend == "redis" and REDIS_AVAILABLE:
+        try:
+            client = redis.Redis(
+                host=os.getenv("REDIS_HOST", "localhost"),
+                port=int(os.getenv("REDIS_PORT", "6379")),
+                db=int(os.getenv("REDIS_DB", "0")),
+                password=os.getenv("REDIS_PASSWORD"),
+                decode_responses=True,
+                socket_timeout=2.0
+            )
+            client.ping()
+            return RedisLLMCache(client, ttl_seconds=cache_config.ttl_seconds)
+        except Exception as redis_err: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Redis LLM cache unavailable: {redis_err}. Falling back to disk.")
+
+    return DiskLLMCache(
+        directory=cache_config.directory,
+        ttl_seconds=cache_config.ttl_seconds,
+        max_entries=cache_config.max_entries
+    )
+
+
+def get_llm_cache(temperature: Optional[float] = None) -> Any:
+    """
+    Get the global LLM-call cache.
+
+    Args:
+        temperature: Temperature of the call; above `llm_cache.max_temperature`
+            the call is not cacheable
+
+    Returns:
+        Cache backend, or None if disabled/not applicable
+    """
+    global _llm_cache # pylint: disable=global-statement
+    cache_config = get_config().get("llm_cache")
+    if cache_config is None or not cache_config.enabled:
+        return None
+    if temperature is not None and temperature > cache_config.max_temperature:
+        return None
+
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = _create_llm_cache(cache_config)
+    return _llm_cache
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """Statistics of the LLM-call cache (empty if never used)."""
+    return _llm_cache.get_stats() if _llm_cache is not None else {}
@@ -1,13 +1,21 @@
 """
 LLM Factory for creating LLM instances from configuration.
-Supports OpenAI (paid) and Groq (free) with automatic fallback.
+Supports OpenAI (paid) and Groq (free) with automatic fallback, or a pool of
+keys across both providers with latency-aware failover. Either way, models are
+wrapped in `PooledChatModel` for the concurrency limiter, LLM-call cache and
+token usage accounting.
 """
 import os
 from typing import Optional
 # from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_community.chat_models import ChatOpenAI # pylint: disable=no-name-in-module,import-error
 from langchain.embeddings import OpenAIEmbeddings
-from omegaconf import DictConfig
+from omegaconf import DictConfig, OmegaConf
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.llm_pool import (
+    PooledChatModel, get_provider_pool, get_single_endpoint_pool
+)
 
 
 class LLMFactory:
@@ -16,6 +24,14 @@ class LLMFactory:
     Automatically falls back to Groq if OpenAI API key is not available.
     """
     
+    # Map GPT models to Groq equivalents
+    GROQ_MODEL_MAPPING = {
+        "gpt-4-turbo": "llama-3.3-70b-versatile",
+        "gpt-3.5-turbo": "llama-3.1-8b-instant",
+    }
+    GROQ_DEFAULT_MODEL = "llama-3.3-70b-versatile"
+    GROQ_API_BASE = "https://api.groq.com/openai/v1"
+    
     @classmethod
     def _get_provider(cls) -> str:
         """
@@ -47,28 +63,176 @@ class LLMFactory:
         cls,
         model_config: DictConfig,
         temperature: Optional[float] = None,
-        streaming: Optional[bool] = None
+        streaming: Optional[bool] = None,
+        task: Optional[str] = None
     ) -> ChatOpenAI:
         """
         Create LLM instance with automatic provider detection.
         
+        With `llm_pool.enabled`, returns a pooled model that spreads calls over
+        all configured keys/providers and fails over on 429/5xx errors;
+        otherwise a pooled model over the one detected provider.
+        
         Args:
             model_config: Model configuration from Hydra
             temperature: Override temperature (optional)
             streaming: Override streaming setting (optional)
+            task: Task profile the model serves (optional, for stats)
             
         Returns:
             ChatOpenAI or compatible LLM instance
         """
+        pool_config = get_config().get("llm_pool")
+        if pool_config is not None and pool_config.enabled:
+            return cls._create_pooled_llm(model_config, pool_config, temperature, streaming, task)
+        
         provider = cls._get_provider()
         
         if provider == "openai":
-            return cls._create_openai_llm(model_config, temperature, streaming)
+            llm = cls._create_openai_llm(model_config, temperature, streaming)
+        elif provider == "groq":
+            llm = cls._create_groq_llm(model_config, temperature, streaming)
+        else:
+            return None
         
-        if provider == "groq":
-            return cls._create_groq_llm(model_config, temperature, streaming)
+        if pool_config is None:
+            return llm
+        return cls._wrap_single_provider(llm, provider, model_config, pool_config, task)
+    
+    @staticmethod
+    def task_model_config(app_config: DictConfig, task: str) -> DictConfig:
+        """
+        Resolve the model configuration for a task profile.
+        
+        Profile fields left null inherit from the default `models` config.
+        
+        Args:
+            app_config: Application configuration from Hydra
+            task: Task profile name (route, refine, rank, summarize, fallback, orchestrate)
+            
+        Returns:
+            Model configuration for the task
+        """
+        profile = app_config.llm_tasks.get(task)
+        if profile is None:
+            print(f"⚠️ Unknown LLM task profile '{task}'. Using default model.")
+            return app_config.models
+        
+        overrides = {
+            key: profile.get(profile_key)
+            for key, profile_key in (("name", "model"), ("temperature", "temperature"), ("max_tokens", "max_tokens"))
+            if profile.get(profile_key) is not None
+        }
+        return OmegaConf.merge(app_config.models, overrides)
+    
+    @staticmethod
+    def escalation_task(app_config: DictConfig, task: str) -> Optional[str]:
+        """
+        Get the profile to escalate to when a task's model fails to parse
+        or is not confident enough.
+        
+        Returns:
+            Escalation profile name, or None if the task doesn't escalate
+        """
+        profile = app_config.llm_tasks.get(task)
+        return profile.get("escalate_to") if profile is not None else None
+    
+    @classmethod
+    def create_task_llm(
+        cls,
+        app_config: DictConfig,
+        task: str,
+        temperature: Optional[float] = None,
+        streaming: Optional[bool] = None
+    ) -> ChatOpenAI:
+        """
+        Create the LLM for a task profile (model cascade).
+        
+        Args:
+            app_config: Application configuration from Hydra
+            task: Task profile name
+            temperature: Override temperature (optional)
+            streaming: Override streaming setting (optional)
             
-        return None
+        Returns:
+            ChatOpenAI or compatible LLM instance
+        """
+        return cls.create_llm(cls.task_model_config(app_config, task), temperature, streaming, task=task)
+    
+    @classmethod
+    def _create_pooled_llm(
+        cls,
+        model_config: DictConfig,
+        pool_config: DictConfig,
+        temperature: Optional[float],
+        streaming: Optional[bool],
+        task: Optional[str]
+    ) -> PooledChatModel:
+        """
+        Create a pooled LLM with one client per provider endpoint.
+        Clients don't retry internally so a rate-limited key fails over at once.
+        """
+        pool = get_provider_pool(pool_config)
+        if not pool.endpoints:
+            cls._get_provider()  # Raises the missing-key error
+        
+        temperature = temperature if temperature is not None else model_config.temperature
+        streaming = streaming if streaming is not None else model_config.streaming
+        clients = {}
+        for endpoint in pool.endpoints:
+            model_name = model_config.name
+            if endpoint.provider == "groq":
+                model_name = cls.GROQ_MODEL_MAPPING.get(model_config.name, cls.GROQ_DEFAULT_MODEL)
+            clients[endpoint.id] = ChatOpenAI(
+                model=model_name,
+                temperature=temperature,
+                max_tokens=model_config.max_tokens,
+                openai_api_key=endpoint.api_key,
+                openai_api_base=endpoint.api_base,
+                streaming=streaming,
+                max_retries=pool_config.client_max_retries,
+                request_timeout=pool_config.request_timeout_seconds
+            )
+        
+        return PooledChatModel(
+            pool=pool,
+            clients=clients,
+            model_name=model_config.name,
+            temperature=temperature,
+            max_tokens=model_config.max_tokens,
+            streaming=streaming,
+            task=task,
+            max_attempts=pool_config.max_attempts
+        )
+    
+    @classmethod
+    def _wrap_single_provider(
+        cls,
+        llm: ChatOpenAI,
+        provider: str,
+        model_config: DictConfig,
+        pool_config: DictConfig,
+        task: Optional[str]
+    ) -> PooledChatModel:
+        """
+        Wrap a single-provider client in a one-endpoint pooled model, so it goes
+        through the same limiter, LLM-call cache and usage accounting.
+        """
+        if provider == "groq":
+            pool = get_single_endpoint_pool(pool_config, provider, os.getenv("GROQ_API_KEY"), cls.GROQ_API_BASE)
+        else:
+            pool = get_single_endpoint_pool(pool_config, provider, os.getenv("OPENAI_API_KEY"), None)
+        endpoint = pool.endpoints[0]
+        return PooledChatModel(
+            pool=pool,
+            clients={endpoint.id: llm},
+            model_name=model_config.name,
+            temperature=llm.temperature,
+            max_tokens=llm.max_tokens,
+            streaming=llm.streaming,
+            task=task,
+            max_attempts=1
+        )
     
     @classmethod
     def _create_openai_llm(
@@ -91,14 +255,8 @@ class LLMFactory:
         Create Groq LLM instance (compatible with LangChain).
         Uses ChatOpenAI with custom base_url for Groq API.
         """
-        # Map GPT models to Groq equivalents
-        model_mapping = {
-            "gpt-4-turbo": "llama-3.3-70b-versatile",
-            "gpt-3.5-turbo": "llama-3.1-8b-instant",
-        }
-        
         requested_model = model_config.name
-        groq_model = model_mapping.get(requested_model, "llama-3.3-70b-versatile")
+        groq_model = cls.GROQ_MODEL_MAPPING.get(requested_model, cls.GROQ_DEFAULT_MODEL)
         
         print(f"💡 Mapping {requested_model} → Groq {groq_model}")
         
@@ -107,7 +265,7 @@ class LLMFactory:
             temperature=temperature if temperature is not None else model_config.temperature,
             max_tokens=model_config.max_tokens,
             openai_api_key=os.getenv("GROQ_API_KEY"),
-            openai_api_base="https://api.groq.com/openai/v1",
+            openai_api_base=cls.GROQ_API_BASE,
             streaming=streaming if streaming is not None else False
         )
     
@@ -0,0 +1,288 @@
+"""
+Adaptive concurrency limiting for LLM calls.
+Caps simultaneous calls per provider model and adapts the cap with AIMD:
+additive increase while calls succeed, multiplicative decrease on rate-limit
+signals. Slots can be shared across processes through a Redis sorted set.
+"""
+import os
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from omegaconf import DictConfig
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+
+# Optional redis import
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class LLMQueueTimeout(Exception):
+    """Raised when no LLM call slot frees up within the allowed queue wait."""
+
+    def __init__(self, name: str, waited: float):
+        self.name = name
+        self.waited = waited
+        super().__init__(f"No LLM slot for '{name}' after {waited:.1f}s in queue.")
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Thread-safe in-process AIMD concurrency limiter.
+
+    The limit grows by `increase_step / limit` per successful call (about
+    +increase_step per window of `limit` calls) and is multiplied by
+    `decrease_factor` on a rate limit. Decreases are spaced by
+    `decrease_cooldown` so one burst of 429s from calls already in flight
+    only counts once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 16,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 2.0,
+        max_queue_wait: float = 20.0
+    ): # pylint: disable=R0917
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.max_queue_wait = max_queue_wait
+        self._cond = threading.Condition()
+        self._last_decrease = 0.0
+        self.in_flight = 0
+        self.queued = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _has_capacity(self) -> bool:
+        """Whether a slot is free (caller holds the lock)."""
+        return self.in_flight < max(1, int(self.limit))
+
+    def _try_take(self) -> bool:
+        """Take a slot if one is free (caller holds the lock)."""
+        if not self._has_capacity():
+            return False
+        self.in_flight += 1
+        return True
+
+    def _give_back(self):
+        """Return a slot (caller holds the lock)."""
+        self.in_flight = max(0, self.in_flight - 1)
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a call slot.
+
+        Args:
+            timeout: Longest acceptable queue wait (defaults to the configured value)
+
+        Returns:
+            Seconds spent waiting in the queue
+
+        Raises:
+            LLMQueueTimeout: If no slot frees up in time
+        """
+        if timeout is None:
+            timeout = self.max_queue_wait
+        start = time.monotonic()
+        with self._cond:
+            self.queued += 1
+            try:
+                while not self._try_take():
+                    remaining = timeout - (time.monotonic() - start)
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise LLMQueueTimeout(self.name, time.monotonic() - start)
+                    # Wake up periodically: shared (Redis) slots free up without a notify
+                    self._cond.wait(min(remaining, 0.25))
+            finally:
+                self.queued -= 1
+            waited = time.monotonic() - start
+            self.acquired += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def release(self):
+        """Release a call slot."""
+        with self._cond:
+            self._give_back()
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None) -> Iterator[float]:
+        """Hold a call slot for the duration of the block (yields the queue wait)."""
+        waited = self.acquire(timeout)
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def on_success(self):
+        """Additive increase after a successful call."""
+        with self._cond:
+            self.limit = min(self.max_limit, self.limit + self.increase_step / max(self.limit, 1.0))
+            self._cond.notify()
+
+    def on_rate_limited(self):
+        """Multiplicative decrease after a rate-limit signal (429)."""
+        with self._cond:
+            self.rate_limited += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.decrease_cooldown:
+                return
+            self._last_decrease = now
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+            print(f"🐢 LLM limiter '{self.name}': rate limited, concurrency limit → {self.limit:.1f}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limiter statistics (incl. queue wait) for dashboards/logs."""
+        with self._cond:
+            return {
+                'name': self.name,
+                'limit': round(self.limit, 2),
+                'in_flight': self.in_flight,
+                'queued': self.queued,
+                'acquired': self.acquired,
+                'timeouts': self.timeouts,
+                'rate_limited': self.rate_limited,
+                'avg_wait': self.total_wait / self.acquired if self.acquired else 0,
+                'max_wait': self.max_wait,
+                'type': 'in-memory'
+            }
+
+
+class RedisConcurrencyLimiter(AdaptiveConcurrencyLimiter):
+    """
+    Concurrency limiter whose slots live in a Redis sorted set so several
+    processes/replicas share one cap per model. Each slot is a lease that
+    expires if its holder dies mid-call. The AIMD limit is adapted locally
+    from the 429s this process sees.
+    """
+
+    _ACQUIRE_SCRIPT = """
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', tonumber(ARGV[1]) - tonumber(ARGV[3]))
+    if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+        redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+        redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[3])))
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, client, name: str, lease_seconds: float = 120.0, **kwargs):
+        super().__init__(name, **kwargs)
+        self.client = client
+        self.key = f"llmlimit:{name}"
+        self.lease_seconds = lease_seconds
+        self._acquire_script = client.register_script(self._ACQUIRE_SCRIPT)
+        self._local = threading.local()
+
+    def _try_take(self) -> bool:
+        if not self._has_capacity():
+            return False
+        member = uuid.uuid4().hex
+        try:
+            granted = self._acquire_script(
+                keys=[self.key],
+                args=[time.time(), max(1, int(self.limit)), self.lease_seconds, member]
+            )
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Redis LLM limiter error ({self.name}): {e}. Using local slots.")
+            granted, member = 1, None
+        if not granted:
+            return False
+        self.in_flight += 1
+        self._local.member = member
+        return True
+
+    def _give_back(self):
+        super()._give_back()
+        member = getattr(self._local, "member", None)
+        self._local.member = None
+        if member is None:
+            return
+        try:
+            self.client.zrem(self.key, member)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Redis LLM limiter error ({self.name}): {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['type'] = 'redis'
+        return stats
+
+
+# Global limiter registry
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _create_limiter(name: str, limiter_config: DictConfig) -> AdaptiveConcurrencyLimiter:
+    """Build the limiter for a model from the `llm_concurrency` config (with per-model overrides)."""
+    overrides = limiter_config.models.get(name) or {}
+    kwargs = {
+        "initial_limit": overrides.get("initial_limit", limiter_config.initial_limit),
+        "min_limit": overrides.get("min_limit", limiter_config.min_limit),
+        "max_limit": overrides.get("max_limit", limiter_config.max_limit),
+        "increase_step": limiter_config.increase_step,
+        "decrease_factor": limiter_config.decrease_factor,
+        "decrease_cooldown": limiter_config.decrease_cooldown_seconds,
+        "max_queue_wait": limiter_config.max_queue_wait_seconds,
+    }
+
+    if limiter_config.backend == "redis" and REDIS_AVAILABLE:
+        try:
+            client = redis.Redis(
+                host=os.getenv("REDIS_HOST", "localhost"),
+                port=int(os.getenv("REDIS_PORT", "6379")),
+                db=int(os.getenv("REDIS_DB", "0")),
+                password=os.getenv("REDIS_PASSWORD"),
+                socket_timeout=2.0
+            )
+            client.ping()
+            return RedisConcurrencyLimiter(client, name, lease_seconds=limiter_config.lease_seconds, **kwargs)
+        except Exception as redis_err: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Redis LLM limiter unavailable: {redis_err}. Falling back to In-memory.")
+
+    return AdaptiveConcurrencyLimiter(name, **kwargs)
+
+
+def get_llm_limiter(name: str) -> Optional[AdaptiveConcurrencyLimiter]:
+    """
+    Get the concurrency limiter for a provider model (None if disabled).
+
+    Args:
+        name: Provider model key, e.g. 'groq:llama-3.1-8b-instant'
+    """
+    limiter_config = get_config().get("llm_concurrency")
+    if limiter_config is None or not limiter_config.enabled:
+        return None
+
+    if name not in _limiters:
+        with _limiters_lock:
+            if name not in _limiters:
+                _limiters[name] = _create_limiter(name, limiter_config)
+    return _limiters[name]
+
+
+def get_llm_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of all LLM limiters created so far."""
+    return {name: limiter.get_stats() for name, limiter in _limiters.items()}
@@ -0,0 +1,427 @@
+"""
+Latency-aware LLM provider pool.
+Holds every configured provider/API-key pair, tracks rolling latency and
+error rate per endpoint, routes each call to the healthiest endpoint and
+fails over to another one on 429/5xx errors. Calls are gated by the
+per-model adaptive concurrency limiter; low-temperature calls are served
+from the LLM-call cache when possible.
+"""
+import os
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from omegaconf import DictConfig
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from agentic_student_assistant.core.utils.rate_limiter import parse_retry_after
+from agentic_student_assistant.core.utils.llm_limiter import get_llm_limiter, LLMQueueTimeout
+from agentic_student_assistant.core.utils.llm_cache import get_llm_cache, llm_cache_key
+from agentic_student_assistant.core.utils.token_usage import record_llm_usage
+
+# Environment variables holding keys per provider (plural = comma-separated pool)
+PROVIDER_KEY_ENV = {
+    "groq": ("GROQ_API_KEYS", "GROQ_API_KEY"),
+    "openai": ("OPENAI_API_KEYS", "OPENAI_API_KEY"),
+}
+
+
+def classify_llm_error(error: Exception) -> Optional[str]:
+    """
+    Classify an LLM client error for failover decisions.
+
+    Returns:
+        'rate_limit', 'server_error', 'auth_error', or None if the error is not
+        endpoint-specific (e.g. a bad request) and should not fail over
+    """
+    status = getattr(error, "http_status", None) or getattr(error, "status_code", None)
+    name = type(error).__name__
+    if status == 429 or name == "RateLimitError":
+        return "rate_limit"
+    if status in (401, 403) or name in ("AuthenticationError", "PermissionError"):
+        return "auth_error"
+    if (status is not None and status >= 500) or name in (
+        "ServiceUnavailableError", "APIConnectionError", "Timeout", "APITimeoutError",
+        "InternalServerError", "TryAgain"
+    ):
+        return "server_error"
+    return None
+
+
+def _retry_after_of(error: Exception) -> Optional[float]:
+    """Read a Retry-After header from an LLM client error, if any."""
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return parse_retry_after(headers.get("retry-after") or headers.get("Retry-After"))
+    except AttributeError:
+        return None
+
+
+class ProviderEndpoint:
+    """
+    One provider + API key pair with rolling health statistics.
+    """
+
+    def __init__(self, provider: str, api_key: str, api_base: Optional[str], weight: float, pool_config: DictConfig):
+        self.provider = provider
+        self.api_key = api_key
+        self.api_base = api_base
+        self.weight = weight
+        self.id = f"{provider}:...{api_key[-4:]}"
+        self.alpha = pool_config.latency_ewma_alpha
+        self.error_penalty = pool_config.error_penalty
+        self.cooldowns = {
+            "rate_limit": pool_config.rate_limit_cooldown_seconds,
+            "server_error": pool_config.server_error_cooldown_seconds,
+            "auth_error": pool_config.auth_error_cooldown_seconds,
+        }
+        self._lock = threading.Lock()
+        self.latency = pool_config.initial_latency_seconds
+        self.outcomes: deque = deque(maxlen=pool_config.error_window)
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+
+    @property
+    def error_rate(self) -> float:
+        """Share of failed calls in the rolling window."""
+        return (self.outcomes.count(False) / len(self.outcomes)) if self.outcomes else 0.0
+
+    def available(self) -> bool:
+        """Whether the endpoint is out of its cool-down."""
+        return time.monotonic() >= self.cooldown_until
+
+    def score(self) -> float:
+        """Lower is healthier: latency, inflated by errors, load and provider weight."""
+        return self.latency * (1 + self.error_penalty * self.error_rate) * (1 + self.in_flight) * self.weight
+
+    def begin(self):
+        """Mark a call as started on this endpoint."""
+        with self._lock:
+            self.in_flight += 1
+            self.calls += 1
+
+    def record_success(self, latency: float):
+        """Record a successful call and fold its latency into the EWMA."""
+        with self._lock:
+            self.in_flight -= 1
+            self.latency = self.alpha * latency + (1 - self.alpha) * self.latency
+            self.outcomes.append(True)
+
+    def record_failure(self, kind: Optional[str], retry_after: Optional[float] = None):
+        """Record a failed call and cool the endpoint down (Retry-After wins if given)."""
+        with self._lock:
+            self.in_flight -= 1
+            if kind is None:
+                # Not the endpoint's fault (e.g. bad request): don't penalize
+                return
+            self.failures += 1
+            self.outcomes.append(False)
+            cooldown = retry_after if retry_after is not None else self.cooldowns.get(kind, 0)
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + cooldown)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Endpoint statistics for dashboards/logs."""
+        return {
+            'id': self.id,
+            'provider': self.provider,
+            'latency': round(self.latency, 3),
+            'error_rate': round(self.error_rate, 3),
+            'in_flight': self.in_flight,
+            'calls': self.calls,
+            'failures': self.failures,
+            'cooling_down': not self.available(),
+        }
+
+
+class ProviderPool:
+    """
+    Pool of LLM endpoints across providers and API keys.
+    """
+
+    def __init__(self, endpoints: List[ProviderEndpoint]):
+        self.endpoints = endpoints
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, pool_config: DictConfig) -> 'ProviderPool':
+        """
+        Build the pool from environment keys for every configured provider.
+        `<PROVIDER>_API_KEYS` (comma-separated) takes precedence over
+        `<PROVIDER>_API_KEY`.
+        """
+        endpoints = []
+        for provider, provider_cfg in pool_config.providers.items():
+            plural_env, single_env = PROVIDER_KEY_ENV.get(provider, (None, None))
+            raw_keys = os.getenv(plural_env or "") or os.getenv(single_env or "") or ""
+            for key in (k.strip() for k in raw_keys.split(",")):
+                if not key or key.startswith("sk-your-"):
+                    continue
+                endpoints.append(ProviderEndpoint(
+                    provider, key, provider_cfg.get("api_base"), provider_cfg.get("weight", 1.0), pool_config
+                ))
+        if endpoints:
+            print(f"✅ LLM provider pool: {', '.join(e.id for e in endpoints)}")
+        return cls(endpoints)
+
+    def select(self, candidates: List[str], exclude: Optional[set] = None) -> Optional[ProviderEndpoint]:
+        """
+        Pick the healthiest endpoint among `candidates` (endpoint ids).
+        Endpoints in cool-down are only used if nothing else is left.
+        """
+        exclude = exclude or set()
+        with self._lock:
+            options = [e for e in self.endpoints if e.id in candidates and e.id not in exclude]
+            if not options:
+                return None
+            ready = [e for e in options if e.available()]
+            if ready:
+                return min(ready, key=lambda e: e.score())
+            return min(options, key=lambda e: e.cooldown_until)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Statistics of all endpoints."""
+        return [endpoint.get_stats() for endpoint in self.endpoints]
+
+
+class PooledChatModel(BaseChatModel):
+    """
+    Chat model that spreads calls over a provider pool.
+    Holds one ChatOpenAI client per endpoint (same logical model, mapped per
+    provider) and fails over between them on rate limits and server errors.
+    """
+
+    pool: Any
+    clients: Dict[str, Any]
+    model_name: str
+    temperature: float = 0.3
+    max_tokens: Optional[int] = None
+    streaming: bool = False
+    task: Optional[str] = None
+    max_attempts: int = 3
+    use_cache: bool = True
+
+    class Config:
+        """Allow non-pydantic pool/client objects."""
+        arbitrary_types_allowed = True
+
+    @property
+    def _llm_type(self) -> str:
+        return "pooled-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "temperature": self.temperature, "task": self.task}
+
+    def _candidates(self) -> Iterator[Tuple[ProviderEndpoint, Any]]:
+        """Yield (endpoint, client) pairs to try, healthiest first, up to max_attempts."""
+        tried: set = set()
+        for _ in range(min(self.max_attempts, len(self.clients))):
+            endpoint = self.pool.select(list(self.clients), exclude=tried)
+            if endpoint is None:
+                return
+            tried.add(endpoint.id)
+            yield endpoint, self.clients[endpoint.id]
+
+    @staticmethod
+    def _begin_attempt(endpoint: ProviderEndpoint, client: Any) -> Any:
+        """
+        Take a concurrency slot for the endpoint's model and mark the call started.
+
+        Raises:
+            LLMQueueTimeout: If no slot frees up in time
+        """
+        limiter = get_llm_limiter(f"{endpoint.provider}:{client.model_name}")
+        if limiter is not None:
+            limiter.acquire()
+        endpoint.begin()
+        return limiter
+
+    @staticmethod
+    def _end_attempt(
+        endpoint: ProviderEndpoint, limiter: Any, started: float, error: Optional[BaseException] = None
+    ) -> Optional[str]:
+        """
+        Release the slot and record the outcome.
+
+        Returns:
+            The failure kind (see classify_llm_error), or None on success or
+            on errors that are not the endpoint's fault
+        """
+        if limiter is not None:
+            limiter.release()
+        if error is None:
+            endpoint.record_success(time.monotonic() - started)
+            if limiter is not None:
+                limiter.on_success()
+            return None
+        kind = classify_llm_error(error) if isinstance(error, Exception) else None
+        endpoint.record_failure(kind, _retry_after_of(error))
+        if limiter is not None and kind == "rate_limit":
+            limiter.on_rate_limited()
+        return kind
+
+    def _with_failover(self, call: Callable[[Any], Any]) -> Any:
+        """Run `call(client)` on the healthiest endpoint, failing over on endpoint errors."""
+        last_error: Optional[Exception] = None
+
+        for endpoint, client in self._candidates():
+            try:
+                limiter = self._begin_attempt(endpoint, client)
+            except LLMQueueTimeout as e:
+                print(f"⏳ {e} Trying another endpoint...")
+                last_error = e
+                continue
+
+            started = time.monotonic()
+            try:
+                result = call(client)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                kind = self._end_attempt(endpoint, limiter, started, e)
+                if kind is None:
+                    raise
+                print(f"🔁 LLM endpoint {endpoint.id} failed ({kind}). Failing over...")
+                last_error = e
+                continue
+            self._end_attempt(endpoint, limiter, started)
+            return result
+
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError("No LLM provider endpoint available")
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        # Streaming clients must reach the provider so tokens flow to callbacks
+        cache = get_llm_cache(self.temperature) if self.use_cache and not self.streaming else None
+        if cache is not None:
+            key = llm_cache_key(self.model_name, self.temperature, self.max_tokens, messages, stop, **kwargs)
+            cached = cache.get(key)
+            if cached is not None:
+                record_llm_usage(self.task, self.model_name, messages, cached)
+                return cached
+
+        result = self._with_failover(
+            lambda client: client._generate(messages, stop=stop, run_manager=run_manager, **kwargs) # pylint: disable=protected-access
+        )
+        record_llm_usage(self.task, self.model_name, messages, result)
+        if cache is not None:
+            cache.set(key, result)
+        return result
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None, # pylint: disable=unused-argument
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        """
+        Stream answer chunks from the healthiest endpoint. Fails over only
+        before the first chunk; a cached completion is replayed as one chunk.
+        """
+        cache = get_llm_cache(self.temperature) if self.use_cache else None
+        if cache is not None:
+            key = llm_cache_key(self.model_name, self.temperature, self.max_tokens, messages, stop, **kwargs)
+            cached = cache.get(key)
+            if cached is not None:
+                record_llm_usage(self.task, self.model_name, messages, cached)
+                yield ChatGenerationChunk(message=AIMessageChunk(content=cached.generations[0].message.content))
+                return
+
+        last_error: Optional[Exception] = None
+        for endpoint, client in self._candidates():
+            try:
+                limiter = self._begin_attempt(endpoint, client)
+            except LLMQueueTimeout as e:
+                print(f"⏳ {e} Trying another endpoint...")
+                last_error = e
+                continue
+
+            started = time.monotonic()
+            parts: List[str] = []
+            try:
+                # BaseChatModel.stream reports our chunks to run_manager; don't double-report
+                for chunk in client._stream(messages, stop=stop, **kwargs): # pylint: disable=protected-access
+                    parts.append(chunk.message.content)
+                    yield chunk
+            except GeneratorExit:
+                # Consumer stopped early: the call itself went fine
+                self._end_attempt(endpoint, limiter, started)
+                raise
+            except Exception as e: # pylint: disable=broad-exception-caught
+                kind = self._end_attempt(endpoint, limiter, started, e)
+                if kind is None or parts:
+                    # Not retryable, or part of the answer is already out
+                    raise
+                print(f"🔁 LLM endpoint {endpoint.id} failed ({kind}). Failing over...")
+                last_error = e
+                continue
+            self._end_attempt(endpoint, limiter, started)
+
+            result = ChatResult(
+                generations=[ChatGeneration(message=AIMessage(content="".join(parts)))],
+                llm_output={"model_name": client.model_name}
+            )
+            record_llm_usage(self.task, self.model_name, messages, result)
+            if cache is not None:
+                cache.set(key, result)
+            return
+
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError("No LLM provider endpoint available")
+
+
+# Global provider pool
+_provider_pool: Optional[ProviderPool] = None
+_provider_pool_lock = threading.Lock()
+
+
+def get_provider_pool(pool_config: DictConfig) -> ProviderPool:
+    """
+    Get the global provider pool (singleton, built from environment keys).
+
+    Args:
+        pool_config: `llm_pool` section of the app config
+    """
+    global _provider_pool # pylint: disable=global-statement
+    if _provider_pool is None:
+        with _provider_pool_lock:
+            if _provider_pool is None:
+                _provider_pool = ProviderPool.from_env(pool_config)
+    return _provider_pool
+
+
+def get_single_endpoint_pool(
+    pool_config: DictConfig, provider: str, api_key: str, api_base: Optional[str]
+) -> ProviderPool:
+    """
+    Get the global pool holding only the single-provider endpoint (`llm_pool.enabled`
+    false), so those models get the same limiter, cache and usage accounting.
+
+    Args:
+        pool_config: `llm_pool` section of the app config (health tracking settings)
+        provider: 'openai' or 'groq'
+        api_key: The provider's API key
+        api_base: The provider's API base URL (None for the default)
+    """
+    global _provider_pool # pylint: disable=global-statement
+    if _provider_pool is None:
+        with _provider_pool_lock:
+            if _provider_pool is None:
+                _provider_pool = ProviderPool([ProviderEndpoint(provider, api_key, api_base, 1.0, pool_config)])
+    return _provider_pool
+
+
+def get_provider_pool_stats() -> List[Dict[str, Any]]:
+    """Statistics of the provider pool (empty if it was never built)."""
+    return _provider_pool.get_stats() if _provider_pool is not None else []
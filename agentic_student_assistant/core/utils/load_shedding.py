@@ -0,0 +1,54 @@
+"""
+Load-shedding policy for LLM work.
+Decides per request whether agents answer in fast (LLM-free) mode: either
+because the request asked for it, or because the LLM providers are
+saturated (long limiter queues, all endpoints cooling down).
+"""
+from typing import Optional
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.llm_limiter import get_llm_limiter_stats
+from agentic_student_assistant.core.utils.llm_pool import get_provider_pool_stats
+
+
+def llm_overloaded() -> Optional[str]:
+    """
+    Check the LLM limiters and provider pool for overload.
+
+    Returns:
+        A short reason if LLM work should be shed, else None
+    """
+    policy = get_config().fast_mode.load_shedding
+    for name, stats in get_llm_limiter_stats().items():
+        if stats['queued'] >= policy.max_queued_calls:
+            return f"{stats['queued']} calls queued for {name}"
+        if stats['limit'] <= policy.min_concurrency_limit and stats['rate_limited']:
+            return f"{name} throttled to {stats['limit']:.0f} concurrent call(s)"
+
+    pool_stats = get_provider_pool_stats()
+    if pool_stats and all(endpoint['cooling_down'] for endpoint in pool_stats):
+        return "all LLM endpoints cooling down"
+    return None
+
+
+def use_fast_mode(requested: Optional[bool] = None) -> bool:
+    """
+    Decide whether a request is answered in fast (LLM-free) mode.
+
+    Args:
+        requested: Explicit per-request choice (True/False), or None to let
+            the configured default and the load-shedding policy decide
+
+    Returns:
+        True to rank and render results locally
+    """
+    if requested is not None:
+        return requested
+
+    fast_config = get_config().fast_mode
+    if fast_config.load_shedding.enabled:
+        reason = llm_overloaded()
+        if reason:
+            print(f"🪫 Load shedding: answering in fast mode ({reason})")
+            return True
+    return fast_config.default
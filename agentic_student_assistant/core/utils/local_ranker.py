@@ -0,0 +1,122 @@
+"""
+Local (LLM-free) ranking of search results.
+Scores merged records by keyword overlap with the query, citation count,
+edition count and recency so list-style requests can be answered without
+an LLM call.
+"""
+import re
+import math
+import datetime
+from typing import Any, Dict, List, Optional
+from omegaconf import DictConfig
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "on", "in", "for", "to", "with", "about", "into", "from", "by",
+    "me", "my", "i", "you", "your", "we", "our", "some", "any", "good", "best", "top", "recent", "latest",
+    "find", "show", "give", "get", "list", "search", "recommend", "suggest", "need", "want", "looking",
+    "please", "can", "could", "would", "tell", "what", "which", "are", "is", "there",
+    "book", "books", "paper", "papers", "article", "articles", "research", "job", "jobs", "position",
+    "positions", "opening", "openings", "role", "roles", "career", "careers",
+}
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.-]*")
+
+# Fallback weights when no config is passed
+DEFAULT_WEIGHTS = {
+    "relevance": 0.6,
+    "citations": 0.2,
+    "editions": 0.1,
+    "recency": 0.1,
+}
+
+
+def query_terms(text: str) -> List[str]:
+    """Lower-cased content words of a query (stopwords and short tokens removed)."""
+    return [w for w in _WORD.findall((text or "").lower()) if len(w) > 2 and w not in STOPWORDS]
+
+
+def extract_keywords(query: str) -> str:
+    """
+    Cheap keyword extraction (stands in for the refine LLM call in fast mode).
+
+    Example: "find me recent papers on graph neural networks" -> "graph neural networks"
+    """
+    terms = query_terms(query)
+    return " ".join(terms) if terms else query
+
+
+def _year_of(value: Any) -> Optional[int]:
+    if isinstance(value, (int, float)) and value > 10000:
+        # OpenReview creation dates (ms)
+        return datetime.datetime.fromtimestamp(value / 1000, tz=datetime.timezone.utc).year
+    match = re.match(r"\d{4}", str(value or ""))
+    return int(match.group()) if match else None
+
+
+def _record_text(record: Dict[str, Any]) -> str:
+    parts = []
+    for field in ("abstract", "snippet", "description", "venue", "company", "subjects", "categories"):
+        value = record.get(field)
+        parts.extend(value if isinstance(value, list) else [value])
+    return " ".join(str(p) for p in parts if p).lower()
+
+
+def score_record(
+    record: Dict[str, Any],
+    terms: List[str],
+    weights: Dict[str, float],
+    current_year: int,
+    recency_horizon_years: int = 15
+) -> float:
+    """
+    Score one record in [0, 1]-ish (weighted sum of normalized signals).
+
+    Title matches count double compared to matches in other text fields.
+    """
+    relevance = 0.0
+    if terms:
+        title = (record.get("title") or "").lower()
+        text = _record_text(record)
+        hits = sum(2 if t in title else 1 if t in text else 0 for t in terms)
+        relevance = hits / (2 * len(terms))
+
+    citations = math.log1p(record.get("citation_count") or 0) / math.log1p(1000)
+    editions = math.log1p(record.get("edition_count") or 0) / math.log1p(100)
+    recency = 0.0
+    year = _year_of(record.get("year"))
+    if year:
+        recency = max(0.0, 1 - (current_year - year) / recency_horizon_years)
+
+    return (
+        weights.get("relevance", 0) * relevance
+        + weights.get("citations", 0) * min(citations, 1.0)
+        + weights.get("editions", 0) * min(editions, 1.0)
+        + weights.get("recency", 0) * min(recency, 1.0)
+    )
+
+
+def rank_records(
+    records: List[Dict[str, Any]],
+    query: str,
+    top_k: Optional[int] = None,
+    ranking_config: Optional[DictConfig] = None
+) -> List[Dict[str, Any]]:
+    """
+    Rank records locally, best first (ties keep the search order).
+
+    Args:
+        records: Merged result records
+        query: User query (or extracted keywords)
+        top_k: Number of records to keep (all if None)
+        ranking_config: `fast_mode.ranking` section (weights, recency horizon)
+
+    Returns:
+        Ranked records (error entries removed)
+    """
+    weights = dict(ranking_config.weights) if ranking_config is not None else DEFAULT_WEIGHTS
+    horizon = ranking_config.recency_horizon_years if ranking_config is not None else 15
+    terms = query_terms(query)
+    current_year = datetime.date.today().year
+
+    valid = [r for r in records if isinstance(r, dict) and "error" not in r]
+    ranked = sorted(valid, key=lambda r: score_record(r, terms, weights, current_year, horizon), reverse=True)
+    return ranked[:top_k] if top_k else ranked
@@ -4,9 +4,11 @@ Replaces duplicate logging code across the application.
 """
 import os
 import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from abc import ABC, abstractmethod
 
+from agentic_student_assistant.core.utils.token_usage import total_token_usage
+
 
 class LogHandler(ABC):
     """Abstract base class for log handlers."""
@@ -38,6 +40,7 @@ class FileLogHandler(LogHandler):
         result = kwargs.get('result', '')
         confidence = kwargs.get('confidence')
         reasoning = kwargs.get('reasoning', '')
+        token_usage = kwargs.get('token_usage') or {}
         
         with open(log_path, "a", encoding="utf-8") as f:
             f.write("\n" + "=" * 60 + "\n")
@@ -52,6 +55,15 @@ class FileLogHandler(LogHandler):
                 f.write(f"💭 Reasoning: {reasoning}\n")
             if latency is not None:
                 f.write(f"⏱️ Latency: {latency:.2f} seconds\n")
+            if kwargs.get('total_tokens'):
+                f.write(
+                    f"🔢 Tokens: {kwargs.get('prompt_tokens', 0)} prompt + "
+                    f"{kwargs.get('completion_tokens', 0)} completion "
+                    f"(≈${kwargs.get('cost_usd', 0.0):.4f})\n"
+                )
+                for node, usage in token_usage.items():
+                    tasks = ", ".join(f"{task}={u['total_tokens']}" for task, u in usage.get('by_task', {}).items())
+                    f.write(f"   • {node}: {usage['total_tokens']} tokens in {usage['calls']} call(s) [{tasks}]\n")
             
             f.write(f"🛡️ Fallback Used: {'Yes' if is_fallback else 'No'}\n")
             f.write("📘 Final Answer:\n")
@@ -84,7 +96,9 @@ class GoogleSheetsLogHandler(LogHandler):
                 curriculum_mode=kwargs.get('curriculum_mode', 'srh'),
                 latency=kwargs.get('latency', 0),
                 is_fallback=kwargs.get('is_fallback', False),
-                result=kwargs.get('result', '')
+                result=kwargs.get('result', ''),
+                total_tokens=kwargs.get('total_tokens'),
+                cost_usd=kwargs.get('cost_usd')
             )
         except Exception as e: # pylint: disable=broad-exception-caught
             print(f"⚠️ Google Sheets logging failed: {e}")
@@ -138,6 +152,7 @@ class LoggingManager:
         curriculum_mode: str = "srh",
         confidence: Optional[float] = None,
         reasoning: str = "",
+        token_usage: Optional[Dict[str, Dict[str, Any]]] = None,
         **extra_kwargs
     ): # pylint: disable=R0917
         """
@@ -152,6 +167,7 @@ class LoggingManager:
             curriculum_mode: Curriculum mode (srh or uploaded)
             confidence: Router confidence score
             reasoning: Router reasoning
+            token_usage: Per-node LLM usage from `GraphState.metadata["token_usage"]`
             **extra_kwargs: Additional fields to log
         """
         log_data = {
@@ -164,6 +180,8 @@ class LoggingManager:
             'curriculum_mode': curriculum_mode,
             'confidence': confidence,
             'reasoning': reasoning,
+            'token_usage': token_usage or {},
+            **total_token_usage(token_usage),
             **extra_kwargs
         }
         
@@ -0,0 +1,53 @@
+"""
+Helpers for running independent I/O-bound calls concurrently.
+Used by agents that query several upstream sources for the same request.
+"""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+
+def run_concurrently(
+    tasks: Dict[str, Callable[[], Any]],
+    timeout: Optional[float] = None,
+    default: Any = None
+) -> Dict[str, Any]:
+    """
+    Run independent callables in parallel under a shared deadline.
+
+    Tasks that raise, or that have not finished when the deadline expires,
+    resolve to `default` so callers can continue with partial results.
+    Slow tasks are abandoned, not awaited. Each task runs in a copy of the
+    caller's context so context-scoped state (e.g. token accounting) follows it.
+
+    Args:
+        tasks: Mapping of task name to zero-argument callable
+        timeout: Shared deadline in seconds for all tasks (None waits forever)
+        default: Value used for failed or timed-out tasks
+
+    Returns:
+        Dict mapping each task name to its result (or `default`)
+    """
+    if not tasks:
+        return {}
+
+    executor = ThreadPoolExecutor(max_workers=len(tasks))
+    futures = {name: executor.submit(contextvars.copy_context().run, fn) for name, fn in tasks.items()}
+    try:
+        wait(futures.values(), timeout=timeout)
+    finally:
+        # Don't block on stragglers; their results are discarded
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    for name, future in futures.items():
+        if not future.done():
+            print(f"⏱️ '{name}' did not finish within {timeout}s. Using partial results.")
+            results[name] = default
+            continue
+        try:
+            results[name] = future.result()
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ '{name}' failed: {e}")
+            results[name] = default
+    return results
@@ -0,0 +1,209 @@
+"""
+Speculative prefetch of detail data for listed results.
+Once an answer lists papers, the usual next turn is "explain the first one".
+The prefetcher fetches richer details (and, optionally, a pre-generated
+explanation) for the top listed items in the background, so such follow-ups
+are answered from memory instead of starting cold.
+"""
+import time
+import threading
+import contextvars
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.http_client import prefetch_traffic
+from agentic_student_assistant.core.utils.load_shedding import llm_overloaded
+
+
+class DetailPrefetcher:
+    """
+    Background worker pool plus a TTL/LRU store of prefetched entries
+    ({"record": detailed record, "explanation": text or None}), keyed by
+    domain and normalized title.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        ttl_seconds: int = 1800,
+        max_entries: int = 200,
+        max_explanations_per_hour: int = 30
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_explanations_per_hour = max_explanations_per_hour
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._explanation_times: deque = deque()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.scheduled = 0
+        self.hits = 0
+        self.misses = 0
+        self.explanations = 0
+        self.explanations_skipped = 0
+
+    @staticmethod
+    def record_key(domain: str, record: Dict[str, Any]) -> str:
+        """Store key of a record (domain + alphanumeric, lower-cased title)."""
+        title = "".join(c for c in (record.get("title") or "").lower() if c.isalnum())
+        return f"{domain}:{title}"
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["created"] > self.ttl_seconds
+
+    def _take_explanation_budget(self) -> bool:
+        """Reserve one pre-generated explanation within the hourly budget."""
+        now = time.time()
+        with self._lock:
+            while self._explanation_times and now - self._explanation_times[0] > 3600:
+                self._explanation_times.popleft()
+            if len(self._explanation_times) >= self.max_explanations_per_hour:
+                return False
+            self._explanation_times.append(now)
+            return True
+
+    def _run(
+        self,
+        record: Dict[str, Any],
+        fetch_details: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+        explain: Optional[Callable[[Dict[str, Any]], str]]
+    ) -> Dict[str, Any]:
+        entry = {"record": record, "explanation": None}
+        try:
+            with prefetch_traffic():
+                entry["record"] = fetch_details(record) or record
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Prefetch failed for '{record.get('title')}': {e}")
+
+        if explain is None:
+            return entry
+        if llm_overloaded() or not self._take_explanation_budget():
+            self.explanations_skipped += 1
+            return entry
+        try:
+            entry["explanation"] = explain(entry["record"])
+            self.explanations += 1
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Explanation pre-generation failed for '{record.get('title')}': {e}")
+        return entry
+
+    def schedule(
+        self,
+        domain: str,
+        records: List[Dict[str, Any]],
+        fetch_details: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+        explain: Optional[Callable[[Dict[str, Any]], str]] = None,
+        explain_top_k: int = 0
+    ) -> int: # pylint: disable=R0917
+        """
+        Start prefetching records that aren't already stored.
+
+        Jobs run in a fresh context: their LLM calls are neither streamed to
+        the current request nor counted in its token usage, and their HTTP
+        requests use the sources' prefetch rate-limit buckets.
+
+        Args:
+            domain: Result domain, e.g. 'papers'
+            records: Records in display order (the caller picks the top k)
+            fetch_details: Returns the detailed version of a record
+            explain: Optional pre-generation of an explanation for a detailed record
+            explain_top_k: Number of leading records that get an explanation
+
+        Returns:
+            Number of newly scheduled records
+        """
+        scheduled = 0
+        for i, record in enumerate(records):
+            key = self.record_key(domain, record)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and not self._expired(entry):
+                    continue
+                future: Future = self._executor.submit(
+                    contextvars.Context().run, self._run, record, fetch_details,
+                    explain if i < explain_top_k else None
+                )
+                self._entries[key] = {"future": future, "created": time.time()}
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                self.scheduled += 1
+            scheduled += 1
+        if scheduled:
+            print(f"🔮 Prefetching details for {scheduled} {domain} result(s)")
+        return scheduled
+
+    def get(self, domain: str, record: Dict[str, Any], wait_seconds: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Get the prefetched entry of a record, waiting briefly if it's still in flight.
+
+        Returns:
+            {"record": ..., "explanation": ...} or None on a miss
+        """
+        key = self.record_key(domain, record)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                del self._entries[key]
+                entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        try:
+            result = entry["future"].result(timeout=wait_seconds)
+        except FutureTimeout:
+            print(f"⏱️ Prefetch for '{record.get('title')}' still running. Answering without it.")
+            self.misses += 1
+            return None
+        except Exception: # pylint: disable=broad-exception-caught
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prefetch statistics."""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'scheduled': self.scheduled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'explanations': self.explanations,
+            'explanations_skipped': self.explanations_skipped,
+        }
+
+
+# Global prefetcher instance
+_prefetcher: Optional[DetailPrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> Optional[DetailPrefetcher]:
+    """Get the global prefetcher (None if `prefetch.enabled` is off)."""
+    global _prefetcher # pylint: disable=global-statement
+    prefetch_config = get_config().get("prefetch")
+    if prefetch_config is None or not prefetch_config.enabled:
+        return None
+
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = DetailPrefetcher(
+                    max_workers=prefetch_config.max_workers,
+                    ttl_seconds=prefetch_config.ttl_seconds,
+                    max_entries=prefetch_config.max_entries,
+                    max_explanations_per_hour=prefetch_config.explanations.max_per_hour
+                )
+    return _prefetcher
+
+
+def get_prefetch_stats() -> Optional[Dict[str, Any]]:
+    """Statistics of the global prefetcher (None if it hasn't been created)."""
+    return _prefetcher.get_stats() if _prefetcher is not None else None
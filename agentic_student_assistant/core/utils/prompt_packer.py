@@ -0,0 +1,264 @@
+"""
+Token-budgeted prompt packing for search results.
+Serializes result records compactly (no indentation, no empty fields),
+shortens long text fields to their key sentences and drops trailing records
+until the payload fits the agent's token budget. Tokens saved versus the
+old `json.dumps(..., indent=2)` payload are recorded per agent.
+"""
+import re
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+
+# Optional tiktoken import (falls back to a ~4 chars/token estimate)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+_encodings: Dict[str, Any] = {}
+
+# Sentences with these cues carry an abstract's contribution/results
+KEY_SENTENCE_CUES = (
+    "we propose", "we present", "we introduce", "this paper", "in this work", "our ",
+    "results", "show", "outperform", "achieve", "state-of-the-art", "improve"
+)
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def count_tokens(text: str, encoding_name: str = "cl100k_base") -> int:
+    """
+    Count tokens with tiktoken (estimate when tiktoken is unavailable).
+
+    Args:
+        text: Text to count
+        encoding_name: tiktoken encoding name
+    """
+    if not text:
+        return 0
+    if TIKTOKEN_AVAILABLE:
+        try:
+            if encoding_name not in _encodings:
+                _encodings[encoding_name] = tiktoken.get_encoding(encoding_name)
+            return len(_encodings[encoding_name].encode(text))
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ tiktoken error: {e}. Estimating tokens.")
+    return max(1, len(text) // 4)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def compact_record(record: Dict[str, Any], max_list_items: int = 5) -> Dict[str, Any]:
+    """
+    Drop empty fields, collapse whitespace in strings and trim long lists.
+
+    Args:
+        record: Result record (paper, book, job listing)
+        max_list_items: Maximum items kept per list field
+    """
+    compact = {}
+    for key, value in record.items():
+        if isinstance(value, str):
+            value = _WHITESPACE.sub(" ", value).strip()
+        elif isinstance(value, list):
+            value = [v for v in value if not _is_empty(v)][:max_list_items]
+        if not _is_empty(value):
+            compact[key] = value
+    return compact
+
+
+def extract_key_sentences(text: str, max_tokens: int, encoding_name: str = "cl100k_base") -> str:
+    """
+    Shorten text to its key sentences within a token budget.
+    Always keeps the lead sentence, then adds contribution/result sentences,
+    then the remaining ones, preserving the original order.
+
+    Args:
+        text: Text to shorten (e.g. an abstract)
+        max_tokens: Token budget for the result
+        encoding_name: tiktoken encoding name
+    """
+    if count_tokens(text, encoding_name) <= max_tokens:
+        return text
+
+    sentences = [s for s in _SENTENCE_SPLIT.split(text) if s]
+    cued = [i for i, s in enumerate(sentences[1:], 1) if any(c in s.lower() for c in KEY_SENTENCE_CUES)]
+    rest = [i for i in range(1, len(sentences)) if i not in cued]
+
+    kept, used = [], 0
+    for i in [0] + cued + rest:
+        cost = count_tokens(sentences[i], encoding_name)
+        if used + cost > max_tokens:
+            if not kept:
+                # Lead sentence alone is too long: cut it by characters
+                return sentences[0][:max_tokens * 4].rstrip() + "…"
+            continue
+        kept.append(i)
+        used += cost
+    return " ".join(sentences[i] for i in sorted(kept)) + (" …" if len(kept) < len(sentences) else "")
+
+
+class PromptPacker:
+    """
+    Packs result records into a compact JSON payload within a token budget.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int,
+        long_fields: Sequence[str] = ("abstract", "description", "snippet"),
+        min_field_tokens: int = 40,
+        max_list_items: int = 5,
+        encoding_name: str = "cl100k_base"
+    ): # pylint: disable=R0917
+        self.budget_tokens = budget_tokens
+        self.long_fields = tuple(long_fields)
+        self.min_field_tokens = min_field_tokens
+        self.max_list_items = max_list_items
+        self.encoding_name = encoding_name
+
+    def _serialize(self, records: Any) -> str:
+        return json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+
+    def _count(self, text: str) -> int:
+        return count_tokens(text, self.encoding_name)
+
+    def _shorten_long_fields(self, records: List[Dict[str, Any]], field_budget: int) -> List[Dict[str, Any]]:
+        shortened = []
+        for record in records:
+            record = dict(record)
+            for field in self.long_fields:
+                if isinstance(record.get(field), str):
+                    record[field] = extract_key_sentences(record[field], field_budget, self.encoding_name)
+            shortened.append(record)
+        return shortened
+
+    def pack(self, records: Any) -> Dict[str, Any]:
+        """
+        Pack records (a list of dicts or a single dict) into the budget.
+
+        Returns:
+            Dict with 'text' (payload), 'tokens', 'original_tokens' and
+            'records_dropped'
+        """
+        single = isinstance(records, dict)
+        items = [records] if single else list(records)
+        original_tokens = self._count(json.dumps(records, indent=2))
+
+        packed = [compact_record(r, self.max_list_items) for r in items]
+        text = self._serialize(packed[0] if single else packed)
+
+        if self._count(text) > self.budget_tokens:
+            # Share what's left after the short fields among the long fields
+            skeleton = [{k: v for k, v in r.items() if k not in self.long_fields} for r in packed]
+            n_long = sum(1 for r in packed for f in self.long_fields if f in r) or 1
+            spare = self.budget_tokens - self._count(self._serialize(skeleton))
+            field_budget = max(self.min_field_tokens, spare // n_long)
+            packed = self._shorten_long_fields(packed, field_budget)
+            text = self._serialize(packed[0] if single else packed)
+
+        dropped = 0
+        while not single and len(packed) > 1 and self._count(text) > self.budget_tokens:
+            # Results are ordered by relevance: drop from the tail
+            packed.pop()
+            dropped += 1
+            text = self._serialize(packed)
+
+        return {
+            'text': text,
+            'tokens': self._count(text),
+            'original_tokens': original_tokens,
+            'records_dropped': dropped,
+        }
+
+
+# Saved-token statistics per agent
+_packing_stats: Dict[str, Dict[str, int]] = {}
+_packing_stats_lock = threading.Lock()
+
+
+def _record_stats(agent: str, result: Dict[str, Any]):
+    with _packing_stats_lock:
+        stats = _packing_stats.setdefault(
+            agent, {'calls': 0, 'original_tokens': 0, 'packed_tokens': 0, 'saved_tokens': 0, 'records_dropped': 0}
+        )
+        stats['calls'] += 1
+        stats['original_tokens'] += result['original_tokens']
+        stats['packed_tokens'] += result['tokens']
+        stats['saved_tokens'] += max(0, result['original_tokens'] - result['tokens'])
+        stats['records_dropped'] += result['records_dropped']
+
+
+def get_prompt_packer(agent: str) -> Optional[PromptPacker]:
+    """
+    Get a packer configured with the agent's token budget (None if disabled).
+
+    Args:
+        agent: Budget name from `prompt_packing.budgets`, e.g. 'papers'
+    """
+    packing_config = get_config().get("prompt_packing")
+    if packing_config is None or not packing_config.enabled:
+        return None
+    return PromptPacker(
+        budget_tokens=packing_config.budgets.get(agent, packing_config.default_budget),
+        long_fields=list(packing_config.long_fields),
+        min_field_tokens=packing_config.min_field_tokens,
+        max_list_items=packing_config.max_list_items,
+        encoding_name=packing_config.encoding
+    )
+
+
+def pack_records(records: Any, agent: str) -> str:
+    """
+    Serialize result records for a prompt within the agent's token budget.
+    Falls back to indented JSON when packing is disabled.
+
+    Args:
+        records: List of result dicts (or a single dict)
+        agent: Budget name from `prompt_packing.budgets`
+
+    Returns:
+        JSON payload for the prompt
+    """
+    packer = get_prompt_packer(agent)
+    if packer is None:
+        return json.dumps(records, indent=2)
+
+    result = packer.pack(records)
+    _record_stats(agent, result)
+    print(
+        f"🗜️ Packed {agent} results: {result['original_tokens']} → {result['tokens']} tokens"
+        + (f" ({result['records_dropped']} dropped)" if result['records_dropped'] else "")
+    )
+    return result['text']
+
+
+def get_prompt_packing_stats() -> Dict[str, Dict[str, int]]:
+    """Saved-token statistics per agent."""
+    with _packing_stats_lock:
+        return {agent: dict(stats) for agent, stats in _packing_stats.items()}
+
+
+if __name__ == "__main__":
+    sample = [
+        {
+            "title": "Attention Is All You Need",
+            "authors": ["Vaswani", "Shazeer", "Parmar", "Uszkoreit", "Jones", "Gomez", "Kaiser"],
+            "year": 2017,
+            "venue": None,
+            "abstract": (
+                "The dominant sequence transduction models are based on complex recurrent or "
+                "convolutional neural networks. We propose a new simple network architecture, the "
+                "Transformer, based solely on attention mechanisms. Experiments on two machine "
+                "translation tasks show these models to be superior in quality while being more "
+                "parallelizable and requiring significantly less time to train."
+            ),
+        }
+    ] * 6
+    print(PromptPacker(budget_tokens=250).pack(sample))
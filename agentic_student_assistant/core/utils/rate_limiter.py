@@ -0,0 +1,285 @@
+"""
+Per-source token-bucket rate limiting for upstream APIs.
+Keeps request throughput at each API's allowed rate (e.g. arXiv's 3-second
+spacing) instead of collapsing into 429s, honors Retry-After, and can share
+buckets across processes through Redis.
+"""
+import os
+import time
+import threading
+import email.utils
+from typing import Optional, Dict, Any
+from omegaconf import DictConfig
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+
+# Optional redis import
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a source has no capacity within the allowed wait time."""
+
+    def __init__(self, source: str, wait_seconds: Optional[float] = None):
+        self.source = source
+        self.wait_seconds = wait_seconds
+        super().__init__(f"Rate limit for '{source}' exceeded; skipping source.")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date).
+
+    Returns:
+        Delay in seconds, or None if the header is missing/invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe in-process token bucket with adaptive backoff.
+
+    Requests reserve a token and sleep until it becomes available, as long as
+    the wait fits in `max_wait`; otherwise the caller should skip the source.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        rate: float,
+        burst: int,
+        max_wait_seconds: float = 2.0,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0
+    ): # pylint: disable=R0917
+        self.source = source
+        self.rate = rate
+        self.burst = burst
+        self.max_wait_seconds = max_wait_seconds
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.consecutive_rate_limits = 0
+        self.granted = 0
+        self.skipped = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+
+    def _reserve(self, max_wait: float) -> Optional[float]:
+        """Reserve a token; return the wait before it's usable, or None to skip."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = 0.0
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+            wait = max(wait, self._blocked_until - now)
+            if wait > max_wait:
+                return None
+            # Tokens may go negative: later callers queue behind this reservation
+            self._tokens -= 1
+            return wait
+
+    def _block_for(self, delay: float):
+        """Stop handing out tokens for `delay` seconds."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self._tokens = min(self._tokens, 0.0)
+
+    def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Wait (briefly) for a token.
+
+        Args:
+            max_wait: Longest acceptable queueing delay (defaults to the configured value)
+
+        Returns:
+            True if the request may proceed, False if the source should be skipped
+        """
+        if max_wait is None:
+            max_wait = self.max_wait_seconds
+        wait = self._reserve(max_wait)
+        if wait is None:
+            self.skipped += 1
+            return False
+        if wait > 0:
+            time.sleep(wait)
+            self.total_wait += wait
+        self.granted += 1
+        return True
+
+    def on_rate_limited(self, retry_after: Optional[str] = None):
+        """
+        Back off after a 429. Honors Retry-After when present, otherwise
+        backs off exponentially with consecutive rate limits.
+        """
+        self.rate_limited += 1
+        self.consecutive_rate_limits += 1
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff_base_seconds * (2 ** (self.consecutive_rate_limits - 1))
+        delay = min(delay, self.backoff_max_seconds)
+        print(f"🐢 {self.source}: rate limited, backing off for {delay:.1f}s")
+        self._block_for(delay)
+
+    def on_success(self):
+        """Reset the backoff after a successful (non-429) response."""
+        self.consecutive_rate_limits = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limiter statistics for dashboards/logs."""
+        return {
+            'source': self.source,
+            'rate': self.rate,
+            'burst': self.burst,
+            'granted': self.granted,
+            'skipped': self.skipped,
+            'rate_limited': self.rate_limited,
+            'avg_wait': self.total_wait / self.granted if self.granted else 0,
+            'type': 'in-memory'
+        }
+
+
+class RedisTokenBucket(TokenBucket):
+    """
+    Token bucket stored in Redis so that several processes/replicas share
+    one budget per upstream API. Reservation is atomic via a Lua script.
+    """
+
+    _RESERVE_SCRIPT = """
+    local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+    local ts = tonumber(redis.call('HGET', KEYS[1], 'ts'))
+    local blocked = tonumber(redis.call('HGET', KEYS[1], 'blocked_until')) or 0
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local max_wait = tonumber(ARGV[4])
+    if tokens == nil then tokens = burst end
+    if ts == nil then ts = now end
+    tokens = math.min(burst, tokens + (now - ts) * rate)
+    local wait = 0
+    if tokens < 1 then wait = (1 - tokens) / rate end
+    if blocked - now > wait then wait = blocked - now end
+    if wait > max_wait then
+        redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+        redis.call('EXPIRE', KEYS[1], 3600)
+        return '-1'
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], 3600)
+    return tostring(wait)
+    """
+
+    def __init__(self, client, source: str, rate: float, burst: int, **kwargs):
+        super().__init__(source, rate, burst, **kwargs)
+        self.client = client
+        self.key = f"ratelimit:{source}"
+        self._reserve_script = client.register_script(self._RESERVE_SCRIPT)
+
+    def _reserve(self, max_wait: float) -> Optional[float]:
+        try:
+            wait = float(self._reserve_script(
+                keys=[self.key],
+                args=[self.rate, self.burst, time.time(), max_wait]
+            ))
+            return None if wait < 0 else wait
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Redis rate limiter error ({self.source}): {e}. Using local bucket.")
+            return super()._reserve(max_wait)
+
+    def _block_for(self, delay: float):
+        super()._block_for(delay)
+        try:
+            blocked_until = time.time() + delay
+            current = self.client.hget(self.key, "blocked_until")
+            if current is None or float(current) < blocked_until:
+                self.client.hset(self.key, mapping={"blocked_until": blocked_until, "tokens": 0})
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Redis rate limiter error ({self.source}): {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['type'] = 'redis'
+        return stats
+
+
+# Global limiter registry
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+_redis_client: Any = None
+
+
+def _get_redis_client():
+    """Connect to Redis using the same environment variables as the cache."""
+    global _redis_client # pylint: disable=global-statement
+    if _redis_client is None:
+        _redis_client = redis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", "6379")),
+            db=int(os.getenv("REDIS_DB", "0")),
+            password=os.getenv("REDIS_PASSWORD"),
+            decode_responses=True,
+            socket_timeout=2.0
+        )
+        _redis_client.ping()
+    return _redis_client
+
+
+def _create_limiter(source: str, limits_config: DictConfig) -> TokenBucket:
+    """Build the limiter for a source from the `rate_limits` config."""
+    source_cfg = limits_config.sources.get(source) or limits_config.default
+    kwargs = {
+        "max_wait_seconds": source_cfg.get("max_wait_seconds", limits_config.max_wait_seconds),
+        "backoff_base_seconds": limits_config.backoff_base_seconds,
+        "backoff_max_seconds": limits_config.backoff_max_seconds,
+    }
+
+    if limits_config.backend == "redis" and REDIS_AVAILABLE:
+        try:
+            return RedisTokenBucket(_get_redis_client(), source, source_cfg.rate, source_cfg.burst, **kwargs)
+        except Exception as redis_err: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Redis rate limiter unavailable: {redis_err}. Falling back to In-memory.")
+
+    return TokenBucket(source, source_cfg.rate, source_cfg.burst, **kwargs)
+
+
+def get_rate_limiter(source: str) -> Optional[TokenBucket]:
+    """
+    Get the limiter for an upstream source (None if rate limiting is disabled).
+
+    Args:
+        source: Source name, e.g. 'semantic_scholar', 'arxiv'
+    """
+    limits_config = get_config().rate_limits
+    if not limits_config.enabled:
+        return None
+
+    if source not in _limiters:
+        with _limiters_lock:
+            if source not in _limiters:
+                _limiters[source] = _create_limiter(source, limits_config)
+    return _limiters[source]
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of all limiters created so far."""
+    return {source: limiter.get_stats() for source, limiter in _limiters.items()}
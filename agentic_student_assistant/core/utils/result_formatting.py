@@ -0,0 +1,159 @@
+"""
+Compact markdown rendering of raw search results.
+Used to show merged records (papers, books, jobs) as soon as the searches
+finish, before the LLM write-up arrives, and as the deterministic answer
+template of fast (LLM-free) mode.
+"""
+import datetime
+from typing import Any, Dict, List, Optional
+
+
+def format_year(value: Any) -> Optional[str]:
+    """Normalize a year field (OpenReview reports creation dates in ms)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)) and value > 10000:
+        return str(datetime.datetime.fromtimestamp(value / 1000, tz=datetime.timezone.utc).year)
+    return str(value)[:4]
+
+
+def format_authors(authors: Any, max_names: int = 3) -> str:
+    """Author list as 'A, B, C et al.'."""
+    if not authors:
+        return ""
+    if isinstance(authors, str):
+        return authors
+    names = [str(a) for a in authors if a]
+    return ", ".join(names[:max_names]) + (" et al." if len(names) > max_names else "")
+
+
+def _title(record: Dict[str, Any], default: str = "Untitled") -> str:
+    title = (record.get("title") or default).replace("\n", " ").strip()
+    link = record.get("link")
+    return f"**[{title}]({link})**" if link else f"**{title}**"
+
+
+def _join(*parts: Optional[str]) -> str:
+    return " · ".join(p for p in parts if p)
+
+
+def format_paper(paper: Dict[str, Any]) -> str:
+    """One-line summary of a paper record."""
+    year = format_year(paper.get("year"))
+    byline = format_authors(paper.get("authors")) + (f" ({year})" if year else "")
+    citations = paper.get("citation_count")
+    return _join(
+        _title(paper),
+        byline.strip(),
+        paper.get("venue"),
+        f"{citations} citations" if citations else None
+    )
+
+
+def format_book(book: Dict[str, Any]) -> str:
+    """One-line summary of a book record."""
+    year = format_year(book.get("year"))
+    byline = format_authors(book.get("authors")) + (f" ({year})" if year else "")
+    publisher = book.get("publisher")
+    if isinstance(publisher, list):
+        publisher = publisher[0] if publisher else None
+    editions = book.get("edition_count")
+    return _join(
+        _title(book),
+        byline.strip(),
+        publisher,
+        f"{editions} editions" if editions and editions > 1 else None
+    )
+
+
+def format_job(job: Dict[str, Any]) -> str:
+    """One-line summary of a job listing."""
+    return _join(
+        _title(job, default="No title"),
+        job.get("company"),
+        job.get("location"),
+        job.get("salary"),
+        job.get("job_type"),
+        job.get("posted_at")
+    )
+
+
+FORMATTERS = {
+    "papers": format_paper,
+    "books": format_book,
+    "job_market": format_job,
+}
+
+
+def format_results_compact(domain: str, records: List[Dict[str, Any]], limit: int = 10) -> str:
+    """
+    Render records as a numbered markdown list.
+
+    Args:
+        domain: 'papers', 'books' or 'job_market'
+        records: Merged result records
+        limit: Maximum number of records shown
+
+    Returns:
+        Markdown list (empty string if there is nothing to show)
+    """
+    formatter = FORMATTERS.get(domain)
+    if formatter is None or not records:
+        return ""
+    lines = [
+        f"{i}. {formatter(record)}"
+        for i, record in enumerate(records[:limit], 1)
+        if isinstance(record, dict) and "error" not in record
+    ]
+    return "\n".join(lines)
+
+
+FAST_MODE_HEADERS = {
+    "papers": "📄 Top papers",
+    "books": "📚 Top books",
+    "job_market": "💼 Top openings",
+}
+
+
+def _first_sentence(text: Optional[str], max_chars: int = 220) -> Optional[str]:
+    if not text:
+        return None
+    text = " ".join(text.split())
+    sentence = text.split(". ")[0].rstrip(".") + "."
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars].rstrip() + "…"
+
+
+def _detail_line(domain: str, record: Dict[str, Any]) -> Optional[str]:
+    """Second line of a fast-mode entry (abstract lead, subjects, job snippet)."""
+    if domain == "papers":
+        return _first_sentence(record.get("abstract"))
+    if domain == "books":
+        topics = record.get("subjects") or record.get("categories") or []
+        return ", ".join(topics[:4]) if topics else None
+    if domain == "job_market":
+        return _first_sentence(record.get("snippet"))
+    return None
+
+
+def format_fast_answer(domain: str, records: List[Dict[str, Any]], query: str, limit: int = 5) -> str:
+    """
+    Deterministic markdown answer for fast (LLM-free) mode.
+
+    Args:
+        domain: 'papers', 'books' or 'job_market'
+        records: Locally ranked records
+        query: User query (shown in the heading)
+        limit: Number of entries
+
+    Returns:
+        Markdown answer
+    """
+    formatter = FORMATTERS[domain]
+    lines = [f"### {FAST_MODE_HEADERS[domain]} for “{query.strip()}”", ""]
+    for i, record in enumerate(records[:limit], 1):
+        lines.append(f"{i}. {formatter(record)}")
+        detail = _detail_line(domain, record)
+        if detail:
+            lines.append(f"   > {detail}")
+    lines += ["", "_⚡ Fast mode: ranked locally without an AI write-up. Ask about any item for details._"]
+    return "\n".join(lines)
@@ -0,0 +1,191 @@
+"""
+Resolution of follow-up references to previously shown results.
+Each answer's records (papers, books, job listings) are kept in the graph
+state in the order they were shown; "the second one", "#2" or a title
+mentioned in a follow-up are resolved against them locally instead of
+asking an LLM to find the item in the previous message.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from agentic_student_assistant.core.utils.local_ranker import query_terms
+
+ORDINAL_WORDS = {
+    "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5,
+    "sixth": 6, "seventh": 7, "eighth": 8, "ninth": 9, "tenth": 10, "last": -1,
+}
+_ORDINAL = r"(" + "|".join(ORDINAL_WORDS) + r")"
+_REFERENT = r"(?:paper|book|job|result|item|option|listing|article|position)"
+# What may follow a referent noun for it to point into the previous list:
+# "explain the second paper", "what is paper 3 about", "the first job you listed"
+# (but not "the first paper on diffusion models", a new search)
+_REFERENCE_END = r"(?=\s*(?:$|[?.!,]|about\b|again\b|you\b|(?:from|in) (?:the|your) (?:list|answer|results)\b))"
+_PICK = r"(?:one\b|" + _REFERENT + r"\b" + _REFERENCE_END + r")"
+# Only full selection phrases count: an ordinal or a number alone ("the last five
+# years", "the first transformer models", "article 2023") is part of a new search
+_ORDINAL_PATTERNS = (
+    # "the second one", "the last paper", "the 2nd one"
+    re.compile(r"\bthe\s+" + _ORDINAL + r"\s+" + _PICK),
+    re.compile(r"\b(?:the\s+)?(\d{1,2})(?:st|nd|rd|th)\s+" + _PICK),
+    # "second one", "explain the first" (nothing after the ordinal)
+    re.compile(r"\b" + _ORDINAL + r"\s+one\b"),
+    re.compile(r"\bthe\s+" + _ORDINAL + r"\s*[?.!]*\s*$"),
+    # "#2", "number 2", "paper 3"
+    re.compile(r"#\s*(\d{1,2})(?!\d)"),
+    re.compile(r"\b(?:number|no\.)\s*(\d{1,2})(?!\d)" + _REFERENCE_END),
+    re.compile(r"\b" + _REFERENT + r"\s+(\d{1,2})(?!\d)" + _REFERENCE_END),
+)
+
+# An already shown item: "it", "this", "the second one", "the BioBridge paper"
+_ITEM = r"(?:it|this|that|the\s+(?:\S+\s+)?(?:one|" + _REFERENT + r"))\b"
+# Questions about one specific item, matched as whole phrases ("find papers
+# explaining attention", "summarize recent research on LLMs" are new searches)
+_ITEM_QUESTION_PATTERNS = (
+    re.compile(
+        r"\b(?:explain|summari[sz]e|describe|elaborate on|tell me (?:more )?about|more about"
+        r"|details (?:of|on|about)|summary of|what about)\s+" + _ITEM
+    ),
+    re.compile(r"\b(?:this|that|in the)\s+" + _REFERENT + r"\b"),
+    re.compile(r"\b(?:tell me more|elaborate)\s*(?:$|[?.!])"),
+    re.compile(r"\bwhat is it about\b"),
+)
+# Request words that make a mention of a shown title a follow-up ("explain BioBridge")
+_ABOUT_ITEM = re.compile(
+    r"\b(?:explain|summari[sz]e|describe|elaborate|details|tell me more|more about|summary of|what about)\b"
+)
+
+
+def ordinal_reference(query: str) -> Optional[int]:
+    """
+    Position referred to by the query ("the second one" -> 2, "the last" -> -1).
+
+    Returns:
+        1-based position, -1 for "last", or None if there is no reference
+    """
+    text = (query or "").lower()
+    for pattern in _ORDINAL_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            value = match.group(1)
+            return int(value) if value.isdigit() else ORDINAL_WORDS[value]
+    return None
+
+
+def is_item_question(query: str) -> bool:
+    """Whether the query asks about one specific item ("explain the paper 'BioBridge'", "in this paper")."""
+    text = (query or "").lower()
+    return any(pattern.search(text) for pattern in _ITEM_QUESTION_PATTERNS)
+
+
+def is_follow_up(query: str, last_results: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether the query asks about an item of the previous answer.
+
+    Args:
+        query: User query
+        last_results: {"domain": ..., "records": [...]} of the previous answer
+            (with nothing shown, no query is a follow-up)
+    """
+    records = (last_results or {}).get("records")
+    if not records:
+        return False
+    if ordinal_reference(query) is not None or is_item_question(query):
+        return True
+    return bool(_ABOUT_ITEM.search((query or "").lower())) and title_reference(query, records) is not None
+
+
+# Words of a follow-up that don't make it a specific question
+_GENERIC_REQUEST_WORDS = {
+    "explain", "more", "elaborate", "summary", "summarize", "details", "detail", "one", "about", "it",
+    "overview", "describe", *ORDINAL_WORDS,
+}
+
+
+def is_generic_request(query: str, record: Dict[str, Any]) -> bool:
+    """
+    Whether a follow-up asks about the item as a whole ("explain the first one",
+    "tell me more about <title>") rather than a specific question about it.
+    """
+    extra = set(query_terms(query)) - set(query_terms(record.get("title", ""))) - _GENERIC_REQUEST_WORDS
+    return not extra
+
+
+def title_reference(query: str, records: List[Dict[str, Any]], min_overlap: float = 0.6) -> Optional[int]:
+    """
+    Index of the record whose title the query mentions.
+
+    Args:
+        query: User query
+        records: Previously shown records
+        min_overlap: Minimum share of the title's content words found in the query
+
+    Returns:
+        0-based index of the best matching record, or None
+    """
+    terms = set(query_terms(query))
+    best_index, best_score = None, 0.0
+    for i, record in enumerate(records):
+        title_terms = set(query_terms(record.get("title", "")))
+        if not title_terms:
+            continue
+        hits = len(title_terms & terms)
+        score = hits / len(title_terms)
+        if hits and score >= min_overlap and score > best_score:
+            best_index, best_score = i, score
+    return best_index
+
+
+def resolve_selection(
+    query: str,
+    last_results: Optional[Dict[str, Any]],
+    domain: str,
+    selection_index: Optional[int] = None,
+    min_title_overlap: float = 0.6
+) -> Optional[Dict[str, Any]]: # pylint: disable=R0917
+    """
+    Resolve a follow-up reference against the previous answer's records.
+
+    Args:
+        query: User query
+        last_results: {"domain": ..., "records": [...]} of the previous answer
+        domain: Domain the calling agent handles ('papers', 'books', 'job_market')
+        selection_index: 1-based position already extracted by the router
+        min_title_overlap: See `title_reference`
+
+    Returns:
+        The referenced record, or None if the query doesn't refer to one
+    """
+    if not last_results or last_results.get("domain") != domain:
+        return None
+    records = last_results.get("records") or []
+    if not records:
+        return None
+
+    position = selection_index or ordinal_reference(query)
+    if position is not None:
+        if position == -1:
+            return records[-1]
+        return records[position - 1] if 1 <= position <= len(records) else None
+
+    # Title mentions only count in follow-up questions ("explain BioBridge"),
+    # not in new searches that happen to share words with an old title
+    if not is_item_question(query) and not _ABOUT_ITEM.search(query.lower()):
+        return None
+    index = title_reference(query, records, min_title_overlap)
+    return records[index] if index is not None else None
+
+
+def results_memory(domain: str, records: List[Dict[str, Any]], max_records: int = 10) -> Optional[Dict[str, Any]]:
+    """
+    Build the `last_results` state entry for records shown to the user.
+
+    Args:
+        domain: 'papers', 'books' or 'job_market'
+        records: Records in the order they were shown
+        max_records: Maximum number of records kept
+
+    Returns:
+        {"domain": ..., "records": [...]} or None if there is nothing to keep
+    """
+    valid = [r for r in records if isinstance(r, dict) and "error" not in r][:max_records]
+    return {"domain": domain, "records": valid} if valid else None
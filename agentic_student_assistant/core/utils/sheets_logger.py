@@ -10,7 +10,8 @@ SCOPES = [
 ]
 
 def log_to_gsheet(
-    timestamp, query, agent, curriculum_mode, latency, is_fallback: bool = False, result: str = ""
+    timestamp, query, agent, curriculum_mode, latency, is_fallback: bool = False, result: str = "",
+    total_tokens: int = None, cost_usd: float = None
 ): # pylint: disable=R0917
     """
     Log an interaction to Google Sheets using a service account.
@@ -46,6 +47,8 @@ def log_to_gsheet(
         (curriculum_mode or "").strip(),
         round(latency, 2) if latency else "",
         "Yes" if is_fallback else "No",
-        (result or "").replace("\n", " ").strip()[:500]
+        (result or "").replace("\n", " ").strip()[:500],
+        total_tokens if total_tokens else "",
+        round(cost_usd, 6) if cost_usd else ""
     ]
     sheet.append_row(row)
@@ -0,0 +1,73 @@
+"""
+Event streaming from graph nodes to the UI.
+A request that wants incremental output carries an `EventSink` in the graph
+state; nodes bind it for their duration and agents push events to it
+(answer tokens of their final synthesis call, ...). Requests without a sink
+run exactly as before.
+"""
+import queue
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+_CLOSED = object()
+
+
+class EventSink:
+    """
+    Thread-safe event channel from the graph (producer) to a consumer that
+    iterates over it until the producer closes it.
+    """
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+
+    def emit(self, event_type: str, **payload: Any):
+        """Publish an event, e.g. emit("token", text="Hello")."""
+        self._queue.put({"type": event_type, **payload})
+
+    def close(self):
+        """Signal that no more events will follow."""
+        self._queue.put(_CLOSED)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            event = self._queue.get()
+            if event is _CLOSED:
+                return
+            yield event
+
+
+_current_sink: ContextVar[Optional[EventSink]] = ContextVar("event_sink", default=None)
+
+
+@contextmanager
+def event_scope(sink: Optional[EventSink]) -> Iterator[Optional[EventSink]]:
+    """Route events emitted in this block (and this context) to `sink`."""
+    token = _current_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _current_sink.reset(token)
+
+
+def is_streaming() -> bool:
+    """Whether the current request consumes incremental events."""
+    return _current_sink.get() is not None
+
+
+def emit_event(event_type: str, **payload: Any):
+    """Publish an event to the current request's sink (no-op without one)."""
+    sink = _current_sink.get()
+    if sink is not None:
+        sink.emit(event_type, **payload)
+
+
+def streams_events(fn: Callable) -> Callable:
+    """Decorator for graph nodes: binds the state's `events` sink while the node runs."""
+    @functools.wraps(fn)
+    def wrapper(state, *args, **kwargs):
+        with event_scope(state.get("events")):
+            return fn(state, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,152 @@
+"""
+Index-based structured ranking.
+Instead of re-writing every title, author and link as prose, the ranking
+LLM returns a compact JSON list of record ids with one-line rationales, and
+the answer is rendered locally from the records the agent already holds.
+"""
+import re
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from omegaconf import DictConfig
+
+from agentic_student_assistant.core.utils.local_ranker import rank_records
+from agentic_student_assistant.core.utils.result_formatting import format_year, format_authors
+
+_JSON_ARRAY = re.compile(r"\[.*\]", re.DOTALL)
+
+
+def index_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Prefix each record with a 1-based `id` the LLM can refer to."""
+    return [{"id": i, **record} for i, record in enumerate(records, 1)]
+
+
+def parse_ranking(text: str, n_records: int, max_picks: int = 3) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parse the LLM's ranking output.
+
+    Args:
+        text: LLM output, expected to contain [{"id": 2, "why": "..."}, ...]
+        n_records: Number of candidate records (valid ids are 1..n_records)
+        max_picks: Maximum number of picks kept
+
+    Returns:
+        Picks as dicts with 0-based `index`, `why` and any extra fields
+        (e.g. `level`), or None if the output is unusable
+    """
+    match = _JSON_ARRAY.search(text or "")
+    if not match:
+        return None
+    try:
+        items = json.loads(match.group())
+    except json.JSONDecodeError:
+        return None
+
+    picks, seen = [], set()
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, int):
+            item = {"id": item}
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("id")) - 1
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= index < n_records or index in seen:
+            continue
+        seen.add(index)
+        picks.append({**{k: v for k, v in item.items() if k != "id"}, "index": index})
+    return picks[:max_picks] or None
+
+
+def _link_line(record: Dict[str, Any]) -> Optional[str]:
+    link = record.get("link") or record.get("pdf_link")
+    return f"- **Link**: {link}" if link else None
+
+
+def render_papers(picks: List[Dict[str, Any]], records: List[Dict[str, Any]]) -> str:
+    """Render picked papers in the recommendation format."""
+    blocks = ["***Recommended Research Papers :***"]
+    for rank, pick in enumerate(picks, 1):
+        paper = records[pick["index"]]
+        year = format_year(paper.get("year"))
+        lines = [f"**{rank}. {paper.get('title', 'Untitled')}**"]
+        authors = format_authors(paper.get("authors"), max_names=5)
+        if authors or year:
+            lines.append(f"- **Authors**: {authors or 'Unknown'}" + (f" ({year})" if year else ""))
+        if paper.get("venue"):
+            lines.append(f"- **Venue**: {paper['venue']}")
+        if paper.get("citation_count") is not None:
+            lines.append(f"- **Citations**: {paper['citation_count']}")
+        if pick.get("why"):
+            lines.append(f"- **Summary**: {pick['why']}")
+        lines.append(_link_line(paper))
+        blocks.append("\n".join(line for line in lines if line))
+    return "\n\n".join(blocks)
+
+
+def render_books(picks: List[Dict[str, Any]], records: List[Dict[str, Any]]) -> str:
+    """Render picked books in the recommendation format."""
+    blocks = ["***Recommended Academic Resources :***"]
+    for rank, pick in enumerate(picks, 1):
+        book = records[pick["index"]]
+        year = format_year(book.get("year"))
+        authors = format_authors(book.get("authors"))
+        heading = f"**{rank}. {book.get('title', 'Untitled')}**"
+        heading += (f" by {authors}" if authors else "") + (f" ({year})" if year else "")
+        publisher = book.get("publisher")
+        if isinstance(publisher, list):
+            publisher = ", ".join(publisher[:2])
+        lines = [
+            heading,
+            f"- **Publisher**: {publisher}" if publisher else None,
+            f"- **Level**: {pick['level']}" if pick.get("level") else None,
+            f"- **Why it's good**: {pick['why']}" if pick.get("why") else None,
+            _link_line(book),
+        ]
+        blocks.append("\n".join(line for line in lines if line))
+    return "\n\n".join(blocks)
+
+
+RENDERERS = {
+    "papers": render_papers,
+    "books": render_books,
+}
+
+
+def rank_with_indices(
+    llm: Any,
+    prompt: str,
+    records: List[Dict[str, Any]],
+    domain: str,
+    query: str,
+    ranking_config: DictConfig,
+    fast_mode_config: DictConfig
+) -> Tuple[str, List[Dict[str, Any]]]: # pylint: disable=R0917
+    """
+    Run an index-based ranking prompt and render the answer locally.
+    Falls back to local ranking if the output can't be parsed.
+
+    Args:
+        llm: Ranking model
+        prompt: Formatted ranking prompt (records passed via `index_records`)
+        records: Candidate records, in the order they were indexed
+        domain: 'papers' or 'books'
+        query: User query (for the local fallback)
+        ranking_config: `ranking` config section
+        fast_mode_config: `fast_mode` config section (local ranking weights)
+
+    Returns:
+        Markdown answer and the picked records, in display order
+    """
+    picks = None
+    try:
+        picks = parse_ranking(llm.invoke(prompt).content, len(records), ranking_config.max_picks)
+    except Exception as e: # pylint: disable=broad-exception-caught
+        print(f"⚠️ Ranking call failed: {e}")
+
+    if picks is None:
+        print("⚠️ Unusable ranking output. Ranking locally.")
+        ranked = rank_records(records, query, ranking_config.max_picks, fast_mode_config.ranking)
+        positions = {id(record): i for i, record in enumerate(records)}
+        picks = [{"index": positions[id(record)]} for record in ranked]
+    return RENDERERS[domain](picks, records), [records[pick["index"]] for pick in picks]
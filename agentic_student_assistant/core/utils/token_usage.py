@@ -0,0 +1,190 @@
+"""
+Token and cost accounting for LLM calls.
+Pooled chat models report every call's usage (from the provider response,
+or estimated with tiktoken when it's missing) to the tracker of the graph
+node that is currently running. Nodes return the per-task summary in
+`GraphState.metadata["token_usage"]`.
+"""
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.prompt_packer import count_tokens
+
+_USAGE_FIELDS = ("calls", "prompt_tokens", "completion_tokens", "total_tokens", "estimated_calls", "cached_calls")
+
+
+def _empty_usage() -> Dict[str, Any]:
+    usage: Dict[str, Any] = {field: 0 for field in _USAGE_FIELDS}
+    usage["cost_usd"] = 0.0
+    return usage
+
+
+def _add_usage(target: Dict[str, Any], source: Dict[str, Any]):
+    for field in _USAGE_FIELDS:
+        target[field] += source.get(field, 0)
+    target["cost_usd"] = round(target["cost_usd"] + source.get("cost_usd", 0.0), 6)
+
+
+def estimate_cost(model_name: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    Estimate the cost of a call from `observability.metrics.pricing_per_1k_tokens`.
+
+    Returns:
+        Cost in USD (0.0 for models without a price entry)
+    """
+    pricing = get_config().observability.metrics.pricing_per_1k_tokens.get(model_name)
+    if pricing is None:
+        return 0.0
+    return (prompt_tokens * pricing.prompt + completion_tokens * pricing.completion) / 1000
+
+
+class TokenUsageTracker:
+    """
+    Thread-safe accumulator of LLM usage for one graph node, broken down by
+    task profile (route, refine, rank, summarize, orchestrate, ...).
+    """
+
+    def __init__(self, node: str):
+        self.node = node
+        self._lock = threading.Lock()
+        self.by_task: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def calls(self) -> int:
+        with self._lock:
+            return sum(usage["calls"] for usage in self.by_task.values())
+
+    def record(
+        self,
+        task: Optional[str],
+        model_name: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        estimated: bool = False,
+        cached: bool = False
+    ): # pylint: disable=R0917
+        """Add one LLM call."""
+        call = {
+            "calls": 1,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "estimated_calls": int(estimated),
+            "cached_calls": int(cached),
+            "cost_usd": estimate_cost(model_name, prompt_tokens, completion_tokens),
+        }
+        with self._lock:
+            _add_usage(self.by_task.setdefault(task or "default", _empty_usage()), call)
+
+    def summary(self) -> Dict[str, Any]:
+        """Node totals plus the per-task breakdown."""
+        with self._lock:
+            total = _empty_usage()
+            for usage in self.by_task.values():
+                _add_usage(total, usage)
+            total["by_task"] = {task: dict(usage) for task, usage in self.by_task.items()}
+            return total
+
+
+_current_tracker: ContextVar[Optional[TokenUsageTracker]] = ContextVar("token_usage_tracker", default=None)
+
+
+@contextmanager
+def token_scope(node: str) -> Iterator[TokenUsageTracker]:
+    """Collect the usage of all LLM calls made in this block (and this context)."""
+    tracker = TokenUsageTracker(node)
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+
+
+def _message_text(messages: List[Any]) -> str:
+    return "\n".join(str(getattr(message, "content", message)) for message in messages)
+
+
+def record_llm_usage(task: Optional[str], model_name: str, messages: List[Any], result: Any):
+    """
+    Record a chat completion with the active tracker (no-op outside a scope
+    or when `observability.metrics.track_token_usage` is off).
+
+    Args:
+        task: Task profile of the model
+        model_name: Logical model name (used when the response has none)
+        messages: Prompt messages (for estimation)
+        result: ChatResult returned by the model
+    """
+    tracker = _current_tracker.get()
+    if tracker is None or not get_config().observability.metrics.track_token_usage:
+        return
+
+    llm_output = result.llm_output or {}
+    served_model = llm_output.get("model_name") or model_name
+    if llm_output.get("cached"):
+        tracker.record(task, served_model, 0, 0, cached=True)
+        return
+
+    usage = llm_output.get("token_usage") or {}
+    if usage.get("prompt_tokens") is not None:
+        tracker.record(task, served_model, usage["prompt_tokens"], usage.get("completion_tokens") or 0)
+        return
+
+    # Streaming/compatible providers may omit usage: estimate it
+    completion_text = "".join(g.message.content for g in result.generations)
+    tracker.record(
+        task, served_model, count_tokens(_message_text(messages)), count_tokens(completion_text), estimated=True
+    )
+
+
+def track_node_tokens(node: str) -> Callable:
+    """
+    Decorator for graph nodes: runs the node in a token scope and adds its
+    usage to the returned state update under `metadata["token_usage"][node]`.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(state, *args, **kwargs):
+            with token_scope(node) as tracker:
+                update = fn(state, *args, **kwargs)
+            if not tracker.calls:
+                return update
+            update = dict(update)
+            metadata = dict(update.get("metadata") or {})
+            metadata["token_usage"] = {**metadata.get("token_usage", {}), node: tracker.summary()}
+            update["metadata"] = metadata
+            return update
+        return wrapper
+    return decorator
+
+
+def merge_metadata(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Graph state reducer for `metadata`: merges node updates instead of
+    overwriting them (nested dicts such as `token_usage` are merged per key).
+    """
+    if not left:
+        return right
+    if not right:
+        return left
+    merged = dict(left)
+    for key, value in right.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+def total_token_usage(token_usage: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Sum per-node usage (as stored in `metadata["token_usage"]`) into request totals.
+    """
+    total = _empty_usage()
+    for usage in (token_usage or {}).values():
+        _add_usage(total, usage)
+    return total
@@ -1,11 +1,17 @@
 
 
-import json
 from dotenv import load_dotenv
 from pathlib import Path
 from agentic_student_assistant.core.base.base_agent import BaseAgent
 from agentic_student_assistant.core.utils.config_loader import get_config
 from agentic_student_assistant.core.utils.prompt_loader import load_agent_prompts
+from agentic_student_assistant.core.utils.parallel import run_concurrently
+from agentic_student_assistant.core.utils.prompt_packer import pack_records
+from agentic_student_assistant.core.utils.streaming import emit_event
+from agentic_student_assistant.core.utils.local_ranker import rank_records
+from agentic_student_assistant.core.utils.result_formatting import format_fast_answer
+from agentic_student_assistant.core.utils.structured_ranking import index_records, rank_with_indices
+from agentic_student_assistant.core.utils.selection import resolve_selection
 from agentic_student_assistant.talk2books.tools.openlibrary_tool import OpenLibrarySearch
 from agentic_student_assistant.talk2books.tools.googlebooks_tool import GoogleBooksSearch
 from agentic_student_assistant.talk2books.tools.book_utils import normalize_books
@@ -19,46 +25,112 @@ class BooksRecommendAgent(BaseAgent):
     def __init__(self):
         """Initialize books recommendation agent."""
         config = get_config()
-        super().__init__(config, agent_name="books")
+        super().__init__(config, agent_name="books", task="rank")
         # Load local prompts
         agent_path = Path(__file__).parent.parent
         prompts = load_agent_prompts(agent_path)
         self.recommendation_prompt = prompts['books_recommendation_academic']
+        self.ranking_indices_prompt = prompts['books_ranking_indices']
+        self.qa_prompt = prompts['book_qa_task']
         self.ol_search = OpenLibrarySearch()
         self.gb_search = GoogleBooksSearch()
     
+    def search_phase(self, search_query: str, deadline=None) -> dict:
+        """
+        Search Open Library (Primary - Academic) and Google Books (Secondary -
+        Enrichment) concurrently under a shared deadline. A slow source
+        resolves to [] so we still answer with the other one. No LLM calls,
+        safe to run speculatively.
+        
+        Returns:
+            Raw results per source: {"openlibrary": [...], "google_books": [...]}
+        """
+        timeout = self.config.search.parallel_timeout_seconds
+        if deadline:
+            timeout = deadline.timeout(timeout)
+        return run_concurrently(
+            {
+                "openlibrary": lambda: self.ol_search.search(search_query, limit=3, deadline=deadline),
+                "google_books": lambda: self.gb_search.search(search_query, limit=3, deadline=deadline),
+            },
+            timeout=timeout,
+            default=[]
+        )
+    
     def process(self, query: str, **kwargs) -> str:
         """
         Process book recommendation query.
         
         Args:
             query: User query for books
+            **kwargs: Optional `deadline` (request time budget),
+                `search_keywords` / `selection_index` (extracted by the router),
+                `last_results` (records of the previous answer),
+                `speculative_search` (searches started while routing) and
+                `fast_mode` (rank and render locally, without an LLM call)
             
         Returns:
             Academic book recommendations
         """
         # print(f"📚 Searching for books: {query}")
+        # Follow-up on a book we just listed? ("tell me more about the second one")
+        selected = resolve_selection(
+            query, kwargs.get("last_results"), "books", kwargs.get("selection_index"),
+            self.config.selection.min_title_overlap
+        )
+        if selected is not None:
+            print(f"📌 Follow-up on listed book: {selected.get('title')}")
+            prompt = self.qa_prompt.format(query=query, book_data=pack_records(selected, "books"))
+            return self._synthesize(prompt)
         
-        # 1. Search Open Library (Primary - Academic)
-        ol_results = self.ol_search.search(query, limit=3)
-        
-        # 2. Search Google Books (Secondary - Enrichment)
-        gb_results = self.gb_search.search(query, limit=3)
+        deadline = kwargs.get("deadline")
+        # Use the search started while routing, if the router committed to it
+        speculative = kwargs.get("speculative_search")
+        results = speculative.results(deadline) if speculative is not None else None
+        if results is not None:
+            search_query = speculative.search_query
+        else:
+            # Search with the router's keywords when available; rank with the full query
+            search_query = kwargs.get("search_keywords") or query
+            results = self.search_phase(search_query, deadline)
         
         # 3. Merge and Normalize
-        merged_books = normalize_books(ol_results, gb_results)
+        merged_books = normalize_books(results["openlibrary"], results["google_books"])
         
         if not merged_books:
             return f"⚠️ I couldn't find any academic books matching '{query}'. Try broader terms."
         
+        # Show the merged results right away; the recommendation follows
+        emit_event("results", domain="books", records=merged_books)
+        
+        if kwargs.get("fast_mode"):
+            fast_config = self.config.fast_mode
+            ranked = rank_records(merged_books, search_query, fast_config.top_k, fast_config.ranking)
+            self.remember_results("books", ranked)
+            return format_fast_answer("books", ranked, query, limit=fast_config.top_k)
+        
         # 4. LLM Ranking & Recommendation
+        if self.config.ranking.output == "indices":
+            # LLM returns ids + level + one-line rationales; the answer is rendered locally
+            prompt = self.ranking_indices_prompt.format(
+                query=query,
+                books_data=pack_records(index_records(merged_books), "books")
+            )
+            answer, shown = rank_with_indices(
+                self.llm, prompt, merged_books, "books", search_query,
+                self.config.ranking, self.config.fast_mode
+            )
+            self.remember_results("books", shown)
+            emit_event("token", text=answer)
+            return answer
+
+        self.remember_results("books", merged_books)
         prompt = self.recommendation_prompt.format(
             query=query,
-            books_data=json.dumps(merged_books, indent=2)
+            books_data=pack_records(merged_books, "books")
         )
         
-        response = self.llm.invoke(prompt)
-        return response.content
+        return self._synthesize(prompt)
 
 if __name__ == "__main__":
     load_dotenv()
@@ -1,9 +1,11 @@
 """
 Google Books API search tool for book enrichment and fallback.
 """
-import requests
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from agentic_student_assistant.core.utils.http_client import fetch
+from agentic_student_assistant.core.utils.deadline import Deadline, tool_timeout, is_expired
 
 
 class GoogleBooksSearch:
@@ -37,17 +39,22 @@ class GoogleBooksSearch:
             })
         return books
 
-    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def search(self, query: str, limit: int = 5, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
         """
         Search Google Books API.
         
         Args:
             query: Search query string
             limit: Maximum number of results to return
+            deadline: Optional request deadline used to bound the timeout
             
         Returns:
             List of book dictionaries with metadata
         """
+        if is_expired(deadline):
+            print("⏱️ Google Books: Request deadline exceeded. Skipping.")
+            return []
+
         api_key = os.getenv("GOOGLE_BOOKS_API_KEY")  # Optional for public data
         
         params = {
@@ -60,7 +67,8 @@ class GoogleBooksSearch:
             params["key"] = api_key
 
         try:
-            resp = requests.get(self.BASE_URL, params=params, timeout=10)
+            resp = fetch("google_books", self.BASE_URL, deadline=deadline,
+                         params=params, timeout=tool_timeout(deadline))
             resp.raise_for_status()
             data = resp.json()
             return self._build_book_list(data.get("items", []))
@@ -1,8 +1,10 @@
 """
 Open Library API search tool for academic books.
 """
-import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from agentic_student_assistant.core.utils.http_client import fetch
+from agentic_student_assistant.core.utils.deadline import Deadline, tool_timeout, is_expired
 
 
 class OpenLibrarySearch:
@@ -36,17 +38,22 @@ class OpenLibrarySearch:
             })
         return books
 
-    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def search(self, query: str, limit: int = 5, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
         """
         Search Open Library for books.
         
         Args:
             query: Search query string
             limit: Maximum number of results to return
+            deadline: Optional request deadline used to bound the timeout
             
         Returns:
             List of book dictionaries with metadata
         """
+        if is_expired(deadline):
+            print("⏱️ OpenLibrary: Request deadline exceeded. Skipping.")
+            return []
+
         params = {
             "q": query,
             "language": "eng",
@@ -55,7 +62,8 @@ class OpenLibrarySearch:
         }
 
         try:
-            resp = requests.get(self.BASE_URL, params=params, timeout=10)
+            resp = fetch("openlibrary", self.BASE_URL, deadline=deadline,
+                         params=params, timeout=tool_timeout(deadline))
             resp.raise_for_status()
             data = resp.json()
             return self._build_book_list(data.get("docs", []), limit)
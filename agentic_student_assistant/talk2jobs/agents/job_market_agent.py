@@ -11,6 +11,12 @@ import streamlit as st
 from agentic_student_assistant.core.base.base_agent import BaseAgent
 from agentic_student_assistant.core.utils.config_loader import get_config
 from agentic_student_assistant.core.utils.prompt_loader import load_agent_prompts
+from agentic_student_assistant.core.utils.deadline import tool_timeout, is_expired, allows_optional_step
+from agentic_student_assistant.core.utils.prompt_packer import pack_records
+from agentic_student_assistant.core.utils.streaming import emit_event
+from agentic_student_assistant.core.utils.local_ranker import rank_records
+from agentic_student_assistant.core.utils.result_formatting import format_fast_answer, format_job
+from agentic_student_assistant.core.utils.selection import resolve_selection
 from agentic_student_assistant.talk2jobs.tools.google_search import GoogleSearch
 
 load_dotenv()
@@ -24,7 +30,7 @@ class JobMarketAgent(BaseAgent):
     def __init__(self):
         """Initialize job market agent."""
         config = get_config()
-        super().__init__(config, agent_name="job_market")
+        super().__init__(config, agent_name="job_market", task="summarize")
         # Load local prompts
         agent_path = Path(__file__).parent.parent
         prompts = load_agent_prompts(agent_path)
@@ -61,19 +67,28 @@ class JobMarketAgent(BaseAgent):
         
         return query, None
     
-    def search_jobs(self, query: str, field: str = None) -> list:
+    def search_jobs(self, query: str, field: str = None, deadline=None, location: str = None) -> list:
         """
         Search for job listings using SerpAPI Google Jobs API.
         
         Args:
             query: Full user query
             field: Extracted field/domain (e.g., "data science")
+            deadline: Optional request deadline used to bound the timeout
+            location: Location already extracted by the router (optional)
             
         Returns:
             List of job listings with structured data
         """
-        # Extract location if mentioned in query
-        cleaned_query, location = self._extract_location(query)
+        if is_expired(deadline):
+            print("⏱️ SerpAPI: Request deadline exceeded. Skipping job search.")
+            return []
+
+        # Extract location if mentioned in query (unless the router already did)
+        if location:
+            cleaned_query = query
+        else:
+            cleaned_query, location = self._extract_location(query)
         
         # Build API parameters
         search_q = field if field else cleaned_query
@@ -118,7 +133,7 @@ class JobMarketAgent(BaseAgent):
                     params.update(region_params)
                     break
         
-        search = GoogleSearch(params)
+        search = GoogleSearch(params, timeout=tool_timeout(deadline))
         try:
             results = search.get_dict()
         except Exception as e: # pylint: disable=broad-exception-caught
@@ -139,7 +154,8 @@ class JobMarketAgent(BaseAgent):
         jobs = results.get("jobs_results", [])
         
         # Fallback: If no results with regional params, try a global search without hl/gl/domain
-        if not jobs and ("gl" in params or "google_domain" in params):
+        # Skipped when the request budget can't afford a second SerpAPI call.
+        if not jobs and ("gl" in params or "google_domain" in params) and allows_optional_step(deadline):
             print("🔄 No results found with regional params. Falling back to global search...")
             fallback_params = {
                 "engine": "google_jobs",
@@ -148,7 +164,7 @@ class JobMarketAgent(BaseAgent):
                 "hl": "en"
             }
             try:
-                fallback_search = GoogleSearch(fallback_params)
+                fallback_search = GoogleSearch(fallback_params, timeout=tool_timeout(deadline))
                 fallback_results = fallback_search.get_dict()
                 jobs = fallback_results.get("jobs_results", [])
             except Exception as e: # pylint: disable=broad-exception-caught
@@ -191,9 +207,26 @@ class JobMarketAgent(BaseAgent):
         if not job_listings:
             return "⚠️ No job data to summarize."
         
-        prompt = f"{self.analysis_prompt}\n\nHere are the listings:\n{json.dumps(job_listings, indent=2)}"
-        response = self.llm.invoke(prompt)
-        return response.content
+        prompt = f"{self.analysis_prompt}\n\nHere are the listings:\n{pack_records(job_listings, 'jobs')}"
+        return self._synthesize(prompt)
+    
+    @staticmethod
+    def describe_listing(job: dict) -> str:
+        """
+        Details of one listing, rendered locally (follow-ups need no LLM call).
+        
+        Args:
+            job: Job listing record
+            
+        Returns:
+            Markdown description
+        """
+        lines = [format_job(job)]
+        if job.get("snippet"):
+            lines += ["", job["snippet"]]
+        if job.get("link"):
+            lines += ["", f"[View the full listing]({job['link']})"]
+        return "\n".join(lines)
     
     def _extract_field_from_query(self, query: str) -> str:
         """
@@ -231,16 +264,30 @@ class JobMarketAgent(BaseAgent):
         
         Args:
             query: Job search query
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters (e.g. `deadline`, `field` /
+                `location` / `selection_index` when already extracted by the
+                router, `last_results` of the previous answer, and
+                `fast_mode` to skip the LLM summary)
             
         Returns:
             Formatted job analysis with listings
         """
-        # Check if user specified a field/domain
-        field = self._extract_field_from_query(query)
+        # Follow-up on a listing we just showed? ("more about the third job")
+        selected = resolve_selection(
+            query, kwargs.get("last_results"), "job_market", kwargs.get("selection_index"),
+            self.config.selection.min_title_overlap
+        )
+        if selected is not None:
+            print(f"📌 Follow-up on listed job: {selected.get('title')}")
+            return self.describe_listing(selected)
+        
+        # Check if user specified a field/domain (router extraction first)
+        field = kwargs.get("field") or self._extract_field_from_query(query)
         
         # Extract location for display purposes
-        _, location = self._extract_location(query)
+        location = kwargs.get("location")
+        if not location:
+            _, location = self._extract_location(query)
         
         # If no specific field mentioned, ask for clarification
         if field == "":
@@ -261,7 +308,9 @@ class JobMarketAgent(BaseAgent):
                     💡 **Tip**: The more specific you are, the better the job matches!"""
         
         # Search for jobs with the field
-        listings = self.search_jobs(query, field=field)
+        listings = self.search_jobs(
+            query, field=field, deadline=kwargs.get("deadline"), location=kwargs.get("location")
+        )
         if not listings:
             # location is already extracted above
             location_msg = f" in **{location}**" if location else ""
@@ -280,18 +329,32 @@ class JobMarketAgent(BaseAgent):
         with open("data/job_listings.json", "w", encoding="utf-8") as f:
             json.dump(listings, f, indent=2, ensure_ascii=False)
         
-        # Build display output using LLM (for translation and formatting)
-        display_output = self.summarize_jobs(listings)
+        # Show the listings right away; the summary follows
+        emit_event("results", domain="job_market", records=listings)
         
         header = f"{field.title()} Job Opportunities in {location if location else 'Global'}\n\n"
+        emit_event("token", text=header)
+        
+        # Build display output using LLM (for translation and formatting),
+        # or rank and render locally in fast mode
+        if kwargs.get("fast_mode"):
+            fast_config = self.config.fast_mode
+            ranked = rank_records(listings, f"{field} {query}", fast_config.top_k, fast_config.ranking)
+            self.remember_results("job_market", ranked)
+            display_output = format_fast_answer("job_market", ranked, query, limit=fast_config.top_k)
+        else:
+            self.remember_results("job_market", listings)
+            display_output = self.summarize_jobs(listings)
         return header + display_output
 
 
 # Legacy function for backward compatibility
-def run_job_market_agent(query: str) -> str:
+def run_job_market_agent(
+    query: str, deadline=None, field: str = None, location: str = None, fast_mode: bool = False
+) -> str: # pylint: disable=R0917
     """Legacy entry point."""
     agent = JobMarketAgent()
-    return agent.process(query)
+    return agent.process(query, deadline=deadline, field=field, location=location, fast_mode=fast_mode)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,18 @@
 import os
-import requests
 import streamlit as st
 
+from agentic_student_assistant.core.utils.deadline import DEFAULT_TOOL_TIMEOUT
+from agentic_student_assistant.core.utils.http_client import fetch
+
 class GoogleSearch:
-    def __init__(self, params=None):
+    def __init__(self, params=None, timeout=DEFAULT_TOOL_TIMEOUT):
         self.api_key = os.getenv("SERPAPI_API_KEY") or st.secrets.get("SERPAPI_API_KEY")
         self.params = params or {}
         self.params["api_key"] = self.api_key
         self.base_url = "https://serpapi.com/search"
+        self.timeout = timeout
 
     def get_dict(self):
-        response = requests.get(self.base_url, params=self.params, timeout=10)
+        response = fetch("serpapi", self.base_url, params=self.params, timeout=self.timeout)
         response.raise_for_status()
         return response.json()
@@ -1,6 +1,5 @@
 
 
-import json
 from dotenv import load_dotenv
 
 
@@ -8,6 +7,16 @@ from pathlib import Path
 from agentic_student_assistant.core.base.base_agent import BaseAgent
 from agentic_student_assistant.core.utils.config_loader import get_config
 from agentic_student_assistant.core.utils.prompt_loader import load_agent_prompts
+from agentic_student_assistant.core.utils.deadline import allows_optional_step
+from agentic_student_assistant.core.utils.prompt_packer import pack_records
+from agentic_student_assistant.core.utils.streaming import emit_event
+from agentic_student_assistant.core.utils.local_ranker import rank_records, extract_keywords
+from agentic_student_assistant.core.utils.result_formatting import format_fast_answer
+from agentic_student_assistant.core.utils.structured_ranking import index_records, rank_with_indices
+from agentic_student_assistant.core.utils.selection import (
+    resolve_selection, is_item_question, is_generic_request
+)
+from agentic_student_assistant.core.utils.prefetch import get_prefetcher, DetailPrefetcher
 from agentic_student_assistant.talk2papers.tools.semantic_scholar_tool import SemanticScholarSearch
 from agentic_student_assistant.talk2papers.tools.core_tool import CoreSearch
 from agentic_student_assistant.talk2papers.tools.openreview_tool import OpenReviewSearch
@@ -23,11 +32,12 @@ class PaperRecommendAgent(BaseAgent):
     def __init__(self):
         """Initialize paper recommendation agent."""
         config = get_config()
-        super().__init__(config, agent_name="papers")
+        super().__init__(config, agent_name="papers", task="rank")
         # Load local prompts
         agent_path = Path(__file__).parent.parent
         prompts = load_agent_prompts(agent_path)
         self.recommendation_prompt = prompts['paper_recommendation_academic']
+        self.ranking_indices_prompt = prompts['paper_ranking_indices']
         self.qa_prompt = prompts['paper_qa_task']
         self.ss_search = SemanticScholarSearch()
         self.core_search = CoreSearch()
@@ -57,43 +67,82 @@ class PaperRecommendAgent(BaseAgent):
         Refined Keywords:"""
         
         try:
-            refined = self.llm.invoke(prompt).content.strip()
-            # Remove quotes if LLM added them
-            refined = refined.replace('"', '').replace("'", "")
+            # Keyword extraction runs on the small 'refine' model
+            refined = self._clean_refined(self.get_task_llm("refine").invoke(prompt).content)
+            
+            # Escalate to the larger model if the output is unusable
+            # (empty, or longer than the query itself = not an extraction)
+            if not refined or len(refined) > len(query):
+                escalation_llm = self.get_escalation_llm("refine")
+                if escalation_llm is not None:
+                    print(f"⤴️ Refine output unusable ('{refined}'), escalating to larger model")
+                    refined = self._clean_refined(escalation_llm.invoke(prompt).content)
+            
+            if not refined:
+                return query
             print(f"🔍 Refined Query: '{query}' -> '{refined}'")
             return refined
         except Exception as e: # pylint: disable=broad-exception-caught
             print(f"❌ Error in paper search: {e}")
             return query  # Fallback to original
 
+    @staticmethod
+    def _clean_refined(text: str) -> str:
+        """Strip whitespace and any quotes the LLM added."""
+        return text.strip().replace('"', '').replace("'", "")
+
+    def search_phase(self, search_query: str, deadline=None) -> dict:
+        """
+        Query the primary paper sources (no LLM calls, safe to run speculatively).
+        
+        Returns:
+            Raw results per source: {"ss": [...], "core": [...], "arxiv": [...]}
+        """
+        return {
+            "ss": self.ss_search.search(search_query, limit=3, deadline=deadline),
+            "core": self.core_search.search(search_query, limit=3, deadline=deadline),
+            "arxiv": self.arxiv_search.search(search_query, limit=3, deadline=deadline),
+        }
+
     def process(self, query: str, **kwargs) -> str: # pylint: disable=too-many-branches
         """
         Summarize paper findings using LLM.query with refinement.
         """
-        chat_history = kwargs.get("chat_history", [])
+        deadline = kwargs.get("deadline")
+        # Query details already extracted by the router (skip our own LLM calls)
+        search_keywords = kwargs.get("search_keywords")
+        selection_index = kwargs.get("selection_index")
+        # Fast mode: no refine/ranking LLM calls, results are ranked locally
+        fast_mode = kwargs.get("fast_mode", False)
         
-        # 1. CHECK CONTEXT: Is this a follow-up specific question? ("explain the first one")
-        if self._is_selection_query(query):
-            # A. Try history first
-            if chat_history:
-                # Basic check: does history actually contain paper info?
-                last_bot_msg = next(
-                    (msg for role, msg in reversed(chat_history) if role == "assistant"), ""
-                )
-                if len(last_bot_msg) > 100:  # Heuristic: if message is long enough
-                    return self._explain_selection(query, chat_history)
+        # 1. CHECK CONTEXT: Is this a follow-up on a paper we just listed? ("explain the first one")
+        # Without a previous list (or past its end) the query is searched as usual
+        selected = resolve_selection(
+            query, kwargs.get("last_results"), "papers", selection_index,
+            self.config.selection.min_title_overlap
+        )
+        if selected is not None:
+            print(f"📌 Follow-up on listed paper: {selected.get('title')}")
+            return self._explain_paper(query, selected)
 
-            # B. If history empty or fails, treat as "Search & Explain"
+        if self._is_selection_query(query):
+            # No listed paper matches: treat as "Search & Explain"
             # e.g. "Explain the paper 'BioBridge'" -> Search BioBridge -> Explain result #1
-            return self._search_and_explain(query)
+            return self._search_and_explain(query, deadline=deadline, search_keywords=search_keywords)
 
-        # 2. Refine query to get better API results
-        search_query = self._refine_query(query)
-        
-        # 3. Search (Semantic Scholar + CORE)
-        ss_results = self.ss_search.search(search_query, limit=3)
-        core_results = self.core_search.search(search_query, limit=3)
-        arxiv_results = self.arxiv_search.search(search_query, limit=3)
+        # 2 + 3. Use the search started while routing, if the router committed to it
+        speculative = kwargs.get("speculative_search")
+        results = speculative.results(deadline) if speculative is not None else None
+        if results is not None:
+            search_query = speculative.search_query
+        else:
+            # 2. Refine query to get better API results (unless the router already did)
+            if not search_keywords and fast_mode:
+                search_keywords = extract_keywords(query)
+            search_query = search_keywords or self._refine_query(query)
+            # 3. Search (Semantic Scholar + CORE + ArXiv)
+            results = self.search_phase(search_query, deadline)
+        ss_results, core_results, arxiv_results = results["ss"], results["core"], results["arxiv"]
         
         # Track errors but don't return yet
         has_rate_limit = any(
@@ -107,10 +156,10 @@ class PaperRecommendAgent(BaseAgent):
 
         merged_papers = normalize_papers(ss_results, core_results, arxiv_results)
         
-        # 4. Fallback search (OpenReview)
-        if not merged_papers:
+        # 4. Fallback search (OpenReview), only if the request budget allows it
+        if not merged_papers and allows_optional_step(deadline):
             print("🕒 Trying OpenReview as fallback...")
-            or_results = self.openreview_search.search(search_query, limit=3)
+            or_results = self.openreview_search.search(search_query, limit=3, deadline=deadline)
             merged_papers = normalize_papers(merged_papers, or_results)
         
         # 4. Keyword Filtering (Strict Relevance Check)
@@ -132,10 +181,10 @@ class PaperRecommendAgent(BaseAgent):
         # Pass ORIGINAL query to LLM for final ranking context
         if not merged_papers:
             # Try fallback to original query if refined one failed
-            if search_query != query:
+            if search_query != query and allows_optional_step(deadline):
                 print("⚠️ Refined search failed, trying original query...")
-                ss_results = self.ss_search.search(query, limit=5)
-                core_results = self.core_search.search(query, limit=5)
+                ss_results = self.ss_search.search(query, limit=5, deadline=deadline)
+                core_results = self.core_search.search(query, limit=5, deadline=deadline)
                 merged_papers = normalize_papers(ss_results, core_results)
 
         if not merged_papers:
@@ -152,59 +201,114 @@ class PaperRecommendAgent(BaseAgent):
                 )
             return f"⚠️ I couldn't find any academic papers matching '{query}'. Try broader terms."
         
+        # Show the merged results right away; the ranking write-up follows
+        emit_event("results", domain="papers", records=merged_papers)
+        
+        if fast_mode:
+            fast_config = self.config.fast_mode
+            ranked = rank_records(merged_papers, search_query, fast_config.top_k, fast_config.ranking)
+            self.remember_results("papers", ranked)
+            self._schedule_prefetch(ranked, fast_mode=True)
+            return format_fast_answer("papers", ranked, query, limit=fast_config.top_k)
+        
         # 5. LLM Ranking (Use original query)
+        if self.config.ranking.output == "indices":
+            # LLM returns ids + one-line rationales; the answer is rendered locally
+            prompt = self.ranking_indices_prompt.format(
+                query=query,
+                papers_data=pack_records(index_records(merged_papers), "papers")
+            )
+            answer, shown = rank_with_indices(
+                self.llm, prompt, merged_papers, "papers", search_query,
+                self.config.ranking, self.config.fast_mode
+            )
+            self.remember_results("papers", shown)
+            self._schedule_prefetch(shown)
+            emit_event("token", text=answer)
+            return answer
+
+        # Prose ranking: the model picks the order, so only title references resolve reliably
+        self.remember_results("papers", merged_papers)
+        self._schedule_prefetch(merged_papers)
         prompt = self.recommendation_prompt.format(
             query=query,
-            papers_data=json.dumps(merged_papers, indent=2)
+            papers_data=pack_records(merged_papers, "papers")
         )
         
-        response = self.llm.invoke(prompt)
-        return response.content
+        return self._synthesize(prompt)
 
-    def _is_selection_query(self, query: str) -> bool:
-        """Heuristic to check if user wants details on a previous result."""
-        q = query.lower()
-        triggers = [
-            "explain", "tell me more", "elaborate", "summary of", "what about",
-            "the first one", "second one", "#1", "#2", "this paper",
-            "in this paper", "in the paper"
-        ]
-        return any(t in q for t in triggers)
+    @staticmethod
+    def _is_selection_query(query: str) -> bool:
+        """Heuristic to check if user wants details on a specific paper."""
+        return is_item_question(query)
 
-    def _explain_selection(self, query: str, history: list) -> str:
-        """Explain a paper from conversation history."""
-        # Get last assistant message
-        last_bot_msg = next((msg for role, msg in reversed(history) if role == "assistant"), "")
-        
-        prompt = f"""
-        You are an academic expert. 
-        The user is asking a follow-up question about a paper you just listed.
-        
-        USER QUERY: "{query}"
-        
-        YOUR PREVIOUS MESSAGE (Context):
-        {last_bot_msg}
-        
-        TASK:
-        Identify which paper the user is referring to (e.g., "first one", "BioBridge", "#2").
-        Provide a detailed explanation of that paper based on the context or your internal knowledge.
-        If you are unsure which paper, ask for clarification.
+    def _fetch_details(self, paper: dict) -> dict:
+        """
+        Enrich a listed paper with its full Semantic Scholar record (TL;DR,
+        fields of study, ...) and, for arXiv papers, the PDF's opening text.
         """
-        return self.llm.invoke(prompt).content
+        details = dict(paper)
+        match = self.ss_search.match(paper.get("title", ""))
+        if match and DetailPrefetcher.record_key("papers", match) == DetailPrefetcher.record_key("papers", paper):
+            for key, value in match.items():
+                if value not in (None, "", []) and not details.get(key):
+                    details[key] = value
+
+        arxiv_id = details.get("arxiv_id") or self.arxiv_search.id_from_link(details.get("link"))
+        if self.config.prefetch.pdf_text and arxiv_id:
+            text = self.arxiv_search.fetch_pdf_text(arxiv_id, self.config.prefetch.pdf_max_chars)
+            if text:
+                details["full_text"] = text
+        return details
+
+    def _schedule_prefetch(self, papers: list, fast_mode: bool = False):
+        """Prefetch details of the top listed papers in the background (see `prefetch` config)."""
+        prefetcher = get_prefetcher()
+        if prefetcher is None:
+            return
+        prefetch_config = self.config.prefetch
+
+        def explain(paper: dict) -> str:
+            prompt = self.qa_prompt.format(query="Explain this paper.", paper_data=pack_records(paper, "papers_qa"))
+            return self.llm.invoke(prompt).content
+
+        explain_enabled = prefetch_config.explanations.enabled and not fast_mode
+        prefetcher.schedule(
+            "papers", papers[:prefetch_config.top_k], self._fetch_details,
+            explain if explain_enabled else None, prefetch_config.explanations.top_k
+        )
+
+    def _explain_paper(self, query: str, paper: dict) -> str:
+        """Answer a question about one paper record (QA mode), using prefetched details if any."""
+        prefetcher = get_prefetcher()
+        if prefetcher is not None:
+            entry = prefetcher.get("papers", paper, self.config.prefetch.wait_seconds)
+            if entry is not None:
+                if entry["explanation"] and is_generic_request(query, paper):
+                    print("⚡ Answering from pre-generated explanation")
+                    emit_event("token", text=entry["explanation"])
+                    return entry["explanation"]
+                paper = entry["record"]
 
-    def _search_and_explain(self, query: str) -> str:
+        prompt = self.qa_prompt.format(
+            query=query,
+            paper_data=pack_records(paper, "papers_qa")
+        )
+        return self._synthesize(prompt)
+
+    def _search_and_explain(self, query: str, deadline=None, search_keywords: str = None) -> str:
         """
         Search for a specific paper and explain it (QA mode), instead of listing valid matches.
         Used when user asks "Explain paper X" but we have no history context.
         """
-        # 1. Extract Paper Title/Keywords
-        search_query = self._refine_query(query)
+        # 1. Extract Paper Title/Keywords (unless the router already did)
+        search_query = search_keywords or self._refine_query(query)
         print(f"🔍 [QA Mode] Searching for specific paper: {search_query}")
 
         # 2. Search
-        ss_results = self.ss_search.search(search_query, limit=1) # Just get top match
-        core_results = self.core_search.search(search_query, limit=1)
-        arxiv_results = self.arxiv_search.search(search_query, limit=1)
+        ss_results = self.ss_search.search(search_query, limit=1, deadline=deadline) # Just get top match
+        core_results = self.core_search.search(search_query, limit=1, deadline=deadline)
+        arxiv_results = self.arxiv_search.search(search_query, limit=1, deadline=deadline)
         
         # Track errors but don't return yet
         has_rate_limit = any(
@@ -222,9 +326,9 @@ class PaperRecommendAgent(BaseAgent):
         merged_papers = normalize_papers(ss_results, core_results, arxiv_results)
         
         # 3. Fallback to OpenReview if needed
-        if not merged_papers:
+        if not merged_papers and allows_optional_step(deadline):
             print(f"🕒 Search & Explain: Trying OpenReview fallback for '{search_query}'")
-            or_results = self.openreview_search.search(search_query, limit=1)
+            or_results = self.openreview_search.search(search_query, limit=1, deadline=deadline)
             merged_papers = normalize_papers(merged_papers, or_results)
         
         if not merged_papers:
@@ -242,14 +346,10 @@ class PaperRecommendAgent(BaseAgent):
             return f"⚠️ I tried to find the paper '{search_query}' to explain it, but found no matches."
         
         target_paper = merged_papers[0]  # Take the best match
+        self.remember_results("papers", [target_paper])
         
         # 3. Generate QA / Explanation
-        prompt = self.qa_prompt.format(
-            query=query,
-            paper_data=json.dumps(target_paper, indent=2)
-        )
-        
-        return self.llm.invoke(prompt).content
+        return self._explain_paper(query, target_paper)
 
 if __name__ == "__main__":
     load_dotenv()
@@ -1,9 +1,15 @@
 """
 ArXiv API search tool for CS and AI research papers.
 """
-import requests
+import io
+import re
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import pdfplumber
+
+from agentic_student_assistant.core.utils.http_client import fetch
+from agentic_student_assistant.core.utils.deadline import Deadline, tool_timeout, is_expired
 
 
 class ArXivSearch:
@@ -11,6 +17,8 @@ class ArXivSearch:
     Search client for ArXiv API (CS and AI focused).
     """
     BASE_URL = "http://export.arxiv.org/api/query"
+    PDF_URL = "https://arxiv.org/pdf/{arxiv_id}"
+    _ID_FROM_LINK = re.compile(r"arxiv\.org/(?:abs|pdf)/([^\s?#]+?)(?:v\d+)?(?:\.pdf)?$")
 
     def _build_paper_list(self, entries: list, namespace: dict) -> List[Dict[str, Any]]:
         """
@@ -45,17 +53,22 @@ class ArXivSearch:
             })
         return papers
 
-    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def search(self, query: str, limit: int = 5, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
         """
         Search ArXiv for papers.
         
         Args:
             query: Search query string
             limit: Maximum number of results to return
+            deadline: Optional request deadline used to bound the timeout
             
         Returns:
             List of paper dictionaries with metadata
         """
+        if is_expired(deadline):
+            print("⏱️ ArXiv: Request deadline exceeded. Skipping.")
+            return []
+
         params = {
             "search_query": f"all:{query}",
             "start": 0,
@@ -65,7 +78,8 @@ class ArXivSearch:
         }
 
         try:
-            resp = requests.get(self.BASE_URL, params=params, timeout=10)
+            resp = fetch("arxiv", self.BASE_URL, deadline=deadline,
+                         params=params, timeout=tool_timeout(deadline))
             resp.raise_for_status()
             
             # ArXiv returns XML (Atom feed)
@@ -77,3 +91,42 @@ class ArXivSearch:
         except Exception as e: # pylint: disable=broad-exception-caught
             print(f"⚠️ ArXiv Search Error: {e}")
             return []
+
+    @classmethod
+    def id_from_link(cls, link: Optional[str]) -> Optional[str]:
+        """ArXiv id of an abs/pdf link (version suffix removed), e.g. '1706.03762'."""
+        match = cls._ID_FROM_LINK.search(link or "")
+        return match.group(1) if match else None
+
+    def fetch_pdf_text(
+        self, arxiv_id: str, max_chars: int = 6000, deadline: Optional[Deadline] = None
+    ) -> Optional[str]:
+        """
+        Download a paper's PDF and extract its opening text (introduction).
+        
+        Args:
+            arxiv_id: ArXiv identifier
+            max_chars: Maximum number of characters kept
+            deadline: Optional request deadline used to bound the timeout
+            
+        Returns:
+            Extracted text, or None if the PDF couldn't be fetched or parsed
+        """
+        if is_expired(deadline):
+            return None
+
+        try:
+            resp = fetch("arxiv", self.PDF_URL.format(arxiv_id=arxiv_id), deadline=deadline,
+                         timeout=tool_timeout(deadline, default=20.0))
+            resp.raise_for_status()
+            text = ""
+            with pdfplumber.open(io.BytesIO(resp.content)) as pdf:
+                for page in pdf.pages:
+                    text += (page.extract_text() or "") + "\n"
+                    if len(text) >= max_chars:
+                        break
+            text = " ".join(text.split())
+            return text[:max_chars] or None
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ ArXiv PDF Error ({arxiv_id}): {e}")
+            return None
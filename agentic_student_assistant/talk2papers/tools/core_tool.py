@@ -3,7 +3,10 @@ CORE API search tool for open access academic papers.
 """
 import requests
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from agentic_student_assistant.core.utils.http_client import fetch
+from agentic_student_assistant.core.utils.deadline import Deadline, tool_timeout, is_expired
 
 
 class CoreSearch:
@@ -36,13 +39,14 @@ class CoreSearch:
             })
         return papers
 
-    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def search(self, query: str, limit: int = 5, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
         """
         Search CORE API.
         
         Args:
             query: Search query string
             limit: Maximum number of results to return
+            deadline: Optional request deadline used to bound the timeout
             
         Returns:
             List of paper dictionaries with metadata
@@ -53,6 +57,10 @@ class CoreSearch:
             print("⚠️ CORE API key missing. Skipping CORE search.")
             return []
 
+        if is_expired(deadline):
+            print("⏱️ CORE API: Request deadline exceeded. Skipping.")
+            return []
+
         headers = {"Authorization": f"Bearer {api_key}"}
         params = {
             "q": query,
@@ -60,7 +68,8 @@ class CoreSearch:
         }
 
         try:
-            resp = requests.get(self.BASE_URL, params=params, headers=headers, timeout=10)
+            resp = fetch("core", self.BASE_URL, deadline=deadline,
+                         params=params, headers=headers, timeout=tool_timeout(deadline))
             resp.raise_for_status()
             data = resp.json()
             return self._build_paper_list(data.get("results", []))
@@ -1,8 +1,12 @@
 """
 OpenReview API search tool for conference papers (ICLR, NeurIPS, etc.).
 """
-import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from agentic_student_assistant.core.utils.http_client import fetch
+from agentic_student_assistant.core.utils.deadline import (
+    Deadline, tool_timeout, is_expired, allows_optional_step
+)
 
 
 class OpenReviewSearch:
@@ -69,23 +73,27 @@ class OpenReviewSearch:
             })
         return papers
 
-    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def search(self, query: str, limit: int = 5, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
         """
         Search OpenReview for papers.
         
         Args:
             query: Search query string
             limit: Maximum number of results to return
+            deadline: Optional request deadline used to bound the timeout
             
         Returns:
             List of paper dictionaries with metadata
         """
         papers = []
+        if is_expired(deadline):
+            print("⏱️ OpenReview: Request deadline exceeded. Skipping.")
+            return papers
         
         # Try API v2 (Newer conferences like ICLR 2024+)
         try:
-            resp = requests.get(self.V2_URL, params={"term": query, "limit": limit},
-                              timeout=10)
+            resp = fetch("openreview_v2", self.V2_URL, deadline=deadline,
+                         params={"term": query, "limit": limit}, timeout=tool_timeout(deadline))
             if resp.status_code == 200:
                 data = resp.json()
                 papers = self._build_paper_list_v2(data.get("notes", []))
@@ -96,10 +104,15 @@ class OpenReviewSearch:
         if papers:
             return papers
 
+        # V1 is an optional fallback: skip it when the request budget is nearly spent
+        if not allows_optional_step(deadline):
+            print("⏱️ OpenReview: Not enough time left for V1 fallback. Skipping.")
+            return papers
+
         # Try API v1 (Older conferences)
         try:
-            resp = requests.get(self.V1_URL, params={"term": query, "limit": limit},
-                              timeout=10)
+            resp = fetch("openreview_v1", self.V1_URL, deadline=deadline,
+                         params={"term": query, "limit": limit}, timeout=tool_timeout(deadline))
             if resp.status_code == 200:
                 data = resp.json()
                 papers = self._build_paper_list_v1(data.get("notes", []))
@@ -3,7 +3,11 @@ Semantic Scholar API search tool for academic papers.
 """
 import requests
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from agentic_student_assistant.core.utils.http_client import fetch
+from agentic_student_assistant.core.utils.rate_limiter import RateLimitExceeded
+from agentic_student_assistant.core.utils.deadline import Deadline, tool_timeout, is_expired
 
 
 class SemanticScholarSearch:
@@ -11,6 +15,11 @@ class SemanticScholarSearch:
     Search client for Semantic Scholar API.
     """
     BASE_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
+    MATCH_URL = "https://api.semanticscholar.org/graph/v1/paper/search/match"
+    DETAIL_FIELDS = (
+        "title,authors,year,abstract,venue,url,citationCount,isOpenAccess,"
+        "tldr,fieldsOfStudy,externalIds,openAccessPdf,influentialCitationCount"
+    )
 
     def _build_paper_list(self, data_items: list) -> List[Dict[str, Any]]:
         """
@@ -38,17 +47,22 @@ class SemanticScholarSearch:
             })
         return papers
 
-    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def search(self, query: str, limit: int = 5, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
         """
         Search Semantic Scholar for papers.
         
         Args:
             query: Search query string
             limit: Maximum number of results to return
+            deadline: Optional request deadline used to bound the timeout
             
         Returns:
             List of paper dictionaries with metadata
         """
+        if is_expired(deadline):
+            print("⏱️ Semantic Scholar: Request deadline exceeded. Skipping.")
+            return []
+
         api_key = os.getenv("SEMANTIC_SCHOLAR_API_KEY")
         headers = {}
         if api_key:
@@ -61,7 +75,8 @@ class SemanticScholarSearch:
         }
 
         try:
-            resp = requests.get(self.BASE_URL, params=params, headers=headers, timeout=10)
+            resp = fetch("semantic_scholar", self.BASE_URL, deadline=deadline,
+                         params=params, headers=headers, timeout=tool_timeout(deadline))
             if resp.status_code == 429:
                 print("⚠️ Semantic Scholar: Rate limit exceeded (429).")
                 return [{"error": "rate_limit",
@@ -75,9 +90,56 @@ class SemanticScholarSearch:
             resp.raise_for_status()
             data = resp.json()
             return self._build_paper_list(data.get("data", []))
+        except RateLimitExceeded:
+            print("🐢 Semantic Scholar: Local rate limit reached. Skipping source.")
+            return [{"error": "rate_limit",
+                    "message": "Semantic Scholar API rate limit reached. Please wait."}]
         except requests.exceptions.Timeout:
             print("⚠️ Semantic Scholar: Search timed out.")
             return [{"error": "timeout", "message": "Semantic Scholar search timed out."}]
         except Exception as e: # pylint: disable=broad-exception-caught
             print(f"⚠️ Semantic Scholar Error: {e}")
             return []
+
+    def match(self, title: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up the details of one paper by title (best match).
+        
+        Args:
+            title: Paper title
+            deadline: Optional request deadline used to bound the timeout
+            
+        Returns:
+            Paper dictionary with extra detail fields (tldr, fields_of_study,
+            arxiv_id, pdf_link), or None if there is no match
+        """
+        if is_expired(deadline):
+            return None
+
+        api_key = os.getenv("SEMANTIC_SCHOLAR_API_KEY")
+        headers = {"x-api-key": api_key} if api_key else {}
+        params = {"query": title, "fields": self.DETAIL_FIELDS}
+
+        try:
+            resp = fetch("semantic_scholar", self.MATCH_URL, deadline=deadline,
+                         params=params, headers=headers, timeout=tool_timeout(deadline))
+            if resp.status_code in (404, 429, 403):
+                return None
+            resp.raise_for_status()
+            items = resp.json().get("data", [])
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Semantic Scholar match error: {e}")
+            return None
+
+        if not items:
+            return None
+        item = items[0]
+        paper = self._build_paper_list([item])[0]
+        paper.update({
+            "tldr": (item.get("tldr") or {}).get("text"),
+            "fields_of_study": item.get("fieldsOfStudy"),
+            "influential_citation_count": item.get("influentialCitationCount"),
+            "arxiv_id": (item.get("externalIds") or {}).get("ArXiv"),
+            "pdf_link": (item.get("openAccessPdf") or {}).get("url"),
+        })
+        return paper
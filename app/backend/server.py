@@ -0,0 +1,289 @@
+"""
+HTTP backend (ASGI) for the assistant.
+Exposes query, streaming and batch endpoints over the graph with
+server-side sessions, health/readiness probes and graceful shutdown, so the
+assistant can run behind a load balancer and be called by other services.
+The graph is synchronous: runs execute in the worker thread pool, bounded
+per process by `backend.max_inflight`.
+
+Usage:
+    python -m app.backend.server
+    (or: uvicorn app.backend.server:app --host 0.0.0.0 --port 8000)
+"""
+import json
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Union
+
+import uvicorn
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.orchestration.batch_runner import run_batch
+from app.backend.service import AssistantService, SessionBusyError
+
+load_dotenv()
+
+
+class QueryRequest(BaseModel):
+    """A conversation turn."""
+    query: str = Field(..., min_length=1)
+    session_id: Optional[str] = None
+    fast_mode: Optional[bool] = None
+    use_cache: bool = True
+
+
+class BatchRequest(BaseModel):
+    """A batch of independent queries (strings or {"query", "id", "chat_history"} items)."""
+    queries: List[Union[str, Dict[str, Any]]]
+    dedupe: bool = True
+    fast_mode: Optional[bool] = None
+    max_concurrency: Optional[int] = None
+
+
+class Admission:
+    """Graph-run slots held by one request; releasing is idempotent."""
+
+    def __init__(self, backend: "BackendState", weight: int):
+        self.backend = backend
+        self.weight = weight
+        self.released = False
+
+    async def release(self):
+        """Return the slots (later calls are no-ops)."""
+        if not self.released:
+            self.released = True
+            await self.backend.release(self.weight)
+
+
+class BackendState:
+    """Admission control and lifecycle of this backend process."""
+
+    def __init__(self, max_inflight: int, queue_timeout_seconds: float):
+        self.max_inflight = max_inflight
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.condition: Optional[asyncio.Condition] = None
+        self.ready = False
+        self.draining = False
+        self.inflight = 0
+        self.served = 0
+        self.rejected = 0
+        self.started = time.time()
+
+    async def acquire(self, weight: int = 1) -> Admission:
+        """
+        Take graph-run slots, waiting up to `queue_timeout_seconds`.
+
+        Args:
+            weight: Concurrent graph runs the request will make (capped at `max_inflight`)
+
+        Raises:
+            HTTPException: 503 while draining or when the slots don't free up in time
+        """
+        if self.draining or self.condition is None:
+            raise HTTPException(status_code=503, detail="Shutting down")
+        weight = max(1, min(weight, self.max_inflight))
+        async with self.condition:
+            try:
+                await asyncio.wait_for(
+                    self.condition.wait_for(lambda: self.inflight + weight <= self.max_inflight),
+                    timeout=self.queue_timeout_seconds
+                )
+            except asyncio.TimeoutError as e:
+                self.rejected += 1
+                raise HTTPException(status_code=503, detail="Busy, retry later") from e
+            self.inflight += weight
+        return Admission(self, weight)
+
+    async def release(self, weight: int):
+        """Return slots taken with `acquire` (use `Admission.release`)."""
+        async with self.condition:
+            self.inflight -= weight
+            self.served += 1
+            self.condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get admission statistics."""
+        return {
+            'ready': self.ready,
+            'draining': self.draining,
+            'inflight': self.inflight,
+            'max_inflight': self.max_inflight,
+            'served': self.served,
+            'rejected': self.rejected,
+            'uptime_seconds': round(time.time() - self.started, 1),
+        }
+
+
+backend_config = get_config().backend
+state = BackendState(backend_config.max_inflight, backend_config.queue_timeout_seconds)
+service = AssistantService()
+# Streaming runs whose client left early (referenced until they finish)
+_abandoned_runs: Set[asyncio.Task] = set()
+
+
+def _drain(events: Iterator[Dict[str, Any]]):
+    for _ in events:
+        pass
+
+
+async def _finish_abandoned(events: Iterator[Dict[str, Any]], admission: Admission):
+    """Let a streaming run whose client left finish in the thread pool, then return its slot."""
+    try:
+        await run_in_threadpool(_drain, events)
+    finally:
+        await admission.release()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Open for traffic on startup; on shutdown, stop admitting and let in-flight runs finish."""
+    state.condition = asyncio.Condition()
+    state.ready = True
+    print(f"🚀 Backend ready ({backend_config.max_inflight} concurrent graph runs)")
+    yield
+    state.ready = False
+    state.draining = True
+    grace_deadline = time.time() + backend_config.shutdown_grace_seconds
+    while state.inflight and time.time() < grace_deadline:
+        await asyncio.sleep(0.1)
+    if state.inflight:
+        print(f"⚠️ Shutting down with {state.inflight} run(s) still in flight")
+    print("👋 Backend stopped")
+
+
+app = FastAPI(title="Agentic Student Assistant", version="0.1.2", lifespan=lifespan)
+
+
+@app.get("/health")
+async def health() -> Dict[str, str]:
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: accepting new queries (false during startup and drain)."""
+    if not state.ready or state.draining:
+        return JSONResponse(status_code=503, content={"status": "not ready", **state.get_stats()})
+    return {"status": "ready", **state.get_stats()}
+
+
+@app.post("/query")
+async def query(request: QueryRequest) -> Dict[str, Any]:
+    """Answer a query; returns the final answer, routing details and `session_id`."""
+    admission = await state.acquire()
+    started = time.time()
+    try:
+        response = await run_in_threadpool(
+            service.answer, request.query, request.session_id,
+            fast_mode=request.fast_mode, use_cache=request.use_cache
+        )
+    except SessionBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e)) from e
+    finally:
+        await admission.release()
+    response["latency_seconds"] = round(time.time() - started, 3)
+    return response
+
+
+@app.post("/query/stream")
+async def query_stream(request: QueryRequest) -> StreamingResponse:
+    """
+    Answer a query as a stream of newline-delimited JSON events:
+    session, results, token..., then final (or error).
+    """
+    admission = await state.acquire()
+    body_started = False
+
+    async def events() -> AsyncIterator[str]:
+        nonlocal body_started
+        body_started = True
+        turn = service.stream_turn(
+            request.query, request.session_id, fast_mode=request.fast_mode, use_cache=request.use_cache
+        )
+        finished = False
+        try:
+            async for event in iterate_in_threadpool(turn):
+                yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+            finished = True
+        finally:
+            if finished:
+                await admission.release()
+            else:
+                # The client left: the graph keeps running in its worker thread,
+                # so the run holds its slot until it is done
+                task = asyncio.get_running_loop().create_task(_finish_abandoned(turn, admission))
+                _abandoned_runs.add(task)
+                task.add_done_callback(_abandoned_runs.discard)
+
+    async def release_if_not_started():
+        # Once started, the body returns the slot itself (after the run, even if the client left)
+        if not body_started:
+            await admission.release()
+
+    # The background task releases if the body is never iterated (e.g. the client left first)
+    return StreamingResponse(
+        events(), media_type="application/x-ndjson", background=BackgroundTask(release_if_not_started)
+    )
+
+
+@app.post("/batch")
+async def batch(request: BatchRequest) -> Dict[str, Any]:
+    """Run independent queries with bounded concurrency; returns the batch report with per-query records."""
+    if len(request.queries) > backend_config.max_batch_size:
+        raise HTTPException(
+            status_code=413, detail=f"At most {backend_config.max_batch_size} queries per batch"
+        )
+    # A batch is charged for the graph runs it makes at once (at most `max_inflight`)
+    concurrency = min(request.max_concurrency or backend_config.max_inflight, get_config().batch.max_concurrency)
+    admission = await state.acquire(weight=concurrency)
+    try:
+        return await run_in_threadpool(
+            run_batch, request.queries, dedupe=request.dedupe, fast_mode=request.fast_mode,
+            max_concurrency=admission.weight
+        )
+    finally:
+        await admission.release()
+
+
+@app.delete("/sessions/{session_id}")
+async def end_session(session_id: str) -> Dict[str, Any]:
+    """Forget a session's conversation memory."""
+    return {"session_id": session_id, "deleted": await run_in_threadpool(service.end_session, session_id)}
+
+
+@app.post("/cache/clear")
+async def clear_cache() -> Dict[str, str]:
+    """Clear the response and routing caches."""
+    await run_in_threadpool(service.clear_caches)
+    return {"status": "cleared"}
+
+
+@app.get("/stats")
+async def stats() -> Dict[str, Any]:
+    """Cache, limiter, upstream-health, session and admission statistics."""
+    return {**await run_in_threadpool(service.stats), 'backend': state.get_stats()}
+
+
+def main():
+    """Serve the backend with uvicorn (`backend` config section)."""
+    uvicorn.run(
+        "app.backend.server:app",
+        host=backend_config.host,
+        port=backend_config.port,
+        workers=backend_config.workers,
+        timeout_graceful_shutdown=backend_config.shutdown_grace_seconds
+    )
+
+
+if __name__ == "__main__":
+    main()
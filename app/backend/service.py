@@ -0,0 +1,208 @@
+"""
+Assistant service: one conversation turn end to end.
+Response cache lookup, graph run with streamed events, and the session
+update afterwards. The HTTP backend serves it to remote clients and the
+Streamlit UI uses it in-process when no backend is configured, so both
+paths behave the same.
+"""
+import uuid
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional
+
+from agentic_student_assistant.core.utils.cache import get_cache, get_route_cache
+from agentic_student_assistant.core.utils.circuit_breaker import get_circuit_breaker_stats
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.deadline import Deadline
+from agentic_student_assistant.core.utils.llm_cache import get_llm_cache_stats
+from agentic_student_assistant.core.utils.llm_limiter import get_llm_limiter_stats
+from agentic_student_assistant.core.utils.llm_pool import get_provider_pool_stats
+from agentic_student_assistant.core.utils.prefetch import get_prefetch_stats
+from agentic_student_assistant.core.utils.selection import is_item_question, ordinal_reference
+from agentic_student_assistant.core.orchestration.main_graph import stream_query
+from agentic_student_assistant.core.orchestration.speculation import get_speculation_stats
+from app.backend.sessions import Session, SessionStore, get_session_store
+
+# Session updates after a turn (memory folds may call an LLM) run off the answer path
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="session")
+
+# Final-state fields returned to clients (the rest is per-request plumbing)
+PUBLIC_STATE_KEYS = ("agent", "confidence", "reasoning", "result", "metadata", "last_results")
+
+
+def public_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """The client-facing part of a final graph state."""
+    return {key: state.get(key) for key in PUBLIC_STATE_KEYS}
+
+
+class SessionBusyError(RuntimeError):
+    """The session's previous turn didn't finish within the request's deadline."""
+
+
+class AssistantService:
+    """Runs conversation turns against the graph with server-side sessions."""
+
+    def __init__(self, session_store: Optional[SessionStore] = None):
+        self.sessions = session_store or get_session_store()
+
+    def stream_turn(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        fast_mode: Optional[bool] = None,
+        use_cache: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Answer a query within a session, yielding events as they happen.
+
+        Args:
+            query: User query
+            session_id: Conversation to continue (None or unknown starts a new one)
+            fast_mode: Force fast mode on/off (None = load-shedding policy)
+            use_cache: Look up and store the answer in the response cache (full answers
+                to standalone queries only, see `_standalone`)
+
+        Yields:
+            {"type": "session", "session_id": ...} first, then the events of
+            `stream_query` ("results", "token"), ending with
+            {"type": "final", "state": public state} or {"type": "error", "error": message}.
+            A turn that can't start before its deadline because the session's previous
+            turn is still running ends with an error event with `"code": "session_busy"`
+        """
+        session_id = session_id or uuid.uuid4().hex
+        yield {"type": "session", "session_id": session_id}
+
+        # Turns of one session run one after the other, each seeing the previous one's memory.
+        # After the final event the lock passes to the background session update.
+        # Waiting for it spends the request's budget, so a stuck turn can't block the next ones forever
+        deadline = Deadline.from_config(get_config())
+        lock = self.sessions.session_lock(session_id)
+        if not lock.acquire(timeout=deadline.remaining()): # pylint: disable=consider-using-with
+            print(f"⚠️ Session {session_id} busy, giving up after {deadline.elapsed():.1f}s")
+            yield {
+                "type": "error", "error": "The previous turn of this session is still running", "code": "session_busy"
+            }
+            return
+        handed_off = False
+        try:
+            session = self.sessions.load(session_id)
+            cache = get_cache() if use_cache and self._standalone(query, session) else None
+            # The cache holds full answers only: a forced fast-mode turn gets a fresh listing
+            cached = cache.get(query) if cache is not None and fast_mode is not True else None
+            if cached:
+                state = {
+                    "agent": "cached",
+                    "confidence": 1.0,
+                    "reasoning": "Retrieved from semantic cache",
+                    "result": cached,
+                    "metadata": None,
+                    "last_results": None,
+                }
+                self._record_turn_later(session, query, cached, lock)
+                handed_off = True
+                yield {"type": "final", "state": state}
+                return
+
+            for event in stream_query(
+                query, session.memory.recent_turns(), conversation_context=session.memory.context(),
+                fast_mode=fast_mode, last_results=session.last_results, deadline=deadline
+            ):
+                if event["type"] != "final":
+                    yield event
+                    continue
+                state = public_state(event["state"])
+                answer = state.get("result") or "I couldn't find a specific answer."
+                state["result"] = answer
+                session.last_results = state.get("last_results")
+                # Fast-mode listings (forced, or chosen by load shedding) would be
+                # served to full-mode users as cached answers
+                if cache is not None and state.get("agent") != "error" and not event["state"].get("fast_mode"):
+                    cache.set(query, answer, agent=state.get("agent") or "")
+                self._record_turn_later(session, query, answer, lock)
+                handed_off = True
+                yield {"type": "final", "state": state}
+        finally:
+            if not handed_off:
+                lock.release()
+
+    @staticmethod
+    def _standalone(query: str, session: Session) -> bool:
+        """
+        Whether the turn's answer depends on the query text alone and may use the
+        response cache. After a results list any turn may be a follow-up on it
+        (and a cached answer carries no records to select from); selection
+        phrases never are standalone.
+        """
+        if session.last_results:
+            return False
+        return not is_item_question(query) and ordinal_reference(query) is None
+
+    def _record_turn_later(self, session: Session, query: str, answer: str, lock: Any):
+        """
+        Add the turn to the session's memory and save it in the background,
+        releasing the session lock (now owned by the update) when done.
+        """
+        def update():
+            try:
+                session.record_turn(query, answer)
+                self.sessions.save(session)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                print(f"⚠️ Session update failed for {session.session_id}: {e}")
+            finally:
+                lock.release()
+
+        # Fresh context: the summary call isn't streamed to or counted in the finished request
+        _executor.submit(contextvars.Context().run, update)
+
+    def answer(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        fast_mode: Optional[bool] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Answer a query within a session (non-streaming `stream_turn`).
+
+        Returns:
+            Public final state plus `session_id`
+
+        Raises:
+            SessionBusyError: If the session's previous turn is still running
+            RuntimeError: If the graph run failed
+        """
+        response: Dict[str, Any] = {}
+        for event in self.stream_turn(query, session_id, fast_mode=fast_mode, use_cache=use_cache):
+            if event["type"] == "session":
+                response["session_id"] = event["session_id"]
+            elif event["type"] == "final":
+                response.update(event["state"])
+            elif event["type"] == "error":
+                if event.get("code") == "session_busy":
+                    raise SessionBusyError(event["error"])
+                raise RuntimeError(event["error"])
+        return response
+
+    def end_session(self, session_id: str) -> bool:
+        """Forget a session. Returns True if it existed."""
+        return self.sessions.delete(session_id)
+
+    @staticmethod
+    def clear_caches():
+        """Clear the response and routing caches."""
+        get_cache().clear()
+        get_route_cache().clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache, limiter, upstream-health and session statistics of this process."""
+        return {
+            'response_cache': get_cache().get_stats(),
+            'route_cache': get_route_cache().get_stats(),
+            'llm_cache': get_llm_cache_stats(),
+            'llm_limiters': get_llm_limiter_stats(),
+            'prefetch': get_prefetch_stats(),
+            'speculation': get_speculation_stats(),
+            'circuit_breakers': get_circuit_breaker_stats(),
+            'provider_pool': get_provider_pool_stats(),
+            'sessions': self.sessions.get_stats(),
+        }
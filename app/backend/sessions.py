@@ -0,0 +1,212 @@
+"""
+Server-side session state.
+A session holds what a conversation needs between turns: the bounded
+conversation memory and the records of the last answer (for follow-ups).
+The in-memory store suits a single backend process; the Redis store lets
+several processes or replicas share sessions behind a load balancer.
+"""
+import os
+import json
+import time
+import uuid
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from agentic_student_assistant.core.utils.config_loader import get_config
+from agentic_student_assistant.core.utils.conversation_memory import ConversationMemory
+
+# Optional redis import
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class Session:
+    """Conversation state of one client between turns."""
+
+    def __init__(
+        self,
+        session_id: Optional[str] = None,
+        memory: Optional[ConversationMemory] = None,
+        last_results: Optional[Dict[str, Any]] = None,
+        turns: int = 0
+    ):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.memory = memory or ConversationMemory.from_config()
+        self.last_results = last_results
+        self.turns = turns
+        self.updated = time.time()
+
+    def record_turn(self, query: str, answer: str):
+        """Add a finished turn to the conversation memory."""
+        self.memory.add("user", query)
+        self.memory.add("assistant", answer)
+        self.turns += 1
+        self.updated = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable session state."""
+        return {
+            'session_id': self.session_id,
+            'memory': self.memory.to_dict(),
+            'last_results': self.last_results,
+            'turns': self.turns,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Session':
+        """Restore a session saved with `to_dict`."""
+        return cls(
+            session_id=data["session_id"],
+            memory=ConversationMemory.from_dict(data.get("memory") or {}),
+            last_results=data.get("last_results"),
+            turns=data.get("turns", 0)
+        )
+
+
+class SessionStore:
+    """
+    In-memory TTL/LRU session store.
+    Also hands out per-session locks so concurrent turns of one session run
+    one after the other (the second turn must see the first one's memory).
+    """
+
+    def __init__(self, ttl_seconds: int = 3600, max_sessions: int = 5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._session_locks: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+        self.created = 0
+        self.expired = 0
+
+    def session_lock(self, session_id: str) -> Any:
+        """Lock serializing the turns of a session (kept while anyone holds it)."""
+        with self._lock:
+            lock = self._session_locks.get(session_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._session_locks[session_id] = lock
+            return lock
+
+    def load(self, session_id: Optional[str] = None) -> Session:
+        """
+        Get a session, creating it if the id is unknown, expired or None.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id) if session_id else None
+            if session is not None and time.time() - session.updated > self.ttl_seconds:
+                del self._sessions[session_id]
+                self.expired += 1
+                session = None
+            if session is None:
+                session = Session(session_id)
+                self.created += 1
+            return session
+
+    def save(self, session: Session):
+        """Store a session (evicting the least recently used ones beyond `max_sessions`)."""
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._sessions.move_to_end(session.session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, session_id: str) -> bool:
+        """Drop a session. Returns True if it existed."""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get session store statistics."""
+        return {
+            'backend': 'memory',
+            'sessions': len(self._sessions),
+            'created': self.created,
+            'expired': self.expired,
+        }
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions stored as JSON in Redis (key `session:<id>`, expiring after
+    `ttl_seconds` of inactivity), shared by all backend processes.
+    Turn locks stay per process: route a session's requests to one replica
+    (sticky sessions) if its turns may overlap.
+    """
+
+    def __init__(self, client: Any, ttl_seconds: int = 3600, max_sessions: int = 5000):
+        super().__init__(ttl_seconds=ttl_seconds, max_sessions=max_sessions)
+        self.client = client
+
+    def load(self, session_id: Optional[str] = None) -> Session:
+        if session_id:
+            try:
+                data = self.client.get(f"session:{session_id}")
+                if data:
+                    return Session.from_dict(json.loads(data))
+            except Exception as e: # pylint: disable=broad-exception-caught
+                print(f"⚠️ Session load failed for {session_id}: {e}")
+        self.created += 1
+        return Session(session_id)
+
+    def save(self, session: Session):
+        try:
+            self.client.setex(
+                f"session:{session.session_id}", self.ttl_seconds, json.dumps(session.to_dict(), default=str)
+            )
+        except Exception as e: # pylint: disable=broad-exception-caught
+            print(f"⚠️ Session save failed for {session.session_id}: {e}")
+
+    def delete(self, session_id: str) -> bool:
+        try:
+            return bool(self.client.delete(f"session:{session_id}"))
+        except Exception: # pylint: disable=broad-exception-caught
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': 'redis', 'created': self.created}
+
+
+# Global session store
+_session_store: Optional[SessionStore] = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """
+    Get the global session store (`backend.sessions`).
+    `store: redis` uses the REDIS_* environment settings and falls back to
+    memory if Redis is unavailable.
+    """
+    global _session_store # pylint: disable=global-statement
+    if _session_store is not None:
+        return _session_store
+
+    with _session_store_lock:
+        if _session_store is None:
+            sessions_config = get_config().backend.sessions
+            if sessions_config.store == "redis" and REDIS_AVAILABLE:
+                try:
+                    client = redis.Redis(
+                        host=os.getenv("REDIS_HOST", "localhost"),
+                        port=int(os.getenv("REDIS_PORT", "6379")),
+                        db=int(os.getenv("REDIS_DB", "0")),
+                        password=os.getenv("REDIS_PASSWORD"),
+                        decode_responses=True
+                    )
+                    client.ping()
+                    _session_store = RedisSessionStore(
+                        client, ttl_seconds=sessions_config.ttl_seconds, max_sessions=sessions_config.max_sessions
+                    )
+                except Exception as e: # pylint: disable=broad-exception-caught
+                    print(f"⚠️ Redis session store failed: {e}. Falling back to in-memory sessions.")
+            if _session_store is None:
+                _session_store = SessionStore(
+                    ttl_seconds=sessions_config.ttl_seconds, max_sessions=sessions_config.max_sessions
+                )
+    return _session_store
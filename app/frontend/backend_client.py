@@ -0,0 +1,60 @@
+"""
+HTTP client of the assistant backend.
+Mirrors the `AssistantService` methods the UI uses, so the Streamlit app
+works the same in-process and as a thin client (BACKEND_URL).
+"""
+import json
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+
+
+class BackendClient:
+    """Calls the backend's query, stats and cache endpoints."""
+
+    def __init__(self, base_url: str, timeout: float = 120.0):
+        """
+        Args:
+            base_url: Backend address, e.g. http://localhost:8000
+            timeout: Read timeout in seconds (between streamed events)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.http = requests.Session()
+
+    def stream_turn(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        fast_mode: Optional[bool] = None,
+        use_cache: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Answer a query within a session, yielding the backend's events
+        (same events as `AssistantService.stream_turn`).
+        """
+        payload = {"query": query, "session_id": session_id, "fast_mode": fast_mode, "use_cache": use_cache}
+        try:
+            with self.http.post(
+                f"{self.base_url}/query/stream", json=payload, stream=True, timeout=(5, self.timeout)
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(decode_unicode=True):
+                    if line:
+                        yield json.loads(line)
+        except requests.RequestException as e:
+            yield {"type": "error", "error": f"Backend unavailable: {e}"}
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend statistics (empty if the backend is unreachable)."""
+        try:
+            response = self.http.get(f"{self.base_url}/stats", timeout=5)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            print(f"⚠️ Backend stats unavailable: {e}")
+            return {}
+
+    def clear_caches(self):
+        """Clear the backend's response and routing caches."""
+        self.http.post(f"{self.base_url}/cache/clear", timeout=10).raise_for_status()
@@ -21,14 +21,17 @@ if str(root_path) not in sys.path:
 from agentic_student_assistant.core.utils.parse_pdf import parse_single_pdf
 from agentic_student_assistant.core.utils.chunker import chunk_text
 from agentic_student_assistant.core.utils.logging_manager import LoggingManager
-from agentic_student_assistant.core.utils.cache import get_cache
-from agentic_student_assistant.core.orchestration.main_graph import app
+from agentic_student_assistant.core.utils.result_formatting import format_results_compact
 
 # UI Utils
 from app.frontend.utils import apply_custom_css
+from app.frontend.backend_client import BackendClient
 
 load_dotenv()
 
+# With BACKEND_URL set, the UI is a thin client of the HTTP backend; otherwise it runs the graph in-process
+BACKEND_URL = os.getenv("BACKEND_URL")
+
 # ---------------- Page Config ----------------
 st.set_page_config(
     page_title="Agentic Student Assistant", 
@@ -37,6 +40,43 @@ st.set_page_config(
 )
 apply_custom_css()
 
+# ---------------- Assistant ----------------
+@st.cache_resource
+def get_assistant():
+    """The backend client, or the in-process assistant service (sessions kept in this process)."""
+    if BACKEND_URL:
+        return BackendClient(BACKEND_URL)
+    from app.backend.service import AssistantService # pylint: disable=import-outside-toplevel
+    return AssistantService()
+
+# ---------------- Streaming ----------------
+def stream_answer(query: str, final_state: dict, results_slot=None, fast_mode=None, use_cache=True):
+    """
+    Yield answer tokens of a conversation turn (for st.write_stream) and
+    capture the final state in `final_state` once the run completes. Raw
+    search results are rendered into `results_slot` as soon as they're ready.
+    Conversation memory and the previous answer's records (for follow-ups)
+    live in the assistant's session;
+    `fast_mode=None` leaves the choice to the load-shedding policy.
+    """
+    for event in get_assistant().stream_turn(
+        query, st.session_state.session_id, fast_mode=fast_mode, use_cache=use_cache
+    ):
+        if event["type"] == "session":
+            st.session_state.session_id = event["session_id"]
+        elif event["type"] == "token":
+            yield event["text"]
+        elif event["type"] == "results" and results_slot is not None:
+            results_md = format_results_compact(event["domain"], event["records"])
+            if results_md:
+                with results_slot.container():
+                    st.caption(f"📋 {len(event['records'])} results found · writing recommendations...")
+                    st.markdown(results_md)
+        elif event["type"] == "final":
+            final_state.update(event["state"])
+        elif event["type"] == "error":
+            raise RuntimeError(event["error"])
+
 # ---------------- Initialize Session State ----------------
 if "logger" not in st.session_state:
     st.session_state.logger = LoggingManager(
@@ -48,6 +88,11 @@ if "logger" not in st.session_state:
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
 
+# The assistant session holds the bounded conversation memory and the last answer's
+# records (the full chat_history is only for display)
+if "session_id" not in st.session_state:
+    st.session_state.session_id = None
+
 # ---------------- Top Heading ----------------
 st.markdown(
     """
@@ -76,11 +121,17 @@ with col1:
             value=True,
             help="Cache responses"
         )
+        fast_answers = st.toggle(
+            "🚀 Fast Answers",
+            value=False,
+            help="List results ranked locally, without an AI write-up (instant, no token cost)"
+        )
+        
+        assistant_stats = get_assistant().stats()
         
         # Compact Cache Stats
-        if use_cache:
-            cache = get_cache()
-            cache_stats = cache.get_stats()
+        if use_cache and assistant_stats:
+            cache_stats = assistant_stats['response_cache']
             
             c1, c2, c3 = st.columns(3)
             with c1:
@@ -91,8 +142,14 @@ with col1:
             with c3:
                 st.metric("Miss", cache_stats.get('misses', 0))
             
+            route_stats = assistant_stats['route_cache']
+            st.caption(
+                f"🧭 Router cache: {route_stats['hits']} hits "
+                f"({route_stats['semantic_hits']} semantic) · {route_stats['hit_rate']:.0%}"
+            )
+            
             if st.button("Clear", use_container_width=True, key="clear_cache"):
-                cache.clear()
+                get_assistant().clear_caches()
                 st.success("✓ Cleared!")
                 time.sleep(0.3)
                 st.rerun()
@@ -102,6 +159,47 @@ with col1:
         st.markdown("#### 📊 Session")
         user_msgs = len([m for m in st.session_state.chat_history if m[0] == "user"])
         st.metric("Questions", user_msgs, label_visibility="visible")
+        for model_key, stats in assistant_stats.get('llm_limiters', {}).items():
+            st.caption(
+                f"⏳ {model_key}: limit {stats['limit']:.0f} · "
+                f"avg queue {stats['avg_wait']:.2f}s · max {stats['max_wait']:.2f}s"
+            )
+        prefetch_stats = assistant_stats.get('prefetch')
+        if prefetch_stats:
+            st.caption(
+                f"🔮 Prefetch: {prefetch_stats['hits']} hits · {prefetch_stats['misses']} misses · "
+                f"{prefetch_stats['explanations']} pre-generated"
+            )
+        speculation_stats = assistant_stats.get('speculation')
+        if speculation_stats and speculation_stats['launched']:
+            st.caption(
+                f"🎲 Speculative searches: {speculation_stats['hits']}/{speculation_stats['launched']} used "
+                f"({speculation_stats['hit_rate']:.0%})"
+            )
+    
+    # Upstream source health (circuit breakers)
+    breaker_stats = assistant_stats.get('circuit_breakers')
+    if breaker_stats:
+        with st.container(border=True):
+            st.markdown("#### 🛰️ Sources")
+            state_icons = {"closed": "🟢", "half_open": "🟡", "open": "🔴"}
+            for source_name, stats in breaker_stats.items():
+                status = f"{state_icons.get(stats['state'], '⚪')} **{source_name}** · {stats['state']}"
+                if stats['state'] == "open":
+                    status += f" (retry in {stats['retry_in']:.0f}s)"
+                st.caption(status)
+    
+    # LLM provider pool health
+    pool_stats = assistant_stats.get('provider_pool') or []
+    if len(pool_stats) > 1:
+        with st.container(border=True):
+            st.markdown("#### 🔌 LLM Providers")
+            for endpoint in pool_stats:
+                icon = "🟡" if endpoint['cooling_down'] else "🟢"
+                st.caption(
+                    f"{icon} **{endpoint['id']}** · {endpoint['latency']:.2f}s · "
+                    f"{endpoint['error_rate']:.0%} errors"
+                )
     
     # Chat Input - Always at bottom
     user_query = st.chat_input("Type your question here...")
@@ -137,32 +235,29 @@ with col2:
             with st.chat_message("user", avatar="👤"):
                 st.markdown(user_query)
             
-            # Check cache
-            cached_result = None
-            if use_cache:
-                cache = get_cache()
-                cached_result = cache.get(user_query)
-            
-            if cached_result:
-                answer = cached_result
-                agent_used = "cached"
-                confidence = 1.0
-                reasoning = "Retrieved from semantic cache"
-                latency = 0.01
-                st.toast("⚡ Retrieved from Cache", icon="📦")
-            else:
+            with st.chat_message("assistant", avatar="🤖"):
                 start_time = time.time()
+                results_slot = st.empty()
+                answer_slot = st.empty()
                 try:
+                    result = {}
                     with st.spinner("Analyzing your request..."):
-                        result = app.invoke({
-                            "query": user_query,
-                            "chat_history": st.session_state.chat_history
-                        })
+                        # Raw results and tokens render as they arrive; the final text replaces them below
+                        # (the response cache is checked and filled by the assistant)
+                        with answer_slot.container():
+                            st.write_stream(stream_answer(
+                                user_query, result, results_slot,
+                                fast_mode=True if fast_answers else None,
+                                use_cache=use_cache
+                            ))
                     
                     agent_used = result.get("agent", "unknown")
                     confidence = result.get("confidence")
                     reasoning = result.get("reasoning", "")
                     answer = result.get("result", "I couldn't find a specific answer.")
+                    token_usage = (result.get("metadata") or {}).get("token_usage")
+                    if agent_used == "cached":
+                        st.toast("⚡ Retrieved from Cache", icon="📦")
                     
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
@@ -170,16 +265,13 @@ with col2:
                     agent_used = "error"
                     confidence = 0
                     reasoning = str(e)
+                    token_usage = None
                 
+                # The write-up supersedes the raw list
+                results_slot.empty()
+                answer_slot.markdown(answer)
                 latency = time.time() - start_time
                 
-                if use_cache and agent_used != "error":
-                    cache.set(user_query, answer, agent=agent_used)
-            
-            # Display response
-            with st.chat_message("assistant", avatar="🤖"):
-                st.markdown(answer)
-                
                 # # Execution details
                 # with st.expander("🔍 Execution Details"):
                 #     st.markdown(f"**Engine:** `{agent_used.upper()}`")
@@ -205,7 +297,8 @@ with col2:
                 latency=latency,
                 is_fallback=(agent_used == "fallback"),
                 confidence=confidence,
-                reasoning=reasoning
+                reasoning=reasoning,
+                token_usage=token_usage
             )
             
             st.rerun()
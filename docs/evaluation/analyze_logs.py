@@ -44,6 +44,21 @@ fallback_rate = (fallback_count / total_queries * 100) if total_queries else 0
 avg_latency_by_agent = df.groupby("Agent")["Latency"].mean()
 query_counts = df["Agent"].value_counts()
 
+# Token/cost columns are appended by newer versions of the logger
+if "Total Tokens" in df.columns:
+    usage = df.assign(
+        tokens=pd.to_numeric(df["Total Tokens"], errors="coerce"),
+        cost=pd.to_numeric(df["Cost (USD)"], errors="coerce") if "Cost (USD)" in df.columns else 0.0
+    )
+    token_usage_by_agent = usage.groupby("Agent").agg(
+        avg_tokens=("tokens", "mean"),
+        total_tokens=("tokens", "sum"),
+        avg_cost=("cost", "mean"),
+        total_cost=("cost", "sum")
+    )
+else:
+    token_usage_by_agent = None
+
 # Optional: Routing accuracy if you added "Expected Agent" column manually
 if "Expected Agent" in df.columns:
     routing_matches = df[df["Agent"] == df["Expected Agent"]]
@@ -65,6 +80,16 @@ print("\n📌 Average Latency per Agent:")
 for agent, latency in avg_latency_by_agent.items():
     print(f"   - {agent}: {latency:.2f} seconds")
 
+if token_usage_by_agent is not None:
+    print("\n📌 Token Usage per Agent:")
+    for agent, row in token_usage_by_agent.iterrows():
+        print(
+            f"   - {agent}: {row['avg_tokens']:.0f} tokens/query avg, "
+            f"{row['total_tokens']:.0f} total (≈${row['total_cost']:.4f}, ${row['avg_cost']:.5f}/query)"
+        )
+else:
+    print("\n📌 Token Usage per Agent: Not available (no 'Total Tokens' column)")
+
 if routing_accuracy is not None:
     print(f"\n🎯 Routing Accuracy: {routing_accuracy:.2f}%")
 else: